@@ -1,3 +1,3 @@
-__all__ = ["Finding", "Severity", "Rule", "RuleContext", "run_rules"]
+__all__ = ["Finding", "Severity", "Rule", "RuleContext", "run_rules", "iter_rules", "iter_runs", "cheap_first"]
 
-from .core import Finding, Severity, Rule, RuleContext, run_rules
\ No newline at end of file
+from .core import Finding, Severity, Rule, RuleContext, run_rules, iter_rules, iter_runs, cheap_first
\ No newline at end of file
@@ -0,0 +1,276 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+import hashlib
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+
+from auditor.core import Finding, Rule, RuleContext, Severity
+from auditor.utils.content import ContentPolicy
+from auditor.utils.fs import FileEntry
+
+# Cambiar si cambia el formato de los archivos de caché
+CACHE_FORMAT = 1
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def finding_to_record(f: Finding) -> Dict[str, Any]:
+    return {
+        "rule_id": f.rule_id,
+        "message": f.message,
+        "severity": f.severity.value,
+        "path": f.path,
+        "meta": f.meta,
+    }
+
+
+def finding_from_record(d: Dict[str, Any]) -> Finding:
+    return Finding(
+        rule_id=d["rule_id"],
+        message=d["message"],
+        severity=Severity(d["severity"]),
+        path=d.get("path"),
+        meta=d.get("meta"),
+    )
+
+
+def _stable_repr(value: Any) -> str:
+    if isinstance(value, (set, frozenset)):
+        return repr(sorted(value, key=repr))
+    return repr(value)
+
+
+def _module_source(name: str) -> bytes:
+    module = sys.modules.get(name)
+    try:
+        source = inspect.getsourcefile(module) if module else None
+        if source:
+            return Path(source).read_bytes()
+    except (OSError, TypeError):
+        pass
+    return b""
+
+
+def rule_version(rule: Any) -> str:
+    """
+    Huella de la regla: código fuente de su módulo más sus atributos de
+    configuración en mayúsculas (SECRET_PATTERNS, IGNORE_FILES, REQUIRED...).
+    Si cualquiera cambia, las entradas anteriores dejan de ser válidas.
+    """
+    cls = type(rule)
+    h = hashlib.sha256(f"{CACHE_FORMAT}:{cls.__module__}.{cls.__qualname__}".encode())
+    h.update(_module_source(cls.__module__))
+    for name in sorted(dir(cls)):
+        if name.lstrip("_").isupper():
+            h.update(f"{name}={_stable_repr(getattr(cls, name))}".encode())
+    return h.hexdigest()[:16]
+
+
+def _content_hash(path: Path) -> str | None:
+    h = hashlib.sha1()
+    try:
+        with open(path, "rb") as fh:
+            for block in iter(lambda: fh.read(1 << 20), b""):
+                h.update(block)
+    except OSError:
+        return None
+    return h.hexdigest()
+
+
+class RuleCache:
+    """Entradas de una regla/versión: clave -> huella del archivo + datos."""
+
+    def __init__(self, path: Path, hash_contents: bool, stamp: float):
+        self.path = path
+        self._hash_contents = hash_contents
+        self._stamp = stamp
+        self._lock = threading.Lock()
+        self._dirty = False
+        try:
+            self._entries: Dict[str, Dict[str, Any]] = json.loads(
+                path.read_text(encoding="utf-8")
+            )["entries"]
+        except (OSError, ValueError, KeyError, TypeError):
+            self._entries = {}
+
+    def get(self, key: str, entry: FileEntry) -> Any | None:
+        """Datos guardados para `key` si el archivo no cambió, o None."""
+        with self._lock:
+            item = self._entries.get(key)
+        if item is None or item["size"] != entry.size:
+            return None
+        if item["mtime_ns"] != entry.mtime_ns:
+            # mtime distinto (p. ej. tras un checkout): el hash de contenido decide
+            if not self._hash_contents or item.get("sha1") is None:
+                return None
+            if _content_hash(entry.path) != item["sha1"]:
+                return None
+        with self._lock:
+            item["mtime_ns"] = entry.mtime_ns
+            item["used"] = self._stamp
+            self._dirty = True
+        return item["data"]
+
+    def put(self, key: str, entry: FileEntry, data: Any) -> None:
+        item = {
+            "size": entry.size,
+            "mtime_ns": entry.mtime_ns,
+            "used": self._stamp,
+            "data": data,
+        }
+        if self._hash_contents:
+            item["sha1"] = _content_hash(entry.path)
+        with self._lock:
+            self._entries[key] = item
+            self._dirty = True
+
+    def get_inputs(self, root: Path, inputs: Iterable[str], scope: str = "") -> Any | None:
+        """
+        Igual que get() pero para el conjunto de archivos de entrada de una regla.
+        `scope` distingue subproyectos de un monorepo que comparten nombres de archivo;
+        la raíz resuelta entra en la clave porque los findings llevan rutas absolutas
+        y la misma caché puede usarse con varios repos.
+        """
+        key, fp = self._inputs_key(root, inputs, scope)
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None or item["fp"] != fp:
+                return None
+            item["used"] = self._stamp
+            self._dirty = True
+            return item["data"]
+
+    def put_inputs(self, root: Path, inputs: Iterable[str], data: Any, scope: str = "") -> None:
+        key, fp = self._inputs_key(root, inputs, scope)
+        with self._lock:
+            self._entries[key] = {"fp": fp, "used": self._stamp, "data": data}
+            self._dirty = True
+
+    @staticmethod
+    def _inputs_key(root: Path, inputs: Iterable[str], scope: str = "") -> tuple[str, list]:
+        names = sorted(inputs)
+        fp: list = []
+        for name in names:
+            try:
+                st = (root / name).stat()
+                fp.append([st.st_size, st.st_mtime_ns])
+            except OSError:
+                fp.append(None)
+        prefix = f"inputs:{root.resolve()}:{scope}:" if scope else f"inputs:{root.resolve()}:"
+        return prefix + ",".join(names), fp
+
+    def _dump(self, budget: int | None) -> str:
+        with self._lock:
+            entries = dict(self._entries)
+        data = json.dumps({"entries": entries}, ensure_ascii=False, separators=(",", ":"))
+        if budget is None or len(data) <= budget:
+            return data
+        # LRU: se conservan las entradas usadas más recientemente que quepan
+        kept: Dict[str, Dict[str, Any]] = {}
+        size = 16
+        for key, item in sorted(entries.items(), key=lambda kv: kv[1]["used"], reverse=True):
+            item_size = len(json.dumps({key: item}, ensure_ascii=False, separators=(",", ":")))
+            if size + item_size > budget:
+                break
+            kept[key] = item
+            size += item_size
+        with self._lock:
+            self._entries = kept
+        return json.dumps({"entries": kept}, ensure_ascii=False, separators=(",", ":"))
+
+
+class AuditCache:
+    """
+    Caché incremental en disco (por ejemplo `.auditor-cache/`).
+    Un archivo JSON por regla y versión de regla; las versiones viejas se
+    borran al guardar y el total se acota a `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        hash_contents: bool = False,
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hash_contents = hash_contents
+        self._stamp = time.time()
+        self._lock = threading.Lock()
+        self._namespaces: Dict[str, RuleCache] = {}
+
+    def for_rule(self, rule: Any, policy: ContentPolicy | None = None) -> RuleCache:
+        """
+        Entradas de `rule`. Las reglas que leen contenido pasan su
+        ContentPolicy: el resultado por archivo depende de max_size y window
+        y del código de auditor.utils.content (sniff, regiones), así que
+        ambos entran en la versión.
+        """
+        version = rule_version(rule)
+        if policy is not None:
+            h = hashlib.sha256(f"{version}:{policy.max_size}:{policy.window}".encode())
+            h.update(_module_source(ContentPolicy.__module__))
+            version = h.hexdigest()[:16]
+        name = f"{_safe(rule.id)}-{version}.json"
+        with self._lock:
+            ns = self._namespaces.get(name)
+            if ns is None:
+                ns = RuleCache(self.directory / name, self.hash_contents, self._stamp)
+                self._namespaces[name] = ns
+            return ns
+
+    def check_with_inputs(self, rule: Rule, ctx: RuleContext) -> List[Finding]:
+        """Ejecuta una regla de raíz salvo que sus archivos `inputs` no hayan cambiado."""
+        ns = self.for_rule(rule)
+        root = Path(ctx.repo_root)
+        inputs = rule.inputs  # type: ignore[attr-defined]
+        cached = ns.get_inputs(root, inputs, ctx.scope)
+        if cached is not None:
+            return [finding_from_record(r) for r in cached]
+        findings = list(rule.check(ctx))
+        ns.put_inputs(root, inputs, [finding_to_record(f) for f in findings], ctx.scope)
+        return findings
+
+    def save(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        current = set(self._namespaces)
+        rule_prefixes = {name.rsplit("-", 1)[0] + "-" for name in current}
+
+        # Invalidación: otras versiones de las reglas usadas en esta corrida
+        others: List[Path] = []
+        for p in self.directory.glob("*.json"):
+            if p.name in current:
+                continue
+            if any(p.name.startswith(prefix) for prefix in rule_prefixes):
+                p.unlink(missing_ok=True)
+            else:
+                others.append(p)
+
+        budget = self.max_bytes // max(len(current), 1)
+        written = 0
+        for name, ns in self._namespaces.items():
+            if not ns._dirty and ns.path.exists():
+                written += ns.path.stat().st_size
+                continue
+            data = ns._dump(budget)
+            tmp = ns.path.with_suffix(".tmp")
+            tmp.write_text(data, encoding="utf-8")
+            os.replace(tmp, ns.path)
+            written += len(data.encode("utf-8"))
+
+        # Evicción: reglas no usadas en esta corrida, de la más antigua a la más nueva
+        others.sort(key=lambda p: p.stat().st_mtime)
+        total = written + sum(p.stat().st_size for p in others)
+        for p in others:
+            if total <= self.max_bytes:
+                break
+            total -= p.stat().st_size
+            p.unlink(missing_ok=True)
+
+
+def _safe(rule_id: str) -> str:
+    return "".join(c if c.isalnum() or c in "._" else "_" for c in rule_id)
@@ -1,16 +1,16 @@
 from __future__ import annotations
 import argparse
 import json
+import sys
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, BinaryIO, Iterable, Iterator, TextIO
 
-from auditor.core import RuleContext, run_rules, Finding, Severity
-from auditor.rules.gitignore_rule import GitignoreEnvRule
-from auditor.rules.config_rule import ConfigViaEnvRule
-from auditor.rules.makefile_rule import MakefileRule
-from auditor.rules.license_rule import LicenseRule
-from auditor.rules.coverage_rule import CoverageRule
-from auditor.rules.secrets_rule import SecretsRule
+from auditor.core import (
+    Finding, Rule, RuleContext, RunFn, Severity, run_rule, cheap_first, iter_rules,
+)
+from auditor.rules import RULES, select_rules
+from auditor.utils.content import DEFAULT_MAX_SIZE, ContentPolicy
+from auditor.utils.fs import DEFAULT_EXCLUDES
 
 
 SEVERITY_ORDER = {Severity.LOW: 1, Severity.MEDIUM: 2, Severity.HIGH: 3}
@@ -25,6 +25,67 @@ def _finding_to_dict(f: Finding) -> Dict[str, Any]:
         "meta": f.meta or {},
     }
 
+def _empty_summary() -> Dict[str, Any]:
+    return {"total": 0, "by_severity": {"High": 0, "Medium": 0, "Low": 0}}
+
+def _count(summary: Dict[str, Any], f: Finding) -> None:
+    summary["total"] += 1
+    summary["by_severity"][f.severity.value] += 1
+
+def _write_ndjson(
+    out: TextIO,
+    repo_root: str,
+    findings: Iterable[Finding],
+    extra: Dict[str, Any] | None = None,
+    compact: bool = False,
+) -> tuple[Dict[str, Any], int]:
+    """
+    Escribe un registro por finding en cuanto se produce y el resumen al final.
+    `extra` se lee después de consumir los findings y se agrega al resumen.
+    """
+    enc = json.JSONEncoder(ensure_ascii=False, separators=(",", ":") if compact else None)
+    summary = _empty_summary()
+    worst = 0
+    for f in findings:
+        _count(summary, f)
+        worst = max(worst, SEVERITY_ORDER[f.severity])
+        record = {"kind": "finding", **_finding_to_dict(f)}
+        out.write(enc.encode(record) + "\n")
+        out.flush()
+    out.write(enc.encode(
+        {"kind": "summary", "repo_root": repo_root, "summary": summary, **(extra or {})},
+    ) + "\n")
+    out.flush()
+    return summary, worst
+
+def _write_binary(
+    out: BinaryIO,
+    repo_root: str,
+    findings: Iterable[Finding],
+    extra: Dict[str, Any] | None = None,
+) -> tuple[Dict[str, Any], int]:
+    """
+    Reporte en formato binario (auditor.reporting.binary_report): un registro
+    por finding en cuanto se produce; resumen e índice al final.
+    """
+    from auditor.reporting.binary_report import BinaryReportWriter
+    writer = BinaryReportWriter(out)
+    summary = _empty_summary()
+    worst = 0
+    for f in findings:
+        _count(summary, f)
+        worst = max(worst, SEVERITY_ORDER[f.severity])
+        writer.add(_finding_to_dict(f))
+    writer.close({"repo_root": repo_root, "summary": summary, **(extra or {})})
+    return summary, worst
+
+def _rule_ids(value: str) -> list[str]:
+    ids = [part.strip() for part in value.split(",") if part.strip()]
+    unknown = [rule_id for rule_id in ids if rule_id not in RULES]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"regla desconocida: {', '.join(unknown)}")
+    return ids
+
 def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     p = argparse.ArgumentParser(
         prog="auditor",
@@ -32,13 +93,42 @@ def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     )
     p.add_argument(
         "--repo",
-        default=".",
-        help="Ruta a la raíz del repositorio a auditar (default: .)",
+        action="append",
+        default=None,
+        help=(
+            "Ruta a la raíz del repositorio a auditar (default: .). "
+            "Repetible para auditar varios repos en una sola invocación"
+        ),
+    )
+    p.add_argument(
+        "--repos-from",
+        default=None,
+        help="Archivo con una ruta de repositorio por línea (modo batch)",
+    )
+    p.add_argument(
+        "--reports-dir",
+        default="reports",
+        help="Modo batch: directorio para el reporte de cada repo (default: reports)",
     )
     p.add_argument(
         "--output",
         default="-",
-        help="Archivo de salida JSON (default: stdout)",
+        help="Archivo de salida JSON (default: stdout). En modo batch, reporte agregado",
+    )
+    p.add_argument(
+        "--format",
+        choices=["json", "ndjson", "binary"],
+        default="json",
+        help=(
+            "Formato de salida: json (un documento), ndjson "
+            "(un finding por línea y el resumen como último registro) o binary "
+            "(registros con prefijo de largo e índice; resumen legible sin leer findings)"
+        ),
+    )
+    p.add_argument(
+        "--compact",
+        action="store_true",
+        help="JSON sin indentación ni espacios (más chico y más rápido de escribir)",
     )
     p.add_argument(
         "--fail-on",
@@ -49,12 +139,112 @@ def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
             "Ej: --fail-on high -> exit 2 si existe algún High"
         ),
     )
+    p.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help=(
+            "Con --fail-on, terminar apenas aparece el primer finding que alcanza "
+            "el umbral (ejecuta primero las reglas baratas de raíz)"
+        ),
+    )
+    p.add_argument(
+        "--rules",
+        type=_rule_ids,
+        default=None,
+        metavar="IDS",
+        help=f"Correr solo estas reglas, separadas por coma ({', '.join(RULES)})",
+    )
+    p.add_argument(
+        "--skip-rules",
+        type=_rule_ids,
+        default=None,
+        metavar="IDS",
+        help="No correr estas reglas, separadas por coma",
+    )
     p.add_argument(
         "--ignore-dirs",
         nargs="*",
         default=[],
         help="Directorios a ignorar durante el análisis (ej: .venv tests)",
     )
+    p.add_argument(
+        "--no-default-excludes",
+        action="store_true",
+        help=(
+            "No podar los directorios excluidos por defecto "
+            f"({', '.join(sorted(DEFAULT_EXCLUDES))})"
+        ),
+    )
+    p.add_argument(
+        "--max-file-size",
+        type=float,
+        default=DEFAULT_MAX_SIZE / (1024 * 1024),
+        metavar="MB",
+        help=(
+            "Archivos de texto más grandes se escanean solo al inicio y al final "
+            f"(default: {DEFAULT_MAX_SIZE // (1024 * 1024)} MB)"
+        ),
+    )
+    p.add_argument(
+        "--source",
+        choices=["fs", "git"],
+        default="fs",
+        help=(
+            "Origen de los archivos a analizar: fs (recorre el árbol) o git "
+            "(archivos del índice de git, respeta .gitignore)"
+        ),
+    )
+    p.add_argument(
+        "--untracked",
+        action="store_true",
+        help="Con --source git, incluir archivos no versionados que no estén ignorados",
+    )
+    p.add_argument(
+        "--monorepo",
+        action="store_true",
+        help=(
+            "Descubrir subproyectos (directorios con pyproject.toml, Makefile o "
+            "package.json) y correr las reglas de raíz en cada uno"
+        ),
+    )
+    p.add_argument(
+        "--since",
+        default=None,
+        metavar="REV",
+        help=(
+            "Auditar solo los archivos cambiados desde el merge-base con REV "
+            "(ej: origin/main), incluidos los nuevos sin git add; las reglas "
+            "de raíz corren solo si cambió su archivo"
+        ),
+    )
+    p.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help=(
+            "Paralelismo: reglas en hilos y escaneo de contenido en procesos "
+            "(default: 1, secuencial)"
+        ),
+    )
+    p.add_argument(
+        "--cache-dir",
+        default=None,
+        help=(
+            "Directorio de caché incremental (ej: .auditor-cache). "
+            "Sin esta opción no se usa caché"
+        ),
+    )
+    p.add_argument(
+        "--cache-hash",
+        action="store_true",
+        help="Validar con hash de contenido los archivos cuyo mtime cambió",
+    )
+    p.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=64,
+        help="Tamaño máximo de la caché en MB; en modo batch, para todos los repos (default: 64)",
+    )
     return p.parse_args(argv)
 
 def _threshold_to_level(name: str) -> int:
@@ -66,49 +256,397 @@ def _threshold_to_level(name: str) -> int:
         return SEVERITY_ORDER[Severity.LOW]
     return NO_THRESHOLD
 
-def main(argv: list[str] | None = None) -> int:
-    args = _parse_args(argv)
-    repo_root = str(Path(args.repo).resolve())
-
-    ctx = RuleContext(repo_root, ignore_dirs=args.ignore_dirs)
-    rules = [
-        GitignoreEnvRule(),
-        ConfigViaEnvRule(),
-        MakefileRule(),
-        LicenseRule(),      
-        CoverageRule(),     
-        SecretsRule(),      
+def _exit_code(worst: int, fail_on: str) -> int:
+    threshold = _threshold_to_level(fail_on)
+    if worst >= threshold and threshold != NO_THRESHOLD:
+        return 2
+    return 0
+
+
+class AuditError(Exception):
+    """Error de configuración que impide auditar un repo (exit code 1)."""
+
+
+def _build_rules(only: list[str] | None = None, skip: list[str] | None = None) -> list:
+    # Solo se importan los módulos de las reglas seleccionadas
+    return select_rules(only, skip or ())
+
+def _make_context(
+    repo_root: str,
+    args: argparse.Namespace,
+    jobs: int,
+    cache_dir: str | None,
+    cache_max_bytes: int | None = None,
+) -> RuleContext:
+    # Un clon fallido o un typo en --repos-from no debe pasar por un repo vacío
+    if not Path(repo_root).is_dir():
+        raise AuditError(f"{repo_root} no existe o no es un directorio")
+    cache = None
+    if cache_dir:
+        from auditor.cache import AuditCache
+        if cache_max_bytes is None:
+            cache_max_bytes = args.cache_max_mb * 1024 * 1024
+        cache = AuditCache(
+            Path(cache_dir),
+            max_bytes=cache_max_bytes,
+            hash_contents=args.cache_hash,
+        )
+    ctx = RuleContext(
+        repo_root,
+        ignore_dirs=args.ignore_dirs,
+        jobs=jobs,
+        cache=cache,
+        source=args.source,
+        include_untracked=args.untracked,
+        since=args.since,
+        exclude_dirs=() if args.no_default_excludes else DEFAULT_EXCLUDES,
+        content_policy=ContentPolicy(max_size=int(args.max_file_size * 1024 * 1024)),
+    )
+    if args.source != "git" and not args.since:
+        return ctx
+
+    # Solo los modos que usan git pagan el import de subprocess
+    from auditor.utils import git
+    if not git.is_work_tree(repo_root):
+        raise AuditError(f"{repo_root} no es un repositorio git (--source git / --since)")
+    try:
+        ctx.changed  # resolver el diff antes de correr reglas para reportar errores de git
+    except git.GitError as exc:
+        raise AuditError(f"no se pudo calcular el diff desde {args.since}: {exc}") from exc
+    return ctx
+
+# Conteos con los que se dimensiona el hueco reservado para el resumen: seis
+# dígitos cubren cualquier reporte realista sin dejar un relleno largo; si el
+# resumen no entra, el hueco queda en blanco y el resumen va al final
+_SUMMARY_RESERVE = {
+    "total": 999_999,
+    "by_severity": {"High": 999_999, "Medium": 999_999, "Low": 999_999},
+}
+
+def _encoder(compact: bool) -> json.JSONEncoder:
+    if compact:
+        return json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    return json.JSONEncoder(ensure_ascii=False, indent=2)
+
+def _nested(enc: json.JSONEncoder, value: Any, depth: int, compact: bool) -> str:
+    # Serializa `value` como si estuviera anidado `depth` niveles dentro del documento
+    text = enc.encode(value)
+    if compact:
+        return text
+    return text.replace("\n", "\n" + "  " * depth)
+
+def _summary_member(enc: json.JSONEncoder, summary: Dict[str, Any], compact: bool) -> str:
+    nl, ind, sep = ("", "", ":") if compact else ("\n", "  ", ": ")
+    return nl + ind + enc.encode("summary") + sep + _nested(enc, summary, 1, compact) + ","
+
+def _can_patch(out: TextIO) -> bool:
+    # stdout puede ser un pipe o un archivo abierto en modo append: ahí no se reescribe
+    try:
+        return out is not sys.stdout and out.seekable()
+    except (AttributeError, ValueError):
+        return False
+
+def _write_json(
+    out: TextIO,
+    repo_root: str,
+    findings: Iterable[Finding],
+    extra: Dict[str, Any] | None = None,
+    compact: bool = False,
+) -> tuple[Dict[str, Any], int]:
+    """
+    Escribe el reporte en streaming: el encabezado, luego cada finding en
+    cuanto se produce y al final el resumen calculado sobre la marcha.
+    En archivos con seek, el resumen ocupa su lugar habitual (antes de
+    `findings`) en un hueco reservado que se completa al terminar; en
+    stdout, o si no entra en el hueco, se escribe después de `findings`.
+    `extra` se lee al final.
+    """
+    enc = _encoder(compact)
+    nl, ind, sep = ("", "", ":") if compact else ("\n", "  ", ": ")
+    summary = _empty_summary()
+    worst = 0
+
+    out.write("{" + nl + ind + enc.encode("repo_root") + sep + enc.encode(repo_root) + ",")
+    slot = None
+    if _can_patch(out):
+        # El hueco lleva el miembro completo; en blanco también es JSON válido
+        slot = (out.tell(), len(_summary_member(enc, _SUMMARY_RESERVE, compact)))
+        out.write(" " * slot[1])
+
+    out.write(nl + ind + enc.encode("findings") + sep + "[")
+    first = True
+    for f in findings:
+        _count(summary, f)
+        worst = max(worst, SEVERITY_ORDER[f.severity])
+        item = _nested(enc, _finding_to_dict(f), 2, compact)
+        out.write(("" if first else ",") + nl + ind * 2 + item)
+        first = False
+    out.write("]" if first else nl + ind + "]")
+
+    patch = _summary_member(enc, summary, compact)
+    if slot is not None and len(patch) > slot[1]:
+        slot = None
+    tail: Dict[str, Any] = dict(extra or {})
+    if slot is None:
+        tail = {"summary": summary, **tail}
+    for key, value in tail.items():
+        out.write("," + nl + ind + enc.encode(key) + sep + _nested(enc, value, 1, compact))
+    out.write(nl + "}\n")
+
+    if slot is not None:
+        end = out.tell()
+        out.seek(slot[0])
+        # El relleno queda como espacios al final de la línea, JSON válido
+        out.write(patch.ljust(slot[1]))
+        out.seek(end)
+    return summary, worst
+
+def _stop_at(threshold: int, extra: Dict[str, Any]) -> RunFn:
+    """
+    --fail-fast: cada regla, al terminar en su worker, cancela las demás si
+    algún finding alcanza el umbral. La salida conserva el orden de las
+    reglas; `incomplete` se marca solo si alguna se salteó o cortó.
+    """
+    def run(ctx: RuleContext, rule: Rule) -> list[Finding]:
+        if ctx.cancelled:
+            extra["incomplete"] = True
+            return []
+        findings = run_rule(ctx, rule)
+        if ctx.cancelled:
+            # Otra regla alcanzó el umbral mientras esta corría: puede estar cortada
+            extra["incomplete"] = True
+        elif any(SEVERITY_ORDER[f.severity] >= threshold for f in findings):
+            ctx.cancel()
+        return findings
+    return run
+
+def _with_scan_stats(
+    findings: Iterator[Finding],
+    ctx: RuleContext,
+    extra: Dict[str, Any],
+) -> Iterator[Finding]:
+    """Al terminar, agrega al reporte qué archivos no se escanearon y por qué."""
+    yield from findings
+    if ctx.scan_stats:
+        extra["skipped"] = ctx.scan_stats.to_dict()
+
+def _group_by_subproject(
+    findings: Iterator[Finding],
+    subprojects: list,
+    extra: Dict[str, Any],
+) -> Iterator[Finding]:
+    """
+    Modo monorepo: al terminar, agrega el resumen de cada subproyecto ("." =
+    raíz). Los findings de las reglas de contenido corren sobre la raíz: se
+    asignan al subproyecto donde está el archivo.
+    """
+    from auditor.monorepo import owner
+    groups = {".": _empty_summary()}
+    for sp in subprojects:
+        groups[sp.path] = _empty_summary()
+    for f in findings:
+        meta = f.meta or {}
+        if "subproject" not in meta:
+            sub = owner(f.path, subprojects)
+            if sub is not None:
+                f.meta = meta = {**meta, "subproject": sub}
+        _count(groups[meta.get("subproject", ".")], f)
+        yield f
+    extra["subprojects"] = [{"path": ".", "summary": groups["."]}] + [
+        {"path": sp.path, "markers": list(sp.markers), "summary": groups[sp.path]}
+        for sp in subprojects
     ]
 
-    findings = run_rules(ctx, rules)
-    payload = {
-        "repo_root": repo_root,
-        "summary": {
-            "total": len(findings),
-            "by_severity": {
-                "High": sum(1 for f in findings if f.severity is Severity.HIGH),
-                "Medium": sum(1 for f in findings if f.severity is Severity.MEDIUM),
-                "Low": sum(1 for f in findings if f.severity is Severity.LOW),
-            },
-        },
-        "findings": [_finding_to_dict(f) for f in findings],
-    }
+def _audit_to(
+    output: str,
+    repo_root: str,
+    args: argparse.Namespace,
+    jobs: int,
+    cache_dir: str | None,
+    cache_max_bytes: int | None = None,
+) -> tuple[Dict[str, Any], int]:
+    """Audita un repo y escribe su reporte en `output` ("-" = stdout)."""
+    ctx = _make_context(repo_root, args, jobs, cache_dir, cache_max_bytes)
+    extra: Dict[str, Any] = {}
+    threshold = _threshold_to_level(args.fail_on)
+    fail_fast = args.fail_fast and threshold != NO_THRESHOLD
+    rules = _build_rules(args.rules, args.skip_rules)
+    if fail_fast:
+        rules = cheap_first(rules)
+
+    run = _stop_at(threshold, extra) if fail_fast else run_rule
+    subprojects = None
+    if args.monorepo:
+        from auditor.monorepo import discover, iter_monorepo
+        subprojects = discover(ctx)
+        findings = iter_monorepo(ctx, rules, subprojects, jobs=jobs, run=run)
+    else:
+        findings = iter_rules(ctx, rules, jobs=jobs, run=run)
+    if subprojects is not None:
+        findings = _group_by_subproject(findings, subprojects, extra)
+    findings = _with_scan_stats(findings, ctx, extra)
+    if args.format == "binary":
+        if output == "-":
+            summary, worst = _write_binary(sys.stdout.buffer, repo_root, findings, extra)
+        else:
+            with open(output, "wb") as bout:
+                summary, worst = _write_binary(bout, repo_root, findings, extra)
+    else:
+        write = _write_ndjson if args.format == "ndjson" else _write_json
+        if output == "-":
+            summary, worst = write(sys.stdout, repo_root, findings, extra, compact=args.compact)
+        else:
+            with open(output, "w", encoding="utf-8") as out:
+                summary, worst = write(out, repo_root, findings, extra, compact=args.compact)
+
+    if ctx.cache is not None:
+        ctx.cache.save()
+    return summary, worst
+
+
+# ==========================
+# Modo batch (varios repos)
+# ==========================
+
+def _warm_worker(only: list[str] | None, skip: list[str] | None) -> None:
+    # Cada worker del pool precompila las reglas una sola vez
+    for rule in _build_rules(only, skip):
+        warm = getattr(rule, "warm", None)
+        if warm is not None:
+            warm()
+
+def _safe_name(name: str) -> str:
+    return "".join(c if c.isalnum() or c in "._-" else "_" for c in name) or "repo"
+
+def _cache_name(repo_root: str) -> str:
+    # Por ruta y no por posición: el mismo repo reusa su caché aunque cambie la lista
+    import hashlib
+    digest = hashlib.sha256(repo_root.encode("utf-8")).hexdigest()[:16]
+    return f"{_safe_name(Path(repo_root).name)}-{digest}"
+
+def _trim_batch_cache(root: Path, keep: set[str], max_bytes: int) -> None:
+    """Acota el total de la caché del batch: borra primero los repos que no
+    estuvieron en esta corrida, del menos al más recientemente usado."""
+    import shutil
+    if not root.is_dir():
+        return
+    sizes: Dict[Path, int] = {}
+    for d in root.iterdir():
+        if d.is_dir():
+            sizes[d] = sum(p.stat().st_size for p in d.glob("*.json"))
+    total = sum(sizes.values())
+    stale = sorted((d for d in sizes if d.name not in keep), key=lambda d: d.stat().st_mtime)
+    for d in stale:
+        if total <= max_bytes:
+            break
+        total -= sizes[d]
+        shutil.rmtree(d, ignore_errors=True)
+
+def _audit_worker(
+    repo_root: str,
+    args: argparse.Namespace,
+    report_path: str,
+    cache_dir: str | None,
+    cache_max_bytes: int | None = None,
+) -> Dict[str, Any]:
+    try:
+        summary, worst = _audit_to(report_path, repo_root, args, 1, cache_dir, cache_max_bytes)
+    except Exception as exc:  # un repo roto no corta el batch
+        return {"repo_root": repo_root, "error": str(exc), "worst": 0}
+    return {"repo_root": repo_root, "report": report_path, "summary": summary, "worst": worst}
+
+def _read_repos_file(path: str) -> list[str]:
+    repos = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            repos.append(line)
+    return repos
+
+def _main_batch(repos: list[str], args: argparse.Namespace) -> int:
+    reports_dir = Path(args.reports_dir)
+    reports_dir.mkdir(parents=True, exist_ok=True)
+    ext = {"ndjson": "ndjson", "binary": "bin"}.get(args.format, "json")
+
+    # --cache-max-mb acota la caché de todo el batch: cada repo recibe una parte
+    cache_root = Path(args.cache_dir) if args.cache_dir else None
+    cache_max_bytes = args.cache_max_mb * 1024 * 1024
+    cache_names = {repo: _cache_name(repo) for repo in repos}
+    share = cache_max_bytes // max(len(cache_names), 1)
+
+    tasks = []
+    for i, repo in enumerate(repos, 1):
+        name = f"{i:04d}-{_safe_name(Path(repo).name)}"
+        cache_dir = str(cache_root / cache_names[repo]) if cache_root else None
+        tasks.append((repo, args, str(reports_dir / f"{name}.{ext}"), cache_dir, share))
+
+    results: list[Dict[str, Any] | None] = [None] * len(tasks)
 
-    # salida
-    data = json.dumps(payload, indent=2, ensure_ascii=False)
+    def _done(i: int, result: Dict[str, Any]) -> None:
+        results[i] = result
+        status = result.get("report") or f"error: {result['error']}"
+        print(f"[auditor] {result['repo_root']} -> {status}", file=sys.stderr, flush=True)
+
+    if args.jobs <= 1:
+        for i, task in enumerate(tasks):
+            _done(i, _audit_worker(*task))
+    else:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        with ProcessPoolExecutor(
+            max_workers=min(args.jobs, len(tasks)),
+            initializer=_warm_worker,
+            initargs=(args.rules, args.skip_rules),
+        ) as pool:
+            futures = {pool.submit(_audit_worker, *task): i for i, task in enumerate(tasks)}
+            for fut in as_completed(futures):
+                _done(futures[fut], fut.result())
+
+    if cache_root is not None:
+        _trim_batch_cache(cache_root, set(cache_names.values()), cache_max_bytes)
+
+    summary = _empty_summary()
+    worst = 0
+    entries = []
+    for result in results:
+        assert result is not None
+        worst = max(worst, result.pop("worst"))
+        if "summary" in result:
+            summary["total"] += result["summary"]["total"]
+            for sev, n in result["summary"]["by_severity"].items():
+                summary["by_severity"][sev] += n
+        entries.append(result)
+
+    data = _encoder(args.compact).encode({"summary": summary, "repos": entries})
     if args.output == "-":
         print(data)
     else:
         Path(args.output).write_text(data, encoding="utf-8")
 
-    # exit code en función de --fail-on
-    threshold = _threshold_to_level(args.fail_on)
-    worst = max((SEVERITY_ORDER[f.severity] for f in findings), default=0)
+    code = _exit_code(worst, args.fail_on)
+    if code == 0 and any("error" in e for e in entries):
+        return 1
+    return code
 
-    if worst >= threshold and threshold != NO_THRESHOLD:
-        return 2
-    return 0
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    repos = list(args.repo or [])
+    if args.repos_from:
+        repos.extend(_read_repos_file(args.repos_from))
+    if not repos:
+        repos = ["."]
+    repos = [str(Path(r).resolve()) for r in repos]
+
+    if len(repos) > 1 or args.repos_from:
+        return _main_batch(repos, args)
+
+    try:
+        _, worst = _audit_to(args.output, repos[0], args, args.jobs, args.cache_dir)
+    except AuditError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    return _exit_code(worst, args.fail_on)
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
\ No newline at end of file
+    raise SystemExit(main())
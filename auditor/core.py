@@ -1,7 +1,16 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from enum import Enum
-from typing import Protocol, List, Dict, Any
+from pathlib import Path
+from typing import Protocol, List, Dict, Any, Callable, Iterable, Iterator, Tuple, TYPE_CHECKING
+import sys
+import threading
+
+from auditor.utils.content import ContentPolicy, ScanStats
+from auditor.utils.fs import DEFAULT_EXCLUDES, FileIndex
+
+if TYPE_CHECKING:
+    from auditor.cache import AuditCache
 
 
 class Severity(str, Enum):
@@ -9,7 +18,12 @@ class Severity(str, Enum):
     MEDIUM = "Medium"
     HIGH = "High"
 
-@dataclass
+# Claves de `meta` cuyos valores se repiten entre findings y conviene internar
+_INTERNED_META = ("pattern",)
+
+# Con __slots__ y cadenas internadas: rule_id, mensaje, ruta y patrón se
+# comparten entre los findings en vez de copiarse en cada uno.
+@dataclass(slots=True)
 class Finding:
     rule_id: str
     message: str
@@ -17,10 +31,139 @@ class Finding:
     path: str | None = None
     meta: Dict[str, Any] | None = None
 
+    def __post_init__(self) -> None:
+        self.rule_id = sys.intern(self.rule_id)
+        self.message = sys.intern(self.message)
+        if self.path is not None:
+            self.path = sys.intern(self.path)
+        if self.meta:
+            for key in _INTERNED_META:
+                value = self.meta.get(key)
+                if isinstance(value, str):
+                    self.meta[key] = sys.intern(value)
+
 class RuleContext:
-    def __init__(self, repo_root: str, ignore_dirs: list[str] | None = None):
+    def __init__(
+        self,
+        repo_root: str,
+        ignore_dirs: list[str] | None = None,
+        jobs: int = 1,
+        cache: AuditCache | None = None,
+        source: str = "fs",
+        include_untracked: bool = False,
+        since: str | None = None,
+        exclude_dirs: Iterable[str] = DEFAULT_EXCLUDES,
+        content_policy: ContentPolicy | None = None,
+    ):
         self.repo_root = repo_root
         self.ignore_dirs = ignore_dirs or []
+        # Paralelismo disponible para reglas que escanean contenido
+        self.jobs = jobs
+        # Caché incremental opcional (auditor.cache.AuditCache)
+        self.cache = cache
+        # Origen de la lista de archivos: "fs" (recorrido del árbol) o "git" (índice)
+        self.source = source
+        self.include_untracked = include_untracked
+        # Modo diff: solo se auditan los archivos cambiados desde esta revisión
+        self.since = since
+        # Directorios pesados que el recorrido "fs" poda siempre (.git, node_modules...)
+        self.exclude_dirs = frozenset(exclude_dirs)
+        # Clasificación de contenido: binarios y archivos enormes
+        self.content_policy = content_policy or ContentPolicy()
+        self.scan_stats = ScanStats()
+        # Subproyecto (ruta relativa a la raíz auditada) en modo monorepo; "" = raíz
+        self.scope = ""
+        self._changed: frozenset[str] | None = None
+        self._files: FileIndex | None = None
+        self._all_files: FileIndex | None = None
+        self._parent: tuple[RuleContext, str] | None = None
+        self._files_lock = threading.RLock()
+        self._cancel = threading.Event()
+
+    def subcontext(self, rel: str) -> RuleContext:
+        """
+        Contexto para el subdirectorio `rel` (modo monorepo). Comparte la
+        configuración, la caché, las estadísticas y la cancelación; el
+        índice de archivos y el diff se derivan de los del contexto padre.
+        """
+        sub = RuleContext(
+            str(Path(self.repo_root) / rel),
+            ignore_dirs=self.ignore_dirs,
+            jobs=self.jobs,
+            cache=self.cache,
+            source=self.source,
+            include_untracked=self.include_untracked,
+            since=self.since,
+            exclude_dirs=self.exclude_dirs,
+            content_policy=self.content_policy,
+        )
+        sub.scope = f"{self.scope}/{rel}" if self.scope else rel
+        sub.scan_stats = self.scan_stats
+        sub._cancel = self._cancel
+        prefix = rel.rstrip("/") + "/"
+        if self.changed is not None:
+            sub._changed = frozenset(p[len(prefix):] for p in self.changed if p.startswith(prefix))
+        sub._files = self.files.subtree(rel)
+        sub._parent = (self, rel)
+        return sub
+
+    def cancel(self) -> None:
+        """Pide a las reglas en curso que terminen cuanto antes (p. ej. --fail-fast)."""
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def changed(self) -> frozenset[str] | None:
+        """Archivos cambiados desde `since` (incluye borrados), o None fuera del modo diff."""
+        if self.since is None:
+            return None
+        if self._changed is None:
+            with self._files_lock:
+                if self._changed is None:
+                    from auditor.utils import git
+                    self._changed = frozenset(git.changed_files(self.repo_root, self.since))
+        return self._changed
+
+    @property
+    def files(self) -> FileIndex:
+        # Índice compartido: se construye al primer uso y una sola vez por auditoría
+        if self._files is None:
+            with self._files_lock:
+                if self._files is None:
+                    self._files = self._build_index()
+        return self._files
+
+    @property
+    def all_files(self) -> FileIndex:
+        """
+        Índice del árbol completo. Igual a `files` salvo en modo diff, donde
+        `files` solo tiene lo cambiado: para reglas de alcance repo que
+        necesitan ver también los archivos que no cambiaron.
+        """
+        if self.since is None:
+            return self.files
+        if self._all_files is None:
+            with self._files_lock:
+                if self._all_files is None:
+                    if self._parent is not None:
+                        parent, rel = self._parent
+                        self._all_files = parent.all_files.subtree(rel)
+                    else:
+                        self._all_files = self._build_index(full=True)
+        return self._all_files
+
+    def _build_index(self, full: bool = False) -> FileIndex:
+        root = Path(self.repo_root)
+        if self.since is not None and not full:
+            return FileIndex.from_paths(root, sorted(self.changed or ()), self.ignore_dirs)
+        if self.source == "git":
+            from auditor.utils import git
+            paths = git.ls_files(root, untracked=self.include_untracked)
+            return FileIndex.from_paths(root, paths, self.ignore_dirs)
+        return FileIndex.scan(root, self.ignore_dirs, exclude=self.exclude_dirs)
 
 class Rule(Protocol):
     id: str
@@ -29,19 +172,92 @@ class Rule(Protocol):
     def check(self, ctx: RuleContext) -> List[Finding]:
         ...
 
-# Runner simple para ejecutar un conjunto de reglas
-def run_rules(ctx: RuleContext, rules: List[Rule]) -> List[Finding]:
-    findings: List[Finding] = []
-    for rule in rules:
-        try:
-            findings.extend(rule.check(ctx))
-        except Exception as exc: # proteger el runner
-            findings.append(
-                Finding(
-                    rule_id=rule.id,
-                    message=f"Rule crashed: {exc}",
-                    severity=Severity.MEDIUM,
-                    meta={"crash": True},
-                )
+def run_rule(ctx: RuleContext, rule: Rule) -> List[Finding]:
+    """Ejecuta una regla: respeta la cancelación y el modo diff, usa la caché y no propaga errores."""
+    if ctx.cancelled:
+        return []
+    try:
+        # En modo diff, las reglas de raíz solo corren si cambió alguno de sus `inputs`
+        inputs = getattr(rule, "inputs", None)
+        if inputs and ctx.since is not None and ctx.changed.isdisjoint(inputs):
+            return []
+        # Reglas de raíz: declaran en `inputs` los archivos que leen y,
+        # si ninguno cambió, se reutiliza el resultado de la corrida anterior
+        if ctx.cache is not None and inputs:
+            findings = ctx.cache.check_with_inputs(rule, ctx)
+        else:
+            findings = list(rule.check(ctx))
+    except Exception as exc: # proteger el runner
+        findings = [
+            Finding(
+                rule_id=rule.id,
+                message=f"Rule crashed: {exc}",
+                severity=Severity.MEDIUM,
+                meta={"crash": True},
             )
-    return findings
\ No newline at end of file
+        ]
+    # Modo monorepo: cada finding indica de qué subproyecto viene
+    if ctx.scope:
+        for f in findings:
+            f.meta = {**(f.meta or {}), "subproject": ctx.scope}
+    return findings
+
+# Reglas de raíz (las que declaran `inputs`) primero: son baratas y permiten
+# cortar rápido con --fail-fast antes de los escaneos de contenido.
+def cheap_first(rules: List[Rule]) -> List[Rule]:
+    return sorted(rules, key=lambda r: not getattr(r, "inputs", None))
+
+# Ejecuta una regla en un contexto y devuelve sus findings (p. ej. run_rule)
+RunFn = Callable[[RuleContext, Rule], List[Finding]]
+
+# Runner en forma de generador: emite los findings de cada regla en cuanto
+# termina. Con jobs > 1 las reglas corren en un pool de hilos; con
+# ordered=True (default) se respeta el orden de `rules`, si no, el de
+# finalización. Si el consumidor deja de iterar, se cancelan las reglas
+# pendientes y se avisa a las que están en curso vía ctx.cancel(). `run`
+# reemplaza a run_rule (p. ej. para cancelar desde el worker).
+def iter_rules(
+    ctx: RuleContext,
+    rules: List[Rule],
+    jobs: int = 1,
+    ordered: bool = True,
+    run: RunFn = run_rule,
+) -> Iterator[Finding]:
+    return iter_runs(ctx, [(ctx, rule) for rule in rules], jobs=jobs, ordered=ordered, run=run)
+
+# Igual que iter_rules, pero cada regla con su propio contexto (p. ej. un
+# subcontexto por subproyecto). `ctx` es el que se cancela: los
+# subcontextos comparten su estado de cancelación.
+def iter_runs(
+    ctx: RuleContext,
+    runs: List[Tuple[RuleContext, Rule]],
+    jobs: int = 1,
+    ordered: bool = True,
+    run: RunFn = run_rule,
+) -> Iterator[Finding]:
+    if jobs <= 1 or len(runs) <= 1:
+        try:
+            for run_ctx, rule in runs:
+                yield from run(run_ctx, rule)
+        except GeneratorExit:
+            ctx.cancel()
+            raise
+        return
+
+    # Import diferido: concurrent.futures (y logging) pesa en el arranque del CLI
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    pool = ThreadPoolExecutor(max_workers=min(jobs, len(runs)))
+    try:
+        futures = [pool.submit(run, run_ctx, rule) for run_ctx, rule in runs]
+        for fut in (futures if ordered else as_completed(futures)):
+            yield from fut.result()
+    except GeneratorExit:
+        ctx.cancel()
+        raise
+    finally:
+        pool.shutdown(wait=not ctx.cancelled, cancel_futures=True)
+
+# Runner simple para ejecutar un conjunto de reglas
+def run_rules(ctx: RuleContext, rules: List[Rule], jobs: int = 1) -> List[Finding]:
+    return list(iter_rules(ctx, rules, jobs=jobs))
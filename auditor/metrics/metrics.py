@@ -4,26 +4,38 @@ import argparse
 import csv
 import json
 import os
+import threading
 from dataclasses import dataclass
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
 
-import requests
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass  # python-dotenv no instalado
+if TYPE_CHECKING:
+    from auditor.report import Report
 
 
 GITHUB_API = "https://api.github.com"
+# Conexiones que el pool mantiene abiertas por host (llamadas concurrentes de un PR)
+POOL_SIZE = 4
+
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
 
 
 # ==========================
 # Helpers básicos
 # ==========================
 
+def _load_env() -> None:
+    # Se llama desde main(): importar el módulo no lee .env ni importa dotenv
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return  # python-dotenv no instalado
+    load_dotenv()
+
+
 def _get_token() -> str:
     token = os.getenv("GITHUB_TOKEN")
     if not token:
@@ -38,6 +50,37 @@ def _headers() -> Dict[str, str]:
     }
 
 
+def _api_url() -> str:
+    # GITHUB_API_URL: GitHub Enterprise o un servidor local en tests
+    return os.getenv("GITHUB_API_URL", GITHUB_API).rstrip("/")
+
+
+def _session():
+    """Sesión HTTP compartida: las llamadas reutilizan conexiones (sin un handshake TLS cada vez)."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _SESSION = session
+        return _SESSION
+
+
+def _request(url: str, params: Optional[Dict[str, Any]] = None):
+    resp = _session().get(url, headers=_headers(), params=params, timeout=30)
+    resp.raise_for_status()
+    return resp
+
+
+def _get(path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    return _request(f"{_api_url()}{path}", params).json()
+
+
 def _parse_iso(ts: str) -> datetime:
     return datetime.fromisoformat(ts.replace("Z", "+00:00"))
 
@@ -102,10 +145,7 @@ class Metrics:
 # ==========================
 
 def get_pr(repo: str, pr_number: int) -> PRInfo:
-    url = f"{GITHUB_API}/repos/{repo}/pulls/{pr_number}"
-    resp = requests.get(url, headers=_headers(), timeout=30)
-    resp.raise_for_status()
-    data = resp.json()
+    data = _get(f"/repos/{repo}/pulls/{pr_number}")
     return PRInfo(
         number=data["number"],
         created_at=_parse_iso(data["created_at"]),
@@ -115,11 +155,8 @@ def get_pr(repo: str, pr_number: int) -> PRInfo:
 
 
 def get_pr_reviews(repo: str, pr_number: int) -> List[ReviewInfo]:
-    url = f"{GITHUB_API}/repos/{repo}/pulls/{pr_number}/reviews"
-    resp = requests.get(url, headers=_headers(), timeout=30)
-    resp.raise_for_status()
     reviews: List[ReviewInfo] = []
-    for item in resp.json():
+    for item in _get(f"/repos/{repo}/pulls/{pr_number}/reviews"):
         if not item.get("submitted_at"):
             continue
         reviews.append(
@@ -131,25 +168,30 @@ def get_pr_reviews(repo: str, pr_number: int) -> List[ReviewInfo]:
     return reviews
 
 
-def get_workflow_runs_for_pr(
+def iter_workflow_runs(
     repo: str,
     workflow_id_or_file: str,
     head_sha: str,
-    per_page: int = 50,
-) -> List[RunInfo]:
-
-    url = f"{GITHUB_API}/repos/{repo}/actions/workflows/{workflow_id_or_file}/runs"
-    params = {"per_page": per_page}
-
-    resp = requests.get(url, headers=_headers(), params=params, timeout=30)
-    resp.raise_for_status()
-
-    runs: List[RunInfo] = []
-    for run in resp.json().get("workflow_runs", []):
-        if run.get("head_sha") != head_sha:
-            continue
-        runs.append(
-            RunInfo(
+    per_page: int = 100,
+) -> Iterator[RunInfo]:
+    """
+    Runs del workflow para `head_sha`, en el orden de la API (más nuevos
+    primero). El filtro lo aplica el servidor y las páginas siguientes
+    (header Link) se piden recién cuando se consume la anterior: cortar la
+    iteración corta las descargas.
+    """
+    url: Optional[str] = f"{_api_url()}/repos/{repo}/actions/workflows/{workflow_id_or_file}/runs"
+    params: Optional[Dict[str, Any]] = {"head_sha": head_sha, "per_page": per_page}
+    seen = 0
+    while url:
+        resp = _request(url, params)
+        data = resp.json()
+        page = data.get("workflow_runs", [])
+        for run in page:
+            # Por si el servidor ignora el filtro (GitHub Enterprise viejo)
+            if run.get("head_sha") != head_sha:
+                continue
+            yield RunInfo(
                 id=run["id"],
                 name=run["name"],
                 conclusion=run.get("conclusion"),
@@ -157,7 +199,23 @@ def get_workflow_runs_for_pr(
                 updated_at=_parse_iso(run["updated_at"]),
                 head_sha=run["head_sha"],
             )
-        )
+        seen += len(page)
+        total = data.get("total_count")
+        if not page or (total is not None and seen >= total):
+            return
+        # La URL de "next" ya trae los parámetros de la consulta
+        url, params = resp.links.get("next", {}).get("url"), None
+
+
+def get_workflow_runs_for_pr(
+    repo: str,
+    workflow_id_or_file: str,
+    head_sha: str,
+    per_page: int = 100,
+    limit: Optional[int] = None,
+) -> List[RunInfo]:
+    """Runs de `head_sha` ordenados por creación; con `limit`, solo los `limit` más recientes."""
+    runs = list(islice(iter_workflow_runs(repo, workflow_id_or_file, head_sha, per_page), limit))
     runs.sort(key=lambda r: r.created_at)
     return runs
 
@@ -206,18 +264,18 @@ def compute_remediation_and_blocked_time(runs: List[RunInfo]):
 # Report del auditor
 # ==========================
 
-def load_report(path: Path) -> Dict[str, Any]:
-    return json.loads(path.read_text(encoding="utf-8"))
+def load_report(path: Path) -> Report:
+    # JSON o formato binario; los findings solo se parsean si hacen falta
+    from auditor.report import load_report as _load
+    return _load(path)
 
 
-def compute_severity_counts(report: Dict[str, Any]) -> Dict[str, int]:
-    findings = report.get("findings", [])
-    counts = {"High": 0, "Medium": 0, "Low": 0}
-    for f in findings:
-        sev = f.get("severity")
-        if sev in counts:
-            counts[sev] += 1
-    return counts
+def compute_severity_counts(report: Report | Dict[str, Any]) -> Dict[str, int]:
+    if isinstance(report, dict):
+        from auditor.report import Report
+        report = Report.from_dict(report)
+    # El resumen del auditor ya trae los conteos: no hace falta recorrer los findings
+    return dict(report.summary["by_severity"])
 
 
 def compute_trend(current_counts: Dict[str, int]) -> Dict[str, str]:
@@ -233,12 +291,18 @@ def compute_metrics_for_pr(
     repo: str,
     pr_number: int,
     workflow_id_or_file: str,
-    report: Dict[str, Any],
+    report: Report,
 ) -> Metrics:
 
-    pr = get_pr(repo, pr_number)
-    reviews = get_pr_reviews(repo, pr_number)
-    runs = get_workflow_runs_for_pr(repo, workflow_id_or_file, pr.head_sha)
+    from concurrent.futures import ThreadPoolExecutor
+
+    # Las reviews solo dependen del número de PR: se piden en paralelo con
+    # la cadena PR -> runs (que necesita el head SHA). Dos viajes en vez de tres.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        reviews_future = pool.submit(get_pr_reviews, repo, pr_number)
+        pr = get_pr(repo, pr_number)
+        runs = get_workflow_runs_for_pr(repo, workflow_id_or_file, pr.head_sha)
+        reviews = reviews_future.result()
 
     sev_counts = compute_severity_counts(report)
     cycle = compute_cycle_time(pr)
@@ -325,6 +389,7 @@ def _parse_args(argv=None):
 
 
 def main(argv=None) -> int:
+    _load_env()
     args = _parse_args(argv)
 
     report_path = Path(args.report)
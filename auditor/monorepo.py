@@ -0,0 +1,69 @@
+from __future__ import annotations
+from dataclasses import dataclass
+import os
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from auditor.core import Finding, Rule, RuleContext, RunFn, run_rule, iter_runs
+
+# Archivos que marcan la raíz de un subproyecto
+MARKERS = ("pyproject.toml", "Makefile", "package.json")
+
+
+@dataclass(frozen=True)
+class Subproject:
+    path: str                 # relativo a la raíz auditada, con "/"
+    markers: Tuple[str, ...]  # marcadores encontrados en ese directorio
+
+
+def discover(ctx: RuleContext, markers: Iterable[str] = MARKERS) -> List[Subproject]:
+    """
+    Subproyectos bajo la raíz: directorios (distintos de la raíz) que
+    contienen algún marcador. Usa el índice de archivos del contexto, así
+    que no hay un recorrido extra del árbol.
+    """
+    names = frozenset(markers)
+    # En modo diff `files` solo tiene lo cambiado; el descubrimiento ve el árbol completo
+    index = ctx.all_files
+    found: Dict[str, List[str]] = {}
+    for entry in index:
+        parent, _, name = entry.rel.rpartition("/")
+        if parent and name in names:
+            found.setdefault(parent, []).append(name)
+    return [Subproject(path, tuple(sorted(found[path]))) for path in sorted(found)]
+
+
+def owner(path: str | None, subprojects: List[Subproject]) -> str | None:
+    """
+    Subproyecto más profundo que contiene `path` (relativa a la raíz), o
+    None si el archivo es de la raíz. Las rutas absolutas no se asignan.
+    """
+    if not path or os.path.isabs(path):
+        return None
+    rel = path.replace(os.sep, "/")
+    best = None
+    for sp in subprojects:
+        if rel.startswith(sp.path + "/") and (best is None or len(sp.path) > len(best)):
+            best = sp.path
+    return best
+
+
+def iter_monorepo(
+    ctx: RuleContext,
+    rules: List[Rule],
+    subprojects: List[Subproject],
+    jobs: int = 1,
+    ordered: bool = True,
+    run: RunFn = run_rule,
+) -> Iterator[Finding]:
+    """
+    Todas las reglas sobre la raíz y, en cada subproyecto, las reglas de
+    raíz (las que declaran `inputs`: .gitignore, Makefile, LICENSE...).
+    Todo corre en el mismo pool; los findings de un subproyecto llevan
+    meta["subproject"].
+    """
+    runs: List[Tuple[RuleContext, Rule]] = [(ctx, rule) for rule in rules]
+    root_rules = [rule for rule in rules if getattr(rule, "inputs", None)]
+    for sp in subprojects:
+        sub = ctx.subcontext(sp.path)
+        runs.extend((sub, rule) for rule in root_rules)
+    return iter_runs(ctx, runs, jobs=jobs, ordered=ordered, run=run)
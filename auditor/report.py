@@ -0,0 +1,375 @@
+"""
+Modelo de un reporte ya escrito (JSON o binario), compartido por las
+herramientas que lo consumen: md_renderer, render_summary, metrics y
+publish_to_project.
+
+Report decodifica el encabezado al cargarse (en JSON, solo lo que está antes
+de los findings); los findings se convierten a auditor.core.Finding recién
+al primer acceso, y las vistas derivadas (por severidad, regla o ruta) se
+calculan una vez y se memorizan.
+"""
+from __future__ import annotations
+import heapq
+import json
+import os
+import re
+import sys
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, TextIO, Tuple
+
+from auditor.core import Finding, Severity
+from auditor.reporting.binary_report import BinaryReport, is_binary_report
+
+# Lectura incremental de JSON: tamaño de cada bloque leído
+CHUNK_SIZE = 1 << 20
+
+# Severidades en orden de gravedad; las claves del resumen usan estos valores
+SEVERITIES = (Severity.HIGH, Severity.MEDIUM, Severity.LOW)
+_RANK = {s: len(SEVERITIES) - i for i, s in enumerate(SEVERITIES)}
+_BY_NAME = {s.value.lower(): s for s in Severity}
+
+
+def finding_from_dict(data: Mapping[str, Any]) -> Finding | None:
+    """
+    Finding a partir de un registro del reporte. Severidad sin distinguir
+    mayúsculas ("Low" si falta); None si no es una severidad del auditor
+    (p. ej. "Info" de otra herramienta). Registro mal formado -> TypeError/ValueError.
+    """
+    if not isinstance(data, Mapping):
+        raise TypeError(f"se esperaba un objeto, no {type(data).__name__}")
+    severity = _BY_NAME.get(str(data.get("severity") or "low").lower())
+    if severity is None:
+        return None
+    meta = data.get("meta")
+    return Finding(
+        rule_id=str(data.get("rule_id") or "unknown"),
+        message=str(data.get("message") or ""),
+        severity=severity,
+        path=data.get("path"),
+        meta=dict(meta) if meta else None,
+    )
+
+
+class _JsonStream:
+    """Lector incremental de un documento JSON: mantiene en memoria solo un bloque."""
+
+    _WS = re.compile(r'[ \t\n\r]*')
+
+    def __init__(self, fh: TextIO):
+        self._fh = fh
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        chunk = self._fh.read(CHUNK_SIZE)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Próximo carácter que no es espacio ('' al final del archivo)."""
+        while True:
+            self._pos = self._WS.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Se esperaba {char!r}", self._buf, self._pos)
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decodifica el próximo valor completo, leyendo más bloques si hace falta."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+                # Un valor que llega justo al final del bloque puede estar cortado (p. ej. un número)
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill()
+
+
+def _members(fh: TextIO) -> Iterator[Tuple[Optional[str], Any]]:
+    """
+    Miembros del objeto raíz de un reporte JSON como (clave, valor); los
+    elementos de `findings` salen de a uno como (None, finding).
+    JSON inválido -> json.JSONDecodeError.
+    """
+    stream = _JsonStream(fh)
+    stream.expect('{')
+    if stream.peek() == '}':
+        return
+    while True:
+        key = stream.value()
+        stream.expect(':')
+        if key == 'findings':
+            stream.expect('[')
+            if stream.peek() == ']':
+                stream.expect(']')
+            else:
+                while True:
+                    yield None, stream.value()
+                    if stream.peek() != ',':
+                        stream.expect(']')
+                        break
+                    stream.expect(',')
+        else:
+            yield key, stream.value()
+        if stream.peek() != ',':
+            stream.expect('}')
+            return
+        stream.expect(',')
+
+
+def iter_report_findings(fh: TextIO) -> Iterator[Dict[str, Any]]:
+    """
+    Registros de `findings` de un reporte JSON, en orden y sin cargar el
+    documento completo. JSON inválido -> json.JSONDecodeError.
+    """
+    for key, value in _members(fh):
+        if key is None:
+            yield value
+
+
+def iter_records(path: str | Path) -> Iterator[Dict[str, Any]]:
+    """
+    Registros de un reporte en disco de a uno, con memoria acotada: mmap en
+    el formato binario, parser incremental en JSON. El archivo se cierra al
+    agotar o cerrar el generador.
+    """
+    if is_binary_report(path):
+        with BinaryReport(path) as report:
+            yield from report
+    else:
+        with open(path, 'r', encoding='utf-8') as fh:
+            yield from iter_report_findings(fh)
+
+
+def _read_head(path: str | Path) -> Tuple[Dict[str, Any], bool]:
+    """
+    Miembros de un reporte JSON anteriores al primer finding. El booleano
+    indica si quedó algo sin leer (findings y las claves que los siguen).
+    """
+    head: Dict[str, Any] = {}
+    with open(path, 'r', encoding='utf-8') as fh:
+        members = _members(fh)
+        for key, value in members:
+            if key is None:
+                members.close()
+                return head, True
+            head[key] = value
+    return head, False
+
+
+def _read_all_members(path: str | Path) -> Dict[str, Any]:
+    # Todo menos los findings, en una pasada con memoria acotada
+    with open(path, 'r', encoding='utf-8') as fh:
+        return {key: value for key, value in _members(fh) if key is not None}
+
+
+class _JsonRecords:
+    """Findings de un reporte JSON en disco: cada iteración los relee en streaming."""
+
+    def __init__(self, path: str | Path):
+        self.path = path
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter_records(self.path)
+
+
+class Report:
+    """
+    Reporte del auditor. `header` tiene todo menos los findings (repo_root,
+    summary, skipped, subprojects...) y `head` solo lo que en el archivo está
+    antes de ellos (todo, si no hay findings); `records` son los findings tal como
+    están en el archivo: una lista, la secuencia perezosa del formato
+    binario o, en un JSON en disco, un iterable que los relee en streaming.
+    """
+
+    def __init__(
+        self,
+        header: Dict[str, Any],
+        records: Iterable[Dict[str, Any]] = (),
+        path: str | Path | None = None,
+    ):
+        self.head = header
+        self.records = records
+        # JSON leído solo hasta los findings: el resto del encabezado se lee si se pide
+        self._tail_path = path
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> Report:
+        header = {k: v for k, v in data.items() if k != "findings"}
+        return cls(header, data.get("findings") or [])
+
+    @classmethod
+    def load(cls, path: str | Path) -> Report:
+        """
+        Carga un reporte JSON o binario (se detecta por la firma). En JSON
+        se leen los miembros hasta `findings`; si el resumen está antes (como
+        en los reportes que el CLI escribe a archivo), los findings quedan
+        sin leer. Si el resumen viene después, se parsea el documento entero.
+        """
+        if is_binary_report(path):
+            binary = BinaryReport(path)
+            return cls(dict(binary.header), binary)
+        try:
+            head, pending = _read_head(path)
+        except json.JSONDecodeError:
+            raise ValueError(f"{path}: el reporte debe ser un objeto JSON") from None
+        if not pending:
+            return cls(head)
+        if "summary" in head:
+            return cls(head, _JsonRecords(path), path=path)
+        with open(path, 'r', encoding='utf-8') as fh:
+            return cls.from_dict(json.load(fh))
+
+    @cached_property
+    def header(self) -> Dict[str, Any]:
+        if self._tail_path is None:
+            return self.head
+        return {**self.head, **_read_all_members(self._tail_path)}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Campo del encabezado; busca después de los findings solo si no está antes."""
+        if key in self.head:
+            return self.head[key]
+        return self.header.get(key, default)
+
+    def close(self) -> None:
+        """Libera el mapa del formato binario (se vuelve a abrir si se lo usa)."""
+        close = getattr(self.records, "close", None)
+        if close is not None:
+            close()
+
+    def __enter__(self) -> Report:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    @property
+    def repo_root(self) -> str | None:
+        return self.get("repo_root")
+
+    def _iter_parsed(self) -> Iterator[Optional[Finding]]:
+        # Un Finding por registro válido; None si la severidad no es del auditor
+        for data in self.records:
+            try:
+                yield finding_from_dict(data)
+            except (TypeError, ValueError) as exc:
+                print(f"Warning: Error al procesar hallazgo: {exc}", file=sys.stderr)
+
+    @cached_property
+    def _parsed(self) -> tuple[List[Finding], int]:
+        findings: List[Finding] = []
+        unrated = 0
+        for finding in self._iter_parsed():
+            if finding is None:
+                unrated += 1
+            else:
+                findings.append(finding)
+        return findings, unrated
+
+    def iter_findings(self) -> Iterator[Finding]:
+        """Findings de a uno sin guardarlos (usa la lista si ya se parsearon)."""
+        if "_parsed" in self.__dict__:
+            return iter(self.findings)
+        return (f for f in self._iter_parsed() if f is not None)
+
+    @property
+    def findings(self) -> List[Finding]:
+        """Findings con severidad del auditor, en el orden del reporte."""
+        return self._parsed[0]
+
+    @property
+    def unrated(self) -> int:
+        """Registros válidos con una severidad que el auditor no usa (no están en `findings`)."""
+        return self._parsed[1]
+
+    @cached_property
+    def by_severity(self) -> Dict[Severity, List[Finding]]:
+        """High, Medium y Low (siempre las tres claves), cada una en el orden del reporte."""
+        groups: Dict[Severity, List[Finding]] = {s: [] for s in SEVERITIES}
+        for f in self.findings:
+            groups[f.severity].append(f)
+        return groups
+
+    @cached_property
+    def by_rule(self) -> Dict[str, List[Finding]]:
+        groups: Dict[str, List[Finding]] = {}
+        for f in self.findings:
+            groups.setdefault(f.rule_id, []).append(f)
+        return groups
+
+    @cached_property
+    def by_path(self) -> Dict[str | None, List[Finding]]:
+        groups: Dict[str | None, List[Finding]] = {}
+        for f in self.findings:
+            groups.setdefault(f.path, []).append(f)
+        return groups
+
+    @cached_property
+    def summary(self) -> Dict[str, Any]:
+        """
+        {"total", "by_severity": {"High", "Medium", "Low"}}. Sale del
+        encabezado si lo trae; si no, se cuenta (y se parsean los findings).
+        """
+        raw = self.get("summary") or {}
+        by_sev = raw.get("by_severity")
+        if by_sev is None:
+            by_sev = {s.value: len(self.by_severity[s]) for s in SEVERITIES}
+        total = raw.get("total")
+        if total is None:
+            try:
+                total = len(self.records)  # type: ignore[arg-type]
+            except TypeError:
+                total = sum(1 for _ in self.records)
+        return {
+            "total": int(total),
+            "by_severity": {s.value: int(by_sev.get(s.value, 0)) for s in SEVERITIES},
+        }
+
+    def top(self, n: int) -> List[Finding]:
+        """
+        Los `n` findings más graves; a igual severidad, en el orden del
+        reporte. Heap acotado sobre los registros (nlargest es estable):
+        memoria O(n), sin armar las agrupaciones.
+        """
+        return heapq.nlargest(n, self.iter_findings(), key=lambda f: _RANK[f.severity])
+
+
+# Reportes ya cargados, por ruta y versión del archivo: las herramientas
+# encadenadas en un mismo proceso no vuelven a parsear el mismo reporte
+_LOADED: Dict[str, tuple[tuple[int, int], Report]] = {}
+_MAX_LOADED = 4
+
+
+def load_report(path: str | Path) -> Report:
+    """Report.load con memo: mismo archivo sin cambios -> mismo objeto Report."""
+    key = os.path.abspath(path)
+    st = os.stat(key)
+    version = (st.st_mtime_ns, st.st_size)
+    cached = _LOADED.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    report = Report.load(key)
+    if cached is not None:
+        cached[1].close()
+    elif len(_LOADED) >= _MAX_LOADED:
+        _LOADED.pop(next(iter(_LOADED)))[1].close()
+    _LOADED[key] = (version, report)
+    return report
@@ -0,0 +1,159 @@
+"""
+Formato binario compacto del reporte del auditor.
+
+    preámbulo   MAGIC (4 bytes) + versión (u16) + flags (u16)
+    registros   por finding: largo (u32) + JSON UTF-8 compacto
+    encabezado  JSON con repo_root, summary y demás campos del reporte
+    índice      offset (u64) de cada registro
+    pie         offset y largo del encabezado, offset del índice, cantidad
+                de registros (u64 cada uno) + MAGIC
+
+Todos los enteros son little-endian. Los punteros van al final (como en
+zip o Parquet) para poder escribir en streaming, incluso a un pipe: el
+resumen se conoce recién después del último finding. Leer el resumen
+cuesta tres lecturas chicas sin importar el tamaño del archivo, y los
+findings se leen de a uno desde un mmap.
+"""
+from __future__ import annotations
+import json
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator
+
+MAGIC = b"AUDR"
+VERSION = 1
+
+_PREAMBLE = struct.Struct("<4sHH")
+_FOOTER = struct.Struct("<QQQQ4s")
+_LENGTH = struct.Struct("<I")
+_OFFSET = struct.Struct("<Q")
+
+
+class BinaryReportWriter:
+    """Escribe un reporte binario en `out` (cualquier archivo binario, sin seek)."""
+
+    def __init__(self, out: BinaryIO):
+        self._out = out
+        self._encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+        self._offsets = array("Q")
+        out.write(_PREAMBLE.pack(MAGIC, VERSION, 0))
+        self._pos = _PREAMBLE.size
+
+    def add(self, record: Dict[str, Any]) -> None:
+        data = self._encode(record).encode("utf-8")
+        self._offsets.append(self._pos)
+        self._out.write(_LENGTH.pack(len(data)) + data)
+        self._pos += _LENGTH.size + len(data)
+
+    def close(self, header: Dict[str, Any]) -> None:
+        """Escribe el encabezado (resumen y demás campos), el índice y el pie."""
+        meta = self._encode(header).encode("utf-8")
+        meta_offset = self._pos
+        index_offset = meta_offset + len(meta)
+        if sys.byteorder == "big":
+            self._offsets.byteswap()
+        self._out.write(meta)
+        self._out.write(self._offsets.tobytes())
+        self._out.write(_FOOTER.pack(meta_offset, len(meta), index_offset, len(self._offsets), MAGIC))
+        self._out.flush()
+
+
+def is_binary_report(path: str | Path) -> bool:
+    """True si el archivo empieza con la firma del formato binario."""
+    with open(path, "rb") as fh:
+        return fh.read(len(MAGIC)) == MAGIC
+
+
+def _check(preamble: bytes, footer: bytes, path: str | Path) -> tuple:
+    if len(preamble) < _PREAMBLE.size or len(footer) < _FOOTER.size:
+        raise ValueError(f"{path}: reporte binario truncado")
+    magic, version, _flags = _PREAMBLE.unpack(preamble)
+    *pointers, tail = _FOOTER.unpack(footer)
+    if magic != MAGIC or tail != MAGIC:
+        raise ValueError(f"{path}: no es un reporte binario del auditor")
+    if version != VERSION:
+        raise ValueError(f"{path}: versión de reporte binario no soportada ({version})")
+    return tuple(pointers)
+
+
+def read_header(path: str | Path) -> Dict[str, Any]:
+    """Encabezado (repo_root, summary...) sin leer ningún finding."""
+    with open(path, "rb") as fh:
+        preamble = fh.read(_PREAMBLE.size)
+        size = fh.seek(0, 2)
+        fh.seek(max(size - _FOOTER.size, 0))
+        meta_offset, meta_len, _, _ = _check(preamble, fh.read(_FOOTER.size), path)
+        fh.seek(meta_offset)
+        return json.loads(fh.read(meta_len))
+
+
+class BinaryReport(Sequence):
+    """
+    Reporte binario. `header` se decodifica al abrir; los findings se
+    decodifican al accederlos, desde un mmap. Cada iteración mapea el
+    archivo por su cuenta y lo libera al terminar; el acceso por índice usa
+    un mapa que se abre al primer uso y se libera con close() (un acceso
+    posterior lo vuelve a abrir).
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = path
+        with self._map() as buf:
+            meta_offset, meta_len, self._index, self._count = _check(
+                buf[:_PREAMBLE.size], buf[-_FOOTER.size:], path
+            )
+            self.header: Dict[str, Any] = json.loads(buf[meta_offset:meta_offset + meta_len])
+        self._buf: mmap.mmap | None = None
+
+    def _map(self) -> mmap.mmap:
+        with open(self.path, "rb") as fh:
+            try:
+                return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # archivo vacío
+                raise ValueError(f"{self.path}: reporte binario truncado") from None
+
+    @property
+    def summary(self) -> Dict[str, Any]:
+        return self.header.get("summary") or {}
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._count))]
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("índice de finding fuera de rango")
+        if self._buf is None:
+            self._buf = self._map()
+        (offset,) = _OFFSET.unpack_from(self._buf, self._index + i * _OFFSET.size)
+        (length,) = _LENGTH.unpack_from(self._buf, offset)
+        start = offset + _LENGTH.size
+        return json.loads(self._buf[start:start + length])
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        # Los registros son contiguos: no hace falta consultar el índice
+        with self._map() as buf:
+            offset = _PREAMBLE.size
+            for _ in range(self._count):
+                (length,) = _LENGTH.unpack_from(buf, offset)
+                start = offset + _LENGTH.size
+                yield json.loads(buf[start:start + length])
+                offset = start + length
+
+    def close(self) -> None:
+        if self._buf is not None:
+            self._buf.close()
+            self._buf = None
+
+    def __enter__(self) -> BinaryReport:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
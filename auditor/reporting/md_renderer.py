@@ -1,64 +1,58 @@
 import json
 import argparse
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+import heapq
+import tempfile
+from contextlib import ExitStack, closing
+from operator import itemgetter
+from typing import Dict, List, Any, Iterator, Optional, TextIO, Tuple, Union
+from pathlib import Path
 import sys
 
+from auditor.core import Finding
+from auditor.report import (
+    Report,
+    finding_from_dict,
+    iter_records,
+    iter_report_findings,  # noqa: F401  (API histórica de este módulo)
+    load_report,
+)
 
-@dataclass
-class Finding:
-    """Clase que representa un hallazgo del auditor."""
-    rule_id: str
-    file: str
-    message: str
-    severity: str = "low"
-    line: Optional[int] = None
-    context: Optional[str] = None
 
+# Modo streaming: memoria para filas antes de volcarlas a disco
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
 
-def load_json_report(input_path: str) -> Dict[str, Any]:
-    """Carga el reporte JSON del auditor.
+
+def load_json_report(input_path: str) -> Report:
+    """Carga el reporte del auditor (JSON o binario).
     
     Args:
-        input_path: Ruta al archivo JSON de entrada.
+        input_path: Ruta al archivo de entrada.
         
     Returns:
-        Dict con los datos del reporte.
+        Report con el resumen; los hallazgos se parsean al usarlos.
         
     Raises:
         FileNotFoundError: Si el archivo no existe.
         json.JSONDecodeError: Si el archivo no es un JSON válido.
+        ValueError: Si el reporte binario está dañado.
     """
-    with open(input_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return load_report(input_path)
+
+
+def _as_report(report_data: Union[Report, Dict]) -> Report:
+    return report_data if isinstance(report_data, Report) else Report.from_dict(report_data)
 
 
-def parse_findings(report_data: Dict) -> List[Finding]:
+def parse_findings(report_data: Union[Report, Dict]) -> List[Finding]:
     """Convierte los datos del reporte en una lista de objetos Finding.
     
     Args:
-        report_data: Datos del reporte del auditor.
+        report_data: Report o dict con los datos del reporte del auditor.
         
     Returns:
-        Lista de objetos Finding.
+        Lista de objetos Finding (auditor.core.Finding).
     """
-    findings = []
-    for finding_data in report_data.get('findings', []):
-        try:
-            # Obtener metadatos adicionales
-            meta = finding_data.get('meta', {})
-            finding = Finding(
-                rule_id=finding_data.get('rule_id', 'unknown'),
-                file=finding_data.get('path', ''),  # Usar 'path' en lugar de 'file'
-                message=finding_data.get('message', ''),
-                severity=finding_data.get('severity', 'low').lower(),
-                line=meta.get('line'),  # Obtener la línea de los metadatos
-                context=meta.get('context')
-            )
-            findings.append(finding)
-        except (TypeError, ValueError) as e:
-            print(f"Warning: Error al procesar hallazgo: {e}", file=sys.stderr)
-    return findings
+    return _as_report(report_data).findings
 
 
 def group_by_severity(findings: List[Finding]) -> Dict[str, List[Finding]]:
@@ -77,51 +71,80 @@ def group_by_severity(findings: List[Finding]) -> Dict[str, List[Finding]]:
     }
     
     for finding in findings:
-        severity = finding.severity.lower()
-        if severity not in severity_groups:
-            severity_groups[severity] = []
-        severity_groups[severity].append(finding)
+        severity_groups[finding.severity.value.lower()].append(finding)
         
     return severity_groups
 
 
-def generate_markdown(report_data: Dict) -> str:
+def _line(finding: Finding) -> Any:
+    return (finding.meta or {}).get('line')
+
+
+def _sort_key(finding: Finding) -> Tuple[str, Any]:
+    # Hallazgos sin ruta (path null) se ordenan como ruta vacía
+    return (finding.path or '', _line(finding) or 0)
+
+
+def _render_row(finding: Finding) -> str:
+    line = _line(finding)
+    line_num = str(line) if line is not None else 'N/A'
+    file_path = finding.path if finding.path else 'N/A'
+    return f"| {finding.rule_id} | `{file_path}` | {line_num} | {finding.message} |"
+
+
+def _summary_lines(counts: Dict[str, int]) -> List[str]:
+    return [
+        '# Reporte de Auditoría de Repositorio',
+        '',
+        '## Resumen',
+        f"- Hallazgos totales: {counts['total']}",
+        f"- Alta severidad: {counts['high']}",
+        f"- Media severidad: {counts['medium']}",
+        f"- Baja severidad: {counts['low']}",
+        ''
+    ]
+
+
+def _section_header(severity: str) -> List[str]:
+    return [
+        f'## {severity.capitalize()} Severidad',
+        '',
+        '| Regla | Archivo | Línea | Mensaje |',
+        '|-------|---------|-------|---------|'
+    ]
+
+
+_NO_FINDINGS = [
+    '## Resultado',
+    'No se encontraron problemas en el análisis del repositorio.'
+]
+
+
+def generate_markdown(report_data: Union[Report, Dict]) -> str:
     """Genera el reporte en formato Markdown.
     
     Args:
-        report_data: Datos del reporte del auditor.
+        report_data: Report o dict con los datos del reporte del auditor.
         
     Returns:
         String con el reporte en formato Markdown.
     """
-    findings = parse_findings(report_data)
-    severity_groups = group_by_severity(findings)
+    report = _as_report(report_data)
+    severity_groups = {s.value.lower(): group for s, group in report.by_severity.items()}
     
-    # Contar hallazgos por severidad
+    # Contar hallazgos por severidad (el total incluye severidades ajenas al auditor)
     counts = {
         'high': len(severity_groups['high']),
         'medium': len(severity_groups['medium']),
         'low': len(severity_groups['low']),
-        'total': len(findings)
+        'total': len(report.findings) + report.unrated
     }
     
     # Generar el reporte
-    lines = [
-        '# Reporte de Auditoría de Repositorio',
-        '',
-        '## Resumen',
-        f"- Hallazgos totales: {counts['total']}",
-        f"- Alta severidad: {counts['high']}",
-        f"- Media severidad: {counts['medium']}",
-        f"- Baja severidad: {counts['low']}",
-        ''
-    ]
+    lines = _summary_lines(counts)
     
     if counts['total'] == 0:
-        lines.extend([
-            '## Resultado',
-            'No se encontraron problemas en el análisis del repositorio.'
-        ])
+        lines.extend(_NO_FINDINGS)
         return '\n'.join(lines)
     
     # Generar secciones por severidad
@@ -131,27 +154,238 @@ def generate_markdown(report_data: Dict) -> str:
         if not findings_list:
             continue
             
-        severity_title = severity.capitalize()
-        lines.extend([
-            f'## {severity_title} Severidad',
-            '',
-            '| Regla | Archivo | Línea | Mensaje |',
-            '|-------|---------|-------|---------|'
-        ])
+        lines.extend(_section_header(severity))
         
-        for finding in sorted(findings_list, key=lambda x: (x.file, x.line or 0)):
-            line_num = str(finding.line) if finding.line is not None else 'N/A'
-            
-            file_path = finding.file if hasattr(finding, 'file') and finding.file else 'N/A'
-            lines.append(
-                f"| {finding.rule_id} | `{file_path}` | {line_num} | {finding.message} |"
-            )
+        for finding in sorted(findings_list, key=_sort_key):
+            lines.append(_render_row(finding))
         
         lines.append('')
     
     return '\n'.join(lines)
 
 
+# Clave de orden de una fila: (archivo, línea, posición en el reporte)
+_RowKey = Tuple[Any, Any, int]
+
+
+class _SpillBucket:
+    """Filas de una severidad: en memoria y, al volcar, corridas ordenadas en disco."""
+
+    def __init__(self, stack: ExitStack):
+        self._stack = stack
+        self._rows: List[Tuple[_RowKey, str]] = []
+        self._runs: List[TextIO] = []
+        self.count = 0
+
+    def add(self, key: _RowKey, row: str) -> None:
+        self._rows.append((key, row))
+        self.count += 1
+
+    def spill(self) -> None:
+        if not self._rows:
+            return
+        self._rows.sort(key=itemgetter(0))
+        run = self._stack.enter_context(tempfile.TemporaryFile('w+', encoding='utf-8'))
+        encode = json.JSONEncoder(ensure_ascii=False).encode
+        run.writelines(encode([key, row]) + '\n' for key, row in self._rows)
+        run.seek(0)
+        self._runs.append(run)
+        self._rows = []
+
+    def sorted_rows(self) -> Iterator[str]:
+        self._rows.sort(key=itemgetter(0))
+        runs = [
+            ((tuple(key), row) for key, row in map(json.loads, run))
+            for run in self._runs
+        ]
+        for _, row in heapq.merge(*runs, self._rows, key=itemgetter(0)):
+            yield row
+
+
+def _collect_rows(
+    input_path: str,
+    stack: ExitStack,
+    memory_budget: int,
+) -> Tuple[Dict[str, int], Dict[str, _SpillBucket]]:
+    """Una pasada por el reporte: conteos y filas por severidad (volcadas si no entran)."""
+    counts = {'high': 0, 'medium': 0, 'low': 0, 'total': 0}
+    buckets = {severity: _SpillBucket(stack) for severity in ('high', 'medium', 'low')}
+    buffered = 0
+    records = stack.enter_context(closing(iter_records(input_path)))
+    for seq, finding_data in enumerate(records):
+        try:
+            finding = finding_from_dict(finding_data)
+        except (TypeError, ValueError) as e:
+            print(f"Warning: Error al procesar hallazgo: {e}", file=sys.stderr)
+            continue
+        counts['total'] += 1
+        if finding is None:
+            continue  # severidad ajena al auditor: cuenta en el total, sin sección
+        severity = finding.severity.value.lower()
+        bucket = buckets[severity]
+        counts[severity] += 1
+        row = _render_row(finding)
+        bucket.add((*_sort_key(finding), seq), row)
+        # Tamaño aproximado de la fila más la tupla y la clave
+        buffered += len(row) + 200
+        if buffered > memory_budget:
+            for b in buckets.values():
+                b.spill()
+            buffered = 0
+    return counts, buckets
+
+
+class _LineWriter:
+    """Escribe líneas separadas por '\\n' (como '\\n'.join) sin armar la lista."""
+
+    def __init__(self, out: TextIO):
+        self._out = out
+        self._first = True
+
+    def __call__(self, line: str) -> None:
+        self._out.write(line if self._first else '\n' + line)
+        self._first = False
+
+
+def render_markdown_stream(
+    input_path: str,
+    out: TextIO,
+    memory_budget: int = DEFAULT_MEMORY_BUDGET,
+) -> Dict[str, int]:
+    """Genera el mismo Markdown que generate_markdown leyendo el reporte en streaming.
+
+    Los hallazgos se leen de a uno; las filas de cada severidad se acumulan
+    hasta `memory_budget` bytes (aprox.) y luego se vuelcan ordenadas a
+    archivos temporales, que al final se mezclan con heapq.merge.
+
+    Args:
+        input_path: Ruta al archivo JSON de entrada.
+        out: Archivo de salida para el Markdown.
+        memory_budget: Bytes de filas a mantener en memoria antes de volcar.
+
+    Returns:
+        Conteos por severidad y total.
+    """
+    with ExitStack() as stack:
+        counts, buckets = _collect_rows(input_path, stack, memory_budget)
+        emit = _LineWriter(out)
+        for line in _summary_lines(counts):
+            emit(line)
+        if counts['total'] == 0:
+            for line in _NO_FINDINGS:
+                emit(line)
+            return counts
+        for severity, bucket in buckets.items():
+            if not bucket.count:
+                continue
+            for line in _section_header(severity):
+                emit(line)
+            for row in bucket.sorted_rows():
+                emit(row)
+            emit('')
+    return counts
+
+
+def _page_name(output_path: Path, page: int) -> str:
+    return f"{output_path.stem}-{page:03d}{output_path.suffix or '.md'}"
+
+
+def render_markdown_pages(
+    input_path: str,
+    output_path: str,
+    page_size: int,
+    memory_budget: int = DEFAULT_MEMORY_BUDGET,
+) -> List[str]:
+    """Genera el reporte paginado: un índice en `output_path` y páginas de `page_size` filas.
+
+    Las páginas (`report-001.md`, `report-002.md`...) siguen el orden de
+    generate_markdown (severidad, archivo, línea) y el índice enlaza a cada
+    una con sus conteos por severidad. Usa la misma pasada en streaming que
+    render_markdown_stream.
+
+    Args:
+        input_path: Ruta al archivo JSON de entrada.
+        output_path: Ruta del índice; las páginas se escriben a su lado.
+        page_size: Hallazgos por página.
+        memory_budget: Bytes de filas a mantener en memoria antes de volcar.
+
+    Returns:
+        Rutas de las páginas escritas.
+    """
+    if page_size < 1:
+        raise ValueError("page_size debe ser >= 1")
+    index_path = Path(output_path)
+    pages: List[Dict[str, int]] = []
+    with ExitStack() as stack:
+        counts, buckets = _collect_rows(input_path, stack, memory_budget)
+        total_rows = sum(b.count for b in buckets.values())
+        n_pages = -(-total_rows // page_size)
+
+        page_out: Optional[TextIO] = None
+        emit = None
+        rows_in_page = 0
+        for severity, bucket in buckets.items():
+            section_open = False
+            for row in bucket.sorted_rows():
+                if page_out is None or rows_in_page == page_size:
+                    if page_out is not None:
+                        emit('')
+                        page_out.close()
+                    number = len(pages) + 1
+                    pages.append({})
+                    page_out = open(index_path.with_name(_page_name(index_path, number)),
+                                    'w', encoding='utf-8')
+                    emit = _LineWriter(page_out)
+                    for line in _page_header(index_path, number, n_pages):
+                        emit(line)
+                    rows_in_page = 0
+                    section_open = False
+                if not section_open:
+                    if rows_in_page:
+                        emit('')
+                    for line in _section_header(severity):
+                        emit(line)
+                    section_open = True
+                emit(row)
+                pages[-1][severity] = pages[-1].get(severity, 0) + 1
+                rows_in_page += 1
+        if page_out is not None:
+            emit('')
+            page_out.close()
+
+    with open(index_path, 'w', encoding='utf-8') as out:
+        emit = _LineWriter(out)
+        for line in _summary_lines(counts):
+            emit(line)
+        if counts['total'] == 0:
+            for line in _NO_FINDINGS:
+                emit(line)
+        else:
+            emit('## Páginas')
+            emit('')
+            for number, page_counts in enumerate(pages, 1):
+                detail = ', '.join(
+                    f"{severity.capitalize()}: {n}" for severity, n in page_counts.items()
+                )
+                emit(f"- [Página {number}]({_page_name(index_path, number)}) ({detail})")
+            emit('')
+    return [str(index_path.with_name(_page_name(index_path, n))) for n in range(1, len(pages) + 1)]
+
+
+def _page_header(index_path: Path, number: int, n_pages: int) -> List[str]:
+    links = [f"[Índice]({index_path.name})"]
+    if number > 1:
+        links.append(f"[Anterior]({_page_name(index_path, number - 1)})")
+    if number < n_pages:
+        links.append(f"[Siguiente]({_page_name(index_path, number + 1)})")
+    return [
+        f'# Reporte de Auditoría de Repositorio (página {number} de {n_pages})',
+        '',
+        ' · '.join(links),
+        '',
+    ]
+
+
 def save_report(content: str, output_path: str) -> None:
     """Guarda el reporte en un archivo.
     
@@ -163,7 +397,7 @@ def save_report(content: str, output_path: str) -> None:
         f.write(content)
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """Función principal del script."""
     parser = argparse.ArgumentParser(
         description='Renderiza un reporte JSON del auditor a formato Markdown.'
@@ -181,9 +415,44 @@ def main():
         help='Ruta donde guardar el reporte Markdown (por defecto: report.md)'
     )
     
-    args = parser.parse_args()
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Leer el reporte en streaming (para reportes enormes); mismo resultado'
+    )
+    parser.add_argument(
+        '--memory-mb',
+        type=int,
+        default=DEFAULT_MEMORY_BUDGET // (1024 * 1024),
+        help='Con --stream, memoria para filas antes de volcar a disco (por defecto: 64)'
+    )
+    
+    parser.add_argument(
+        '--page-size',
+        type=int,
+        default=None,
+        help=(
+            'Paginar: N hallazgos por archivo (report-001.md...) y un índice en --output '
+            'con enlaces a cada página'
+        )
+    )
+    
+    args = parser.parse_args(argv)
     
     try:
+        if args.page_size:
+            pages = render_markdown_pages(
+                args.input, args.output, args.page_size, args.memory_mb * 1024 * 1024
+            )
+            print(f"Reporte generado exitosamente en: {args.output} ({len(pages)} páginas)")
+            return 0
+
+        if args.stream:
+            with open(args.output, 'w', encoding='utf-8') as out:
+                render_markdown_stream(args.input, out, args.memory_mb * 1024 * 1024)
+            print(f"Reporte generado exitosamente en: {args.output}")
+            return 0
+
         # Cargar y validar el reporte JSON
         report_data = load_json_report(args.input)
         
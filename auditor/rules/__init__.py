@@ -1,2 +1,56 @@
-__all__ = ["GitignoreEnvRule"]
-from .gitignore_rule import GitignoreEnvRule
\ No newline at end of file
+"""
+Registro de reglas por id. El módulo de cada regla se importa recién
+cuando se la selecciona, así el arranque del CLI no paga por las que no corren.
+"""
+from __future__ import annotations
+from importlib import import_module
+from typing import Dict, Iterable, List, Tuple
+
+# id -> (módulo, clase), en el orden en que corren por defecto
+RULES: Dict[str, Tuple[str, str]] = {
+    "R001": ("gitignore_rule", "GitignoreEnvRule"),
+    "R002": ("config_rule", "ConfigViaEnvRule"),
+    "R003": ("makefile_rule", "MakefileRule"),
+    "license.present": ("license_rule", "LicenseRule"),
+    "R005": ("coverage_rule", "CoverageRule"),
+    "R006": ("secrets_rule", "SecretsRule"),
+    "R007": ("diff_coverage_rule", "DiffCoverageRule"),
+}
+
+_MODULE_OF = {cls: module for module, cls in RULES.values()}
+
+__all__ = ["RULES", "load_rule", "select_rules", *_MODULE_OF]
+
+
+def load_rule(rule_id: str) -> type:
+    """Clase de la regla `rule_id` (importa su módulo al primer uso)."""
+    try:
+        module, cls = RULES[rule_id]
+    except KeyError:
+        raise KeyError(f"regla desconocida: {rule_id}") from None
+    return getattr(import_module(f".{module}", __name__), cls)
+
+
+def select_rules(
+    only: Iterable[str] | None = None,
+    skip: Iterable[str] = (),
+) -> List:
+    """
+    Instancia las reglas seleccionadas en el orden del registro.
+    `only` = None selecciona todas; ids desconocidos -> KeyError.
+    """
+    wanted = list(RULES) if only is None else list(only)
+    skipped = set(skip)
+    for rule_id in (*wanted, *skipped):
+        if rule_id not in RULES:
+            raise KeyError(f"regla desconocida: {rule_id}")
+    chosen = set(wanted) - skipped
+    return [load_rule(rule_id)() for rule_id in RULES if rule_id in chosen]
+
+
+def __getattr__(name: str):
+    # Compatibilidad: `from auditor.rules import GitignoreEnvRule` sigue funcionando
+    module = _MODULE_OF.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(f".{module}", __name__), name)
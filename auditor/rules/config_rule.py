@@ -4,7 +4,8 @@ from typing import List
 import re
 
 from auditor.core import Finding, Rule, RuleContext, Severity
-from auditor.utils.fs import read_lines
+from auditor.utils.content import read_text_sample
+from auditor.utils.fs import FileEntry
 
 
 class ConfigViaEnvRule(Rule):
@@ -19,37 +20,63 @@ class ConfigViaEnvRule(Rule):
     id = "R002"
     description = "La configuración debe provenir de variables de entorno (no archivos estáticos)"
 
-    def _python_files(self, root: Path, ignore_dirs: List[str]) -> List[Path]:
-        files = []
-        for p in root.rglob("*.py"):
-            if any(ignored in p.parts for ignored in ignore_dirs):
-                continue
-            files.append(p)
-        return files
+    ENV_PATTERN = re.compile(r"\bos\.environ\b|\benviron\[|\bos\.getenv\s*\(", re.IGNORECASE)
 
-    def _has_env_usage(self, root: Path, ignore_dirs: List[str]) -> bool:
-        env_pat = re.compile(r"\bos\.environ\b|\benviron\[|\bos\.getenv\s*\(", re.IGNORECASE)
-        for py in self._python_files(root, ignore_dirs):
-            for line in read_lines(py):
-                if env_pat.search(line):
-                    return True
+    CONFIG_FILES = (
+        "config.json", "config.yaml", "config.yml",
+        "settings.json", "settings.yaml", "settings.yml",
+        "appsettings.json", "application.yaml", "application.yml",
+    )
+
+    def _python_files(self, ctx: RuleContext) -> List[FileEntry]:
+        # Regla de alcance repo: en modo diff también cuentan los .py que no cambiaron
+        return ctx.all_files.by_ext(".py")
+
+    def _affected(self, ctx: RuleContext) -> bool:
+        # Modo diff: el resultado solo puede cambiar si cambió (o se borró) un .py
+        # o un archivo de config
+        changed = ctx.changed or frozenset()
+        return any(p.endswith(".py") for p in changed) or not changed.isdisjoint(self.CONFIG_FILES)
+
+    def _file_uses_env(self, entry: FileEntry, ctx: RuleContext) -> tuple[bool, str | None]:
+        # Clasificación previa: binarios se omiten, archivos enormes solo cabeza y cola
+        try:
+            text, reason = read_text_sample(entry.path, entry.size, ctx.content_policy)
+        except OSError:
+            return False, None
+        return text is not None and bool(self.ENV_PATTERN.search(text)), reason
+
+    def _has_env_usage(self, ctx: RuleContext) -> bool:
+        # Con caché, el resultado por archivo se reutiliza si el archivo no cambió
+        cache = ctx.cache.for_rule(self, ctx.content_policy) if ctx.cache is not None else None
+        for entry in self._python_files(ctx):
+            if ctx.cancelled:
+                return False
+            data = cache.get(entry.rel, entry) if cache is not None else None
+            if data is None:
+                uses_env, reason = self._file_uses_env(entry, ctx)
+                if cache is not None:
+                    cache.put(entry.rel, entry, {"uses_env": uses_env, "skip": reason})
+            else:
+                uses_env, reason = data["uses_env"], data["skip"]
+            if reason is not None:
+                ctx.scan_stats.record(self.id, entry.rel, reason)
+            if uses_env:
+                return True
         return False
 
     def _has_static_configs(self, root: Path) -> List[str]:
-        candidates = [
-            "config.json", "config.yaml", "config.yml",
-            "settings.json", "settings.yaml", "settings.yml",
-            "appsettings.json", "application.yaml", "application.yml",
-        ]
         found = []
-        for rel in candidates:
+        for rel in self.CONFIG_FILES:
             if (root / rel).exists():
                 found.append(rel)
         return found
 
     def check(self, ctx: RuleContext) -> List[Finding]:
+        if ctx.since is not None and not self._affected(ctx):
+            return []
         root = Path(ctx.repo_root)
-        uses_env = self._has_env_usage(root, ctx.ignore_dirs)
+        uses_env = self._has_env_usage(ctx)
         static_files = self._has_static_configs(root)
 
         if not uses_env and static_files:
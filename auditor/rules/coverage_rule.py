@@ -1,24 +1,42 @@
 from __future__ import annotations
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import xml.etree.ElementTree as ET
 
 from auditor.core import Finding, Rule, RuleContext, Severity
+from auditor.utils.coverage import iter_line_rates, read_line_rate
 
 class CoverageRule(Rule):
     id = "R005"
     description = "La cobertura de código debe ser de al menos 90%"
-    
+    inputs = ("coverage.xml",)
+
+    MIN_RATE = 0.9
+    # Mínimo por <package>; None = solo se valida la cobertura global
+    PACKAGE_MIN_RATE: Optional[float] = None
+
     def _parse_coverage(self, coverage_path: Path) -> Optional[float]:
         try:
-            tree = ET.parse(coverage_path)
-            root = tree.getroot()
-            # Buscar el atributo line-rate
-            line_rate = float(root.attrib.get('line-rate', '0'))
-            return line_rate
-        except (ET.ParseError, ValueError, AttributeError):
+            return read_line_rate(coverage_path)
+        except (ET.ParseError, ValueError, OSError):
             return None
 
+    def _parse_with_packages(
+        self, coverage_path: Path
+    ) -> Tuple[Optional[float], List[Tuple[str, float]]]:
+        # Una sola pasada en streaming: line-rate global y el de cada paquete
+        line_rate: Optional[float] = None
+        packages: List[Tuple[str, float]] = []
+        try:
+            for _tag, name, rate in iter_line_rates(coverage_path, tags=("package",)):
+                if line_rate is None:
+                    line_rate = rate
+                else:
+                    packages.append((name, rate))
+        except (ET.ParseError, ValueError, OSError):
+            return None, []
+        return line_rate, packages
+
     def check(self, ctx: RuleContext) -> List[Finding]:
         repo = Path(ctx.repo_root)
         coverage_path = repo / "coverage.xml"
@@ -33,7 +51,11 @@ class CoverageRule(Rule):
                 )
             ]
             
-        line_rate = self._parse_coverage(coverage_path)
+        packages: List[Tuple[str, float]] = []
+        if self.PACKAGE_MIN_RATE is None:
+            line_rate = self._parse_coverage(coverage_path)
+        else:
+            line_rate, packages = self._parse_with_packages(coverage_path)
         if line_rate is None:
             return [
                 Finding(
@@ -44,15 +66,33 @@ class CoverageRule(Rule):
                 )
             ]
             
-        if line_rate < 0.9:
-            return [
+        findings: List[Finding] = []
+        if line_rate < self.MIN_RATE:
+            findings.append(
                 Finding(
                     rule_id=self.id,
-                    message=f"Cobertura insuficiente: {line_rate:.1%} (mínimo requerido: 90%)",
+                    message=(
+                        f"Cobertura insuficiente: {line_rate:.1%} "
+                        f"(mínimo requerido: {self.MIN_RATE:.0%})"
+                    ),
                     severity=Severity.MEDIUM,
                     path=str(coverage_path),
-                    meta={"coverage": line_rate, "required": 0.9}
+                    meta={"coverage": line_rate, "required": self.MIN_RATE}
                 )
-            ]
-            
-        return []
\ No newline at end of file
+            )
+
+        for name, rate in packages:
+            if rate < self.PACKAGE_MIN_RATE:
+                findings.append(
+                    Finding(
+                        rule_id=self.id,
+                        message=(
+                            f"Cobertura insuficiente en el paquete {name}: {rate:.1%} "
+                            f"(mínimo requerido: {self.PACKAGE_MIN_RATE:.0%})"
+                        ),
+                        severity=Severity.MEDIUM,
+                        path=str(coverage_path),
+                        meta={"package": name, "coverage": rate, "required": self.PACKAGE_MIN_RATE}
+                    )
+                )
+        return findings
\ No newline at end of file
@@ -0,0 +1,69 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import List
+import xml.etree.ElementTree as ET
+
+from auditor.core import Finding, Rule, RuleContext, Severity
+from auditor.utils import git
+from auditor.utils.coverage import line_hits
+
+
+class DiffCoverageRule(Rule):
+    """
+    R007: cobertura del diff. Solo corre con --since: cruza las líneas
+    agregadas o modificadas desde el merge-base con las líneas medidas en
+    coverage.xml y reporta cada línea cambiada que los tests no ejecutan.
+    Las líneas que el reporte no mide (comentarios, archivos sin medir) no cuentan.
+    """
+
+    id = "R007"
+    description = "Las líneas cambiadas deben estar cubiertas por los tests"
+
+    COVERAGE_FILE = "coverage.xml"
+
+    def check(self, ctx: RuleContext) -> List[Finding]:
+        if ctx.since is None:
+            return []
+        coverage_path = Path(ctx.repo_root) / self.COVERAGE_FILE
+        if not coverage_path.exists():
+            return []  # R005 ya reporta la falta de coverage.xml
+
+        # Solo archivos no ignorados (respeta --ignore-dirs)
+        tracked = {e.rel for e in ctx.files}
+        changed = {
+            rel: lines
+            for rel, lines in git.changed_lines(ctx.repo_root, ctx.since).items()
+            if rel in tracked
+        }
+        if not changed:
+            return []
+
+        try:
+            hits = line_hits(coverage_path, changed, ctx.repo_root)
+        except (ET.ParseError, ValueError, OSError):
+            return [
+                Finding(
+                    rule_id=self.id,
+                    message="No se pudo analizar el archivo coverage.xml",
+                    severity=Severity.MEDIUM,
+                    path=str(coverage_path),
+                )
+            ]
+
+        findings: List[Finding] = []
+        for rel in sorted(hits):
+            if ctx.cancelled:
+                break
+            measured = hits[rel]
+            for line in sorted(changed[rel] & measured.keys()):
+                if measured[line] == 0:
+                    findings.append(
+                        Finding(
+                            rule_id=self.id,
+                            message="Línea cambiada sin cobertura de tests",
+                            severity=Severity.MEDIUM,
+                            path=rel,
+                            meta={"line": line},
+                        )
+                    )
+        return findings
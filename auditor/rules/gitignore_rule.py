@@ -7,6 +7,7 @@ from auditor.utils.fs import read_lines
 class GitignoreEnvRule(Rule):
     id = "R001"
     description = "`.env` debe estar listado en .gitignore"
+    inputs = (".gitignore",)
 
     def check(self, ctx: RuleContext) -> List[Finding]:
         repo = Path(ctx.repo_root)
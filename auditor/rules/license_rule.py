@@ -15,6 +15,7 @@ class LicenseRule(Rule):
         "COPYING.txt",
         "NOTICE",
     ]
+    inputs = tuple(_CANDIDATES)
 
     def check(self, ctx: RuleContext) -> List[Finding]:
         root = Path(ctx.repo_root)
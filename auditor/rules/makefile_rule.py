@@ -17,6 +17,7 @@ class MakefileRule(Rule):
     description = "Makefile debe incluir targets: run, test, lint, plan, apply"
 
     REQUIRED: Set[str] = {"run", "test", "lint", "plan", "apply"}
+    inputs = ("Makefile",)
 
     def _targets_in(self, makefile: Path) -> Set[str]:
         targets: Set[str] = set()
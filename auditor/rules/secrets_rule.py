@@ -1,15 +1,239 @@
 from __future__ import annotations
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import List, Pattern
+from typing import List, Optional, Sequence, Tuple
+import mmap
 import re
 
 from auditor.core import Finding, Rule, RuleContext, Severity
-from auditor.utils.fs import read_lines
+from auditor.utils.content import SNIFF_SIZE, ContentPolicy, sniff
+from auditor.utils.fs import FileEntry, LineIndex, mapped
+
+
+_GLOBAL_FLAGS = re.compile(r"^\(\?([aiLmsux]+)\)")
+
+
+def _scoped(pattern: str) -> str:
+    # "(?i)TOKEN" -> "(?i:TOKEN)": los flags globales no se permiten dentro de una alternancia
+    m = _GLOBAL_FLAGS.match(pattern)
+    if m is None:
+        return f"(?:{pattern})"
+    return f"(?{m.group(1)}:{pattern[m.end():]})"
+
+
+def _has_anchors(pattern: str) -> bool:
+    # ^, $, \A o \Z fuera de una clase: anclan a la línea, no al buffer entero
+    i, in_class = 0, False
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            if not in_class and pattern[i + 1:i + 2] in ("A", "Z"):
+                return True
+            i += 2
+            continue
+        if in_class:
+            if c == "]":
+                in_class = False
+        elif c == "[":
+            in_class = True
+            # "]" o "^]" al comienzo de la clase es literal
+            if pattern[i + 1:i + 2] == "^":
+                i += 1
+            if pattern[i + 1:i + 2] == "]":
+                i += 1
+        elif c in "^$":
+            return True
+        i += 1
+    return False
+
+
+def _has_group_refs(pattern: str) -> bool:
+    # \1, (?P=nombre) o (?(1)...): al combinar, los grupos se renumeran
+    i, in_class = 0, False
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            if not in_class and pattern[i + 1:i + 2] in tuple("123456789"):
+                return True
+            i += 2
+            continue
+        if in_class:
+            if c == "]":
+                in_class = False
+        elif c == "[":
+            in_class = True
+            if pattern[i + 1:i + 2] == "^":
+                i += 1
+            if pattern[i + 1:i + 2] == "]":
+                i += 1
+        elif pattern.startswith(("(?P=", "(?("), i):
+            return True
+        i += 1
+    return False
+
+
+class SecretMatcher:
+    """
+    Todos los patrones en una sola alternancia (también sobre bytes, para
+    localizar candidatos sin decodificar el archivo). Solo las líneas que
+    la alternancia acepta se prueban patrón por patrón, para reportar el
+    primero de la lista que coincide, como antes de combinarlos. Los
+    patrones con grupos con nombre o referencias a grupos quedan fuera de
+    la alternancia (se renumerarían o chocarían) y se prueban por separado.
+    Un patrón inválido -> ValueError.
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        self.patterns = tuple(patterns)
+        self._each = []
+        for p in self.patterns:
+            try:
+                self._each.append(re.compile(p))
+            except re.error as exc:
+                raise ValueError(f"patrón de secreto inválido {p!r}: {exc}") from None
+        combinable = [
+            p for p, regex in zip(self.patterns, self._each)
+            if not regex.groupindex and not _has_group_refs(p)
+        ]
+        self._isolated = [
+            regex for p, regex in zip(self.patterns, self._each) if p not in combinable
+        ]
+        combined = "|".join(_scoped(p) for p in combinable)
+        self.regex = re.compile(combined) if combinable else None
+        # Patrones no ASCII, con anclas o aislados no tienen equivalente fiel en
+        # bytes sobre el buffer entero: en ese caso se busca sobre texto, por línea
+        self.bregex = None
+        if combinable and not self._isolated and combined.isascii() and not _has_anchors(combined):
+            self.bregex = re.compile(combined.encode("ascii"))
+
+    def search(self, line: str) -> str | None:
+        """Devuelve el primer patrón (en el orden de la lista) que coincide con la línea, o None."""
+        if (self.regex is None or self.regex.search(line) is None) and not any(
+            regex.search(line) for regex in self._isolated
+        ):
+            return None
+        for pattern, regex in zip(self.patterns, self._each):
+            if regex.search(line):
+                return pattern
+        return None
+
+
+@lru_cache(maxsize=None)
+def _matcher(patterns: tuple[str, ...]) -> SecretMatcher:
+    # Se compila una vez por proceso (también dentro de cada worker)
+    return SecretMatcher(patterns)
+
+
+# Resultado por archivo: (ruta relativa, findings, motivo de omisión o escaneo parcial)
+FileScan = Tuple[str, List[Finding], Optional[str]]
+
+
+def _scan_files(
+    items: Sequence[tuple[str, str]],
+    rule_id: str,
+    patterns: tuple[str, ...],
+    policy: ContentPolicy = ContentPolicy(),
+) -> List[FileScan]:
+    """Escanea pares (ruta, ruta relativa). Función de módulo para poder usarla en workers."""
+    matcher = _matcher(patterns)
+    results: List[FileScan] = []
+    for path, rel in items:
+        try:
+            with mapped(Path(path)) as buf:
+                # Clasificación: binarios fuera, archivos enormes solo cabeza y cola
+                reason = sniff(buf[:SNIFF_SIZE])
+                if reason is not None:
+                    results.append((rel, [], reason))
+                    continue
+                regions = policy.regions(len(buf))
+                findings = _scan_buffer(buf, rel, rule_id, matcher, regions)
+                results.append((rel, findings, "head-tail" if len(regions) > 1 else None))
+        except OSError:
+            continue
+    return results
+
+
+# Bytes con los que la regex de bytes y la división por \n dejan de equivaler a
+# decodificar y usar splitlines(): no ASCII (\s, \w y (?i) de str son Unicode,
+# p. ej. un espacio no separable) y separadores de línea distintos de \n y \r\n
+_TEXT_ONLY = re.compile(rb"[\x80-\xff\x0b\x0c\x1c-\x1e]|\r(?!\n)")
+
+
+def _scan_buffer(
+    buf: mmap.mmap | bytes,
+    rel: str,
+    rule_id: str,
+    matcher: SecretMatcher,
+    regions: Sequence[tuple[int, int]],
+) -> List[Finding]:
+    """
+    Busca candidatos con la regex de bytes dentro de `regions` y solo
+    decodifica la línea de cada candidato para confirmarlo con la regex de
+    texto (que conserva la semántica por línea). Los archivos limpios nunca
+    se decodifican ni se dividen en líneas. Las regiones con bytes no ASCII
+    o saltos de línea poco comunes se decodifican y se recorren por línea,
+    como un read_text().splitlines().
+    """
+    findings: List[Finding] = []
+    lines: LineIndex | None = None
+    for pos, region_end in regions:
+        if matcher.bregex is None or _TEXT_ONLY.search(buf, pos, region_end):
+            if lines is None:
+                lines = LineIndex(buf)
+            text = buf[pos:region_end].decode("utf-8", errors="ignore")
+            for line_num, line in enumerate(text.splitlines(), lines.line_of(pos)):
+                finding = _confirm(line, line_num, rel, rule_id, matcher)
+                if finding is not None:
+                    findings.append(finding)
+            continue
+        while pos < region_end:
+            m = matcher.bregex.search(buf, pos, region_end)
+            if m is None:
+                break
+            if lines is None:
+                lines = LineIndex(buf)
+            start, end = lines.bounds(m.start())
+            pos = end + 1
+            if buf[end - 1:end] == b"\r":  # CRLF: splitlines() no deja el \r
+                end -= 1
+            line = buf[start:end].decode("ascii")
+            finding = _confirm(line, lines.line_of(start), rel, rule_id, matcher)
+            if finding is not None:
+                findings.append(finding)
+    return findings
+
+
+def _confirm(
+    line: str,
+    line_num: int,
+    rel: str,
+    rule_id: str,
+    matcher: SecretMatcher,
+) -> Finding | None:
+    pattern = matcher.search(line)
+    if pattern is None:
+        return None
+    # Ignorar usos legítimos de os.getenv
+    if "os.getenv" in line or "os.environ" in line:
+        return None
+    # Un solo hallazgo por línea
+    return Finding(
+        rule_id=rule_id,
+        message=f"Posible secreto expuesto: {pattern}",
+        severity=Severity.HIGH,
+        path=rel,
+        meta={
+            "line": line_num,
+            "snippet": line.strip(),
+            "pattern": pattern
+        }
+    )
+
 
 class SecretsRule(Rule):
     id = "R006"
     description = "No deben existir secretos expuestos en el código"
-    
+
     SECRET_PATTERNS = [
         r"(?i)SECRET_?KEY\s*=",
         r"(?i)API_?KEY\s*=",
@@ -17,7 +241,7 @@ class SecretsRule(Rule):
         r"(?i)PASSWORD\s*=",
         r"(?i)SECRET\s*=",
     ]
-    
+
     IGNORE_FILES = {
         ".gitignore",
         "*.md",
@@ -28,50 +252,84 @@ class SecretsRule(Rule):
         "*.yml",
         "*.env"
     }
-    
-    def _compile_patterns(self) -> list[Pattern]:
-        return [re.compile(pattern) for pattern in self.SECRET_PATTERNS]
-    
+
+    # Por debajo de este número de archivos no compensa levantar procesos
+    PARALLEL_MIN_FILES = 64
+
     def _is_ignored(self, path: Path) -> bool:
         return any(
             path.name == ignore or path.name.endswith(ignore.lstrip('*'))
             for ignore in self.IGNORE_FILES
         )
-    
+
+    def warm(self) -> None:
+        """Precompila el matcher en el proceso actual (útil en pools de workers)."""
+        _matcher(tuple(self.SECRET_PATTERNS))
+
     def check(self, ctx: RuleContext) -> List[Finding]:
-        repo = Path(ctx.repo_root)
-        findings: List[Finding] = []
-        patterns = self._compile_patterns()
-        
-        for file_path in repo.rglob("*"):
-            if not file_path.is_file() or self._is_ignored(file_path):
-                continue
-            # Saltear directorios ignorados
-            if any(ignored in file_path.parts for ignored in ctx.ignore_dirs):
-                continue
-                
-            try:
-                for line_num, line in enumerate(read_lines(file_path), 1):
-                    for pattern in patterns:
-                        if pattern.search(line):
-                            # Ignorar usos legítimos de os.getenv
-                            if "os.getenv" in line or "os.environ" in line:
-                                continue
-                            findings.append(
-                                Finding(
-                                    rule_id=self.id,
-                                    message=f"Posible secreto expuesto: {pattern.pattern}",
-                                    severity=Severity.HIGH,
-                                    path=str(file_path.relative_to(repo)),
-                                    meta={
-                                        "line": line_num,
-                                        "snippet": line.strip(),
-                                        "pattern": pattern.pattern
-                                    }
-                                )
-                            )
-                            break  # No reportar múltiples hallazgos por línea
-            except (UnicodeDecodeError, PermissionError):
+        candidates = [e for e in ctx.files if not self._is_ignored(e.path)]
+        cache = ctx.cache.for_rule(self, ctx.content_policy) if ctx.cache is not None else None
+
+        # Con caché, solo se escanean los archivos cuya huella cambió
+        results: dict[str, tuple[List[Finding], Optional[str]]] = {}
+        pending = candidates
+        if cache is not None:
+            # Sin --cache-dir ni --jobs no se paga ningún import extra (pre-commit)
+            from auditor.cache import finding_from_record, finding_to_record
+            pending = []
+            for e in candidates:
+                data = cache.get(e.rel, e)
+                if data is None:
+                    pending.append(e)
+                else:
+                    results[e.rel] = (
+                        [finding_from_record(r) for r in data["findings"]],
+                        data["skip"],
+                    )
+
+        for rel, findings, reason in self._scan(ctx, pending):
+            results[rel] = (findings, reason)
+
+        # Un escaneo cancelado está incompleto: no se guarda en caché
+        if cache is not None and not ctx.cancelled:
+            for e in pending:
+                if e.rel in results:
+                    findings, reason = results[e.rel]
+                    cache.put(e.rel, e, {
+                        "findings": [finding_to_record(f) for f in findings],
+                        "skip": reason,
+                    })
+
+        # Mismo orden estable ruta/línea con o sin caché
+        out: List[Finding] = []
+        for e in candidates:
+            if e.rel not in results:
                 continue
-                
-        return findings
\ No newline at end of file
+            findings, reason = results[e.rel]
+            if reason is not None:
+                ctx.scan_stats.record(self.id, e.rel, reason)
+            out.extend(findings)
+        return out
+
+    def _scan(self, ctx: RuleContext, candidates: List[FileEntry]) -> List[FileScan]:
+        scan = partial(
+            _scan_files,
+            rule_id=self.id,
+            patterns=tuple(self.SECRET_PATTERNS),
+            policy=ctx.content_policy,
+        )
+
+        # Los candidatos vienen ordenados por ruta, así que ambos caminos
+        # devuelven los resultados en orden estable.
+        if ctx.jobs > 1 and len(candidates) >= self.PARALLEL_MIN_FILES:
+            # multiprocessing solo se importa si de verdad se reparte el trabajo
+            from auditor.utils.parallel import scan_sharded
+            return list(scan_sharded(scan, candidates, ctx.jobs, lambda: ctx.cancelled))
+
+        results: List[FileScan] = []
+        for i in range(0, len(candidates), self.PARALLEL_MIN_FILES):
+            if ctx.cancelled:
+                break
+            batch = candidates[i:i + self.PARALLEL_MIN_FILES]
+            results.extend(scan([(str(e.path), e.rel) for e in batch]))
+        return results
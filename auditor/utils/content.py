@@ -0,0 +1,103 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List
+import threading
+
+# Bytes iniciales que se inspeccionan para decidir si un archivo es binario
+SNIFF_SIZE = 8192
+DEFAULT_MAX_SIZE = 5 * 1024 * 1024
+DEFAULT_WINDOW = 256 * 1024
+
+MAGIC_NUMBERS = (
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"\xff\xd8\xff", "jpeg"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+    (b"%PDF-", "pdf"),
+    (b"PK\x03\x04", "zip"),
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bzip2"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"7z\xbc\xaf\x27\x1c", "7z"),
+    (b"\x7fELF", "elf"),
+    (b"\xcf\xfa\xed\xfe", "mach-o"),
+    (b"SQLite format 3\x00", "sqlite"),
+)
+
+
+@dataclass(frozen=True)
+class ContentPolicy:
+    """
+    Política de tamaño: los archivos de texto mayores a `max_size` se
+    escanean solo en sus primeros y últimos `window` bytes.
+    """
+    max_size: int = DEFAULT_MAX_SIZE
+    window: int = DEFAULT_WINDOW
+
+    def regions(self, size: int) -> list[tuple[int, int]]:
+        """Rangos [inicio, fin) a escanear de un archivo de `size` bytes."""
+        if size <= self.max_size or 2 * self.window >= size:
+            return [(0, size)]
+        return [(0, self.window), (size - self.window, size)]
+
+
+def sniff(head: bytes) -> str | None:
+    """Motivo para no escanear (`binary` o `binary:<tipo>`), o None si parece texto."""
+    for magic, kind in MAGIC_NUMBERS:
+        if head.startswith(magic):
+            return f"binary:{kind}"
+    if b"\x00" in head:
+        return "binary"
+    return None
+
+
+def read_text_sample(path: Path, size: int, policy: ContentPolicy) -> tuple[str | None, str | None]:
+    """
+    Lee un archivo respetando la política: devuelve (texto, motivo).
+    Binario -> (None, motivo); grande -> cabeza + cola y motivo "head-tail".
+    """
+    with open(path, "rb") as fh:
+        head = fh.read(SNIFF_SIZE)
+        reason = sniff(head)
+        if reason is not None:
+            return None, reason
+        regions = policy.regions(size)
+        chunks: List[bytes] = []
+        for start, end in regions:
+            fh.seek(start)
+            chunks.append(fh.read(end - start))
+    text = "\n".join(c.decode("utf-8", errors="ignore") for c in chunks)
+    return text, ("head-tail" if len(regions) > 1 else None)
+
+
+class ScanStats:
+    """Archivos que las reglas de contenido no escanearon (o escanearon en parte)."""
+
+    # Ejemplos por motivo que se incluyen en el reporte
+    SAMPLE_LIMIT = 50
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._by_reason: Dict[str, int] = {}
+        self._samples: List[Dict[str, str]] = []
+        self._sampled: Dict[str, int] = {}
+
+    def record(self, rule_id: str, path: str, reason: str) -> None:
+        category = reason.split(":", 1)[0]
+        with self._lock:
+            self._by_reason[category] = self._by_reason.get(category, 0) + 1
+            if self._sampled.get(category, 0) < self.SAMPLE_LIMIT:
+                self._sampled[category] = self._sampled.get(category, 0) + 1
+                self._samples.append({"rule_id": rule_id, "path": path, "reason": reason})
+
+    def __bool__(self) -> bool:
+        return bool(self._by_reason)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "total": sum(self._by_reason.values()),
+                "by_reason": dict(sorted(self._by_reason.items())),
+                "files": sorted(self._samples, key=lambda s: (s["path"], s["rule_id"])),
+            }
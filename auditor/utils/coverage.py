@@ -0,0 +1,159 @@
+from __future__ import annotations
+from pathlib import Path, PurePosixPath
+from typing import Collection, Dict, Iterable, Iterator, List, Tuple
+import os
+import xml.etree.ElementTree as ET
+from xml.parsers import expat
+
+# Lectura en streaming de coverage.xml (formato Cobertura). Ninguna función
+# arma el árbol completo: el archivo puede pesar cientos de MB en un monorepo.
+
+# (tag, nombre, line-rate); la raíz <coverage> tiene nombre ""
+LineRate = Tuple[str, str, float]
+
+
+def _events(path: str | Path) -> Iterator[Tuple[str, ET.Element, int]]:
+    """
+    (evento, elemento, profundidad) de iterparse. Al reanudar después de un
+    "end", el elemento se vacía y se quita de su padre: el árbol nunca crece.
+    """
+    with open(path, "rb") as fh:
+        stack: List[ET.Element] = []
+        for event, elem in ET.iterparse(fh, events=("start", "end")):
+            if event == "start":
+                yield event, elem, len(stack)
+                stack.append(elem)
+                continue
+            stack.pop()
+            yield event, elem, len(stack)
+            elem.clear()
+            if stack:
+                stack[-1].remove(elem)
+
+
+def iter_line_rates(path: str | Path, tags: Iterable[str] = ("package",)) -> Iterator[LineRate]:
+    """
+    Emite primero el line-rate global (atributo de la raíz) y luego el de
+    cada elemento cuyo tag esté en `tags` (p. ej. "package", "class"),
+    a medida que se cierran.
+    Errores de formato: ET.ParseError o ValueError.
+    """
+    wanted = frozenset(tags)
+    events = _events(path)
+    try:
+        for event, elem, depth in events:
+            if event == "start":
+                if depth == 0:
+                    yield elem.tag, "", float(elem.get("line-rate", "0"))
+                    if not wanted:
+                        return
+            elif elem.tag in wanted:
+                yield elem.tag, elem.get("name", ""), float(elem.get("line-rate", "0"))
+    finally:
+        events.close()
+
+
+def read_line_rate(path: str | Path) -> float:
+    """line-rate global: se lee la raíz y se deja de parsear."""
+    rates = iter_line_rates(path, tags=())
+    try:
+        return next(rates)[2]
+    except StopIteration:
+        raise ValueError(f"{path} no tiene elemento raíz") from None
+    finally:
+        rates.close()
+
+
+def _candidates(filename: str, sources: List[str], repo_root: str) -> Iterator[str]:
+    # Rutas relativas al repo con las que puede corresponder un `filename`
+    # de Cobertura, de la más específica a la menos
+    for source in sources:
+        full = os.path.normpath(os.path.join(source, filename))
+        if not os.path.isabs(full):
+            yield Path(full).as_posix()
+            continue
+        rel = os.path.relpath(full, repo_root)
+        if not rel.startswith(".."):
+            yield Path(rel).as_posix()
+    # Reporte generado en otra máquina (CI): sufijos del source, del más largo al más corto
+    for source in sources:
+        if os.path.isabs(source):
+            parts = Path(source).parts[1:]
+            for i in range(len(parts)):
+                yield PurePosixPath(*parts[i:], filename).as_posix()
+    yield PurePosixPath(filename).as_posix()
+
+
+def line_hits(
+    path: str | Path,
+    files: Collection[str],
+    repo_root: str | Path,
+) -> Dict[str, Dict[int, int]]:
+    """
+    Índice ruta relativa -> {línea: hits}, construido en una pasada en
+    streaming y solo para las rutas de `files` (p. ej. las cambiadas en un
+    diff). Usa expat directo en vez de ElementTree: dentro de las clases que
+    no interesan se desactiva el handler de apertura, así las decenas de
+    miles de <line> ajenas no crean objetos Python.
+    Errores de formato: ValueError.
+    """
+    wanted = frozenset(files)
+    # Filtro barato por nombre de archivo antes de resolver rutas
+    names = frozenset(rel.rsplit("/", 1)[-1] for rel in wanted)
+    root = os.path.abspath(repo_root)
+    sources: List[str] = []
+    text: List[str] = []
+    index: Dict[str, Dict[int, int]] = {}
+    current: Dict[int, int] = {}
+    in_methods = 0
+    parser = expat.ParserCreate()
+    parser.buffer_text = True
+
+    def outside(name: str, attrs: Dict[str, str]) -> None:
+        nonlocal current, in_methods
+        if name == "source":
+            text.clear()
+            parser.CharacterDataHandler = text.append
+        elif name == "class":
+            filename = attrs.get("filename", "")
+            rel = None
+            if os.path.basename(filename) in names:
+                rel = next((c for c in _candidates(filename, sources, root) if c in wanted), None)
+            if rel is None:
+                parser.StartElementHandler, parser.EndElementHandler = None, skip_end
+                return
+            current, in_methods = index.setdefault(rel, {}), 0
+            parser.StartElementHandler, parser.EndElementHandler = inside, inside_end
+
+    def outside_end(name: str) -> None:
+        if name == "source":
+            parser.CharacterDataHandler = None
+            sources.append("".join(text).strip())
+
+    def skip_end(name: str) -> None:
+        if name == "class":
+            parser.StartElementHandler, parser.EndElementHandler = outside, outside_end
+
+    def inside(name: str, attrs: Dict[str, str]) -> None:
+        nonlocal in_methods
+        if name == "method":
+            in_methods += 1
+        # Solo <class><lines><line>: las de <methods> repiten las mismas líneas
+        elif name == "line" and not in_methods:
+            number = int(attrs.get("number", "0"))
+            current[number] = max(current.get(number, 0), int(attrs.get("hits", "0")))
+
+    def inside_end(name: str) -> None:
+        nonlocal in_methods
+        if name == "method":
+            in_methods -= 1
+        elif name == "class":
+            parser.StartElementHandler, parser.EndElementHandler = outside, outside_end
+
+    parser.StartElementHandler, parser.EndElementHandler = outside, outside_end
+    try:
+        with open(path, "rb") as fh:
+            parser.ParseFile(fh)
+    except expat.ExpatError as exc:
+        raise ValueError(f"{path}: {exc}") from exc
+    return index
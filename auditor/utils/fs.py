@@ -1,6 +1,13 @@
 from __future__ import annotations
-from pathlib import Path
-from typing import Iterable
+from array import array
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from pathlib import Path, PurePath
+from typing import Iterable, Iterator
+import mmap
+import os
+import stat as stat_mod
 
 def read_lines(path: Path) -> list[str]:
     try:
@@ -16,4 +23,226 @@ def ensure_paths_exist(root: Path, rel_paths: Iterable[str]) -> dict[str, bool]:
     out: dict[str, bool] = {}
     for p in rel_paths:
         out[p] = (root / p).exists()
-    return out
\ No newline at end of file
+    return out
+
+
+# Directorios pesados que no vale la pena recorrer nunca
+DEFAULT_EXCLUDES = frozenset({
+    ".git", ".hg", ".svn",
+    "node_modules", "bower_components",
+    ".venv", "venv", "__pycache__",
+    ".mypy_cache", ".pytest_cache", ".ruff_cache", ".tox", ".nox",
+    ".auditor-cache",
+})
+
+
+def walk_files(
+    root: Path,
+    exclude: Iterable[str] = DEFAULT_EXCLUDES,
+) -> Iterator[tuple[str, os.stat_result]]:
+    """
+    Recorre `root` con os.scandir y devuelve (ruta relativa, stat) por archivo
+    regular. Los directorios cuyo nombre está en `exclude` se podan antes de
+    entrar. Los symlinks a directorios no se siguen (como rglob): si apuntan
+    dentro de `root` el destino se recorre por su ruta real, y no hay ciclos.
+    Los hardlinks se reportan una sola vez.
+    """
+    excluded = set(exclude)
+    root_str = os.path.realpath(root)
+    seen_links: set[tuple[int, int]] = set()
+    stack: list[tuple[str, str]] = [(root_str, "")]
+
+    while stack:
+        path, rel = stack.pop()
+        try:
+            it = os.scandir(path)
+        except OSError:
+            continue
+        subdirs: list[tuple[str, str]] = []
+        with it:
+            # Orden por nombre: recorrido determinista (y qué hardlink se conserva)
+            for entry in sorted(it, key=lambda e: e.name):
+                child_rel = os.path.join(rel, entry.name) if rel else entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in excluded:
+                            subdirs.append((entry.path, child_rel))
+                    elif entry.is_file():
+                        if entry.name in excluded:
+                            continue
+                        st = entry.stat()
+                        if st.st_nlink > 1:
+                            link_key = (st.st_dev, st.st_ino)
+                            if link_key in seen_links:
+                                continue
+                            seen_links.add(link_key)
+                        yield child_rel, st
+                except OSError:
+                    continue
+        stack.extend(reversed(subdirs))
+
+
+@contextmanager
+def mapped(path: Path) -> Iterator[mmap.mmap | bytes]:
+    """Abre `path` como buffer de solo lectura mapeado en memoria (b"" si está vacío)."""
+    with open(path, "rb") as fh:
+        try:
+            mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # no se puede mapear un archivo vacío
+            yield b""
+            return
+        try:
+            yield mm
+        finally:
+            mm.close()
+
+
+class LineIndex:
+    """
+    Resuelve offsets de un buffer a números de línea.
+    La tabla de saltos de línea se construye a demanda y solo hasta el
+    offset más alto consultado, así un archivo sin coincidencias no se recorre.
+    """
+
+    def __init__(self, buf: mmap.mmap | bytes):
+        self._buf = buf
+        self._newlines = array("q")
+        self._scanned = 0  # offset hasta el que la tabla está completa
+
+    def line_of(self, offset: int) -> int:
+        """Número de línea (desde 1) que contiene `offset`."""
+        buf = self._buf
+        while self._scanned <= offset:
+            pos = buf.find(b"\n", self._scanned)
+            if pos == -1:
+                self._scanned = len(buf) + 1
+                break
+            self._newlines.append(pos)
+            self._scanned = pos + 1
+        return bisect_left(self._newlines, offset) + 1
+
+    def bounds(self, offset: int) -> tuple[int, int]:
+        """Offsets [inicio, fin) de la línea que contiene `offset`, sin el salto de línea."""
+        start = self._buf.rfind(b"\n", 0, offset) + 1
+        end = self._buf.find(b"\n", offset)
+        return start, (len(self._buf) if end == -1 else end)
+
+
+@dataclass(frozen=True)
+class FileEntry:
+    """Archivo regular del repositorio con los datos de un único stat()."""
+    path: Path
+    rel: str
+    size: int
+    mtime_ns: int
+    ext: str
+    ignored: bool
+
+
+class FileIndex:
+    """
+    Índice inmutable de los archivos del repositorio.
+    Se construye en una sola pasada y las reglas lo consultan por
+    extensión o patrón glob en lugar de recorrer el árbol por su cuenta.
+    """
+
+    def __init__(self, entries: Iterable[FileEntry]):
+        self._entries = tuple(sorted(entries, key=lambda e: e.rel))
+        self._by_rel = {e.rel: e for e in self._entries}
+        by_ext: dict[str, list[FileEntry]] = {}
+        for e in self._entries:
+            by_ext.setdefault(e.ext, []).append(e)
+        self._by_ext = {ext: tuple(items) for ext, items in by_ext.items()}
+
+    @classmethod
+    def scan(
+        cls,
+        root: Path,
+        ignore_dirs: Iterable[str] = (),
+        exclude: Iterable[str] = DEFAULT_EXCLUDES,
+    ) -> FileIndex:
+        """Recorre el árbol una vez; `ignore_dirs` y `exclude` se podan sin descender."""
+        entries = [
+            FileEntry(
+                path=root / rel,
+                rel=rel,
+                size=st.st_size,
+                mtime_ns=st.st_mtime_ns,
+                ext=os.path.splitext(rel)[1].lower(),
+                ignored=False,
+            )
+            for rel, st in walk_files(root, set(exclude) | set(ignore_dirs))
+        ]
+        return cls(entries)
+
+    @classmethod
+    def from_paths(
+        cls,
+        root: Path,
+        rel_paths: Iterable[str],
+        ignore_dirs: Iterable[str] = (),
+    ) -> FileIndex:
+        """Índice a partir de una lista de rutas relativas (p. ej. el índice de git)."""
+        ignore = set(ignore_dirs)
+        entries: list[FileEntry] = []
+        for rel in rel_paths:
+            entry = _make_entry(root, root / rel, ignore)
+            if entry is not None:
+                entries.append(entry)
+        return cls(entries)
+
+    def subtree(self, prefix: str) -> FileIndex:
+        """Archivos bajo el directorio `prefix`, con rutas relativas a él."""
+        start = prefix.rstrip("/") + "/"
+        return FileIndex(
+            replace(e, rel=e.rel[len(start):])
+            for e in self._entries
+            if e.rel.startswith(start)
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[FileEntry]:
+        return self.files()
+
+    def files(self, include_ignored: bool = False) -> Iterator[FileEntry]:
+        for e in self._entries:
+            if include_ignored or not e.ignored:
+                yield e
+
+    def get(self, rel: str) -> FileEntry | None:
+        return self._by_rel.get(rel)
+
+    def by_ext(self, *exts: str, include_ignored: bool = False) -> list[FileEntry]:
+        out: list[FileEntry] = []
+        for ext in exts:
+            out.extend(self._by_ext.get(ext.lower(), ()))
+        if len(exts) > 1:
+            out.sort(key=lambda e: e.rel)
+        return [e for e in out if include_ignored or not e.ignored]
+
+    def glob(self, pattern: str, include_ignored: bool = False) -> list[FileEntry]:
+        # Misma semántica que PurePath.match: anclado por la derecha
+        return [
+            e for e in self.files(include_ignored)
+            if PurePath(e.rel).match(pattern)
+        ]
+
+
+def _make_entry(root: Path, full: Path, ignore: set[str]) -> FileEntry | None:
+    try:
+        st = full.stat()
+    except OSError:
+        return None
+    if not stat_mod.S_ISREG(st.st_mode):
+        return None
+    rel = os.path.relpath(full, root)
+    return FileEntry(
+        path=full,
+        rel=rel,
+        size=st.st_size,
+        mtime_ns=st.st_mtime_ns,
+        ext=full.suffix.lower(),
+        ignored=any(part in ignore for part in Path(rel).parts),
+    )
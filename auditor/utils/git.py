@@ -0,0 +1,122 @@
+from __future__ import annotations
+from pathlib import Path
+import re
+import subprocess
+
+
+class GitError(RuntimeError):
+    """Falla al invocar git (no instalado, no es un repo, revisión inválida...)."""
+
+
+def _git(root: str | Path, *args: str) -> bytes:
+    try:
+        proc = subprocess.run(
+            ["git", "-C", str(root), *args],
+            capture_output=True,
+            check=False,
+        )
+    except FileNotFoundError as exc:
+        raise GitError("git no está instalado") from exc
+    if proc.returncode != 0:
+        msg = proc.stderr.decode("utf-8", errors="replace").strip()
+        raise GitError(msg or f"git {' '.join(args)} falló con código {proc.returncode}")
+    return proc.stdout
+
+
+def is_work_tree(root: str | Path) -> bool:
+    try:
+        return _git(root, "rev-parse", "--is-inside-work-tree").strip() == b"true"
+    except GitError:
+        return False
+
+
+def ls_files(root: str | Path, untracked: bool = False) -> list[str]:
+    """
+    Rutas (relativas a `root`) registradas en el índice de git.
+    Con `untracked` se suman los archivos no versionados que .gitignore no excluye.
+    """
+    args = ["ls-files", "-z", "--cached"]
+    if untracked:
+        args += ["--others", "--exclude-standard"]
+    out = _git(root, *args)
+    seen: dict[str, None] = {}
+    for raw in out.split(b"\0"):
+        if raw:
+            seen.setdefault(raw.decode("utf-8", errors="surrogateescape"), None)
+    return list(seen)
+
+
+def changed_files(root: str | Path, since: str) -> list[str]:
+    """
+    Rutas (relativas a `root`) que cambiaron desde el merge-base entre `since`
+    y HEAD, incluyendo cambios sin commitear y archivos nuevos que todavía no
+    se agregaron (salvo los que excluye .gitignore). Incluye archivos borrados.
+    """
+    base = _git(root, "merge-base", since, "HEAD").decode().strip()
+    out = _git(root, "diff", "--name-only", "--no-renames", "--relative", "-z", base)
+    # git diff solo ve rutas versionadas
+    out += b"\0" + _git(root, "ls-files", "-z", "--others", "--exclude-standard")
+    seen: dict[str, None] = {}
+    for raw in out.split(b"\0"):
+        if raw:
+            seen.setdefault(raw.decode("utf-8", errors="surrogateescape"), None)
+    return list(seen)
+
+
+_HUNK = re.compile(rb"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+_ESCAPE = re.compile(rb'\\([0-7]{3}|.)')
+_ESCAPES = {b"a": b"\a", b"b": b"\b", b"f": b"\f", b"n": b"\n", b"r": b"\r", b"t": b"\t", b"v": b"\v"}
+
+
+def _diff_path(raw: bytes) -> bytes:
+    """
+    Ruta de un encabezado "+++ ". git agrega un TAB al final si la ruta tiene
+    espacios, y la escribe entre comillas con escapes estilo C si tiene
+    comillas, barras invertidas o caracteres de control.
+    """
+    raw = raw.rstrip(b"\t")
+    if len(raw) >= 2 and raw.startswith(b'"') and raw.endswith(b'"'):
+        raw = _ESCAPE.sub(
+            lambda m: bytes([int(m.group(1), 8)]) if len(m.group(1)) == 3
+            else _ESCAPES.get(m.group(1), m.group(1)),
+            raw[1:-1],
+        )
+    return raw
+
+
+def changed_lines(root: str | Path, since: str) -> dict[str, set[int]]:
+    """
+    Líneas agregadas o modificadas (numeración del archivo actual) desde el
+    merge-base entre `since` y HEAD, incluyendo cambios sin commitear.
+    Los archivos borrados o binarios no aparecen.
+    """
+    base = _git(root, "merge-base", since, "HEAD").decode().strip()
+    out = _git(
+        root, "-c", "core.quotePath=false",
+        "diff", "-U0", "--no-color", "--no-ext-diff", "--no-renames", "--relative", base,
+    )
+    lines: dict[str, set[int]] = {}
+    current: set[int] | None = None
+    in_header = False
+    for raw in out.split(b"\n"):
+        # "+++ " solo es encabezado antes del primer hunk (si no, es una línea agregada)
+        if raw.startswith(b"diff --git "):
+            in_header, current = True, None
+            continue
+        if in_header and raw.startswith(b"+++ "):
+            target = _diff_path(raw[4:])
+            if target == b"/dev/null":
+                current = None
+                continue
+            rel = target[2:] if target.startswith(b"b/") else target
+            current = lines.setdefault(rel.decode("utf-8", errors="surrogateescape"), set())
+            continue
+        if current is None or not raw.startswith(b"@@"):
+            continue
+        in_header = False
+        m = _HUNK.match(raw)
+        if m is None:
+            continue
+        start, count = int(m.group(1)), int(m.group(2) or 1)
+        current.update(range(start, start + count))
+    return {rel: nums for rel, nums in lines.items() if nums}
@@ -0,0 +1,61 @@
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterator, Sequence, TypeVar
+
+from auditor.utils.fs import FileEntry
+
+T = TypeVar("T")
+
+# Cada worker recibe varios shards para repartir mejor la carga
+SHARDS_PER_JOB = 4
+
+
+def shard_by_size(entries: Sequence[FileEntry], shards: int) -> list[list[FileEntry]]:
+    """
+    Parte `entries` en hasta `shards` tramos contiguos con un número de bytes
+    parecido. Al ser contiguos se conserva el orden original entre shards.
+    """
+    if shards <= 1 or len(entries) <= 1:
+        return [list(entries)] if entries else []
+    total = sum(max(e.size, 1) for e in entries)
+    target = total / shards
+    out: list[list[FileEntry]] = []
+    current: list[FileEntry] = []
+    acc = 0
+    for e in entries:
+        current.append(e)
+        acc += max(e.size, 1)
+        if acc >= target * (len(out) + 1) and len(out) < shards - 1:
+            out.append(current)
+            current = []
+    if current:
+        out.append(current)
+    return out
+
+
+def scan_sharded(
+    worker: Callable[[list[tuple[str, str]]], list[T]],
+    entries: Sequence[FileEntry],
+    jobs: int,
+    cancelled: Callable[[], bool] | None = None,
+) -> Iterator[T]:
+    """
+    Ejecuta `worker` sobre shards de `entries` en un pool de procesos.
+    `worker` debe ser picklable (función de módulo o functools.partial) y
+    recibe pares (ruta absoluta, ruta relativa). Los resultados se emiten
+    en cuanto termina cada shard, respetando el orden de `entries`.
+    Si `cancelled()` pasa a ser verdadero se descartan los shards pendientes.
+    """
+    shards = shard_by_size(entries, jobs * SHARDS_PER_JOB)
+    if not shards:
+        return
+    with ProcessPoolExecutor(max_workers=min(jobs, len(shards))) as pool:
+        futures = [
+            pool.submit(worker, [(str(e.path), e.rel) for e in shard])
+            for shard in shards
+        ]
+        for fut in futures:
+            if cancelled is not None and cancelled():
+                pool.shutdown(wait=False, cancel_futures=True)
+                return
+            yield from fut.result()
@@ -1,6 +1,8 @@
 from __future__ import annotations
 from pathlib import Path
 import pytest
+import shutil
+import subprocess
 import textwrap
 
 @pytest.fixture
@@ -40,3 +42,21 @@ def bad_repo(tmp_path: Path) -> Path:
     (root / "src").mkdir()
     (root / "src" / "app.py").write_text("print('hello')\n", encoding="utf-8")
     return root
+
+def _git(root: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-C", str(root), *args], check=True, capture_output=True, text=True
+    ).stdout
+
+@pytest.fixture
+def git_repo(tmp_path: Path):
+    """Repo git vacío con identidad configurada; devuelve (root, git)."""
+    if shutil.which("git") is None:
+        pytest.skip("git no está disponible")
+    root = tmp_path / "gitrepo"
+    root.mkdir()
+    _git(root, "init", "-q", "-b", "main")
+    _git(root, "config", "user.email", "auditor@example.com")
+    _git(root, "config", "user.name", "auditor")
+    _git(root, "config", "commit.gpgsign", "false")
+    return root, lambda *args: _git(root, *args)
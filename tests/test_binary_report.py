@@ -0,0 +1,75 @@
+from __future__ import annotations
+from pathlib import Path
+import io
+import json
+
+import pytest
+
+from auditor import cli
+from auditor.report import Report
+from auditor.reporting import binary_report, md_renderer
+from auditor.reporting.binary_report import BinaryReport, BinaryReportWriter
+from tools import render_summary
+
+
+def _audit(repo: Path, out: Path, fmt: str) -> None:
+    assert cli.main(["--repo", str(repo), "--output", str(out), "--format", fmt]) == 0
+
+
+def test_binary_matches_json_report(bad_repo: Path, tmp_path: Path):
+    _audit(bad_repo, tmp_path / "r.json", "json")
+    _audit(bad_repo, tmp_path / "r.bin", "binary")
+    expected = json.loads((tmp_path / "r.json").read_text(encoding="utf-8"))
+
+    header = binary_report.read_header(tmp_path / "r.bin")
+    assert header["summary"] == expected["summary"]
+    assert header["repo_root"] == expected["repo_root"]
+
+    with BinaryReport(tmp_path / "r.bin") as report:
+        assert len(report) == expected["summary"]["total"]
+        assert list(report) == expected["findings"]
+        assert report[-1] == expected["findings"][-1]
+        assert report[1:3] == expected["findings"][1:3]
+        with pytest.raises(IndexError):
+            report[len(report)]
+
+
+def test_consumers_read_both_formats(bad_repo: Path, tmp_path: Path):
+    _audit(bad_repo, tmp_path / "r.json", "json")
+    _audit(bad_repo, tmp_path / "r.bin", "binary")
+
+    for name in ("r.json", "r.bin"):
+        src = str(tmp_path / name)
+        md = md_renderer.generate_markdown(md_renderer.load_json_report(src))
+        stream = io.StringIO()
+        md_renderer.render_markdown_stream(src, stream)
+        assert stream.getvalue() == md
+        assert render_summary.main(["--input", src, "--output", str(tmp_path / f"{name}.md")]) == 0
+
+    assert (tmp_path / "r.json.md").read_text(encoding="utf-8") == \
+        (tmp_path / "r.bin.md").read_text(encoding="utf-8")
+
+
+def test_writer_does_not_need_seek(tmp_path: Path):
+    # Como en un pipe: el writer solo escribe hacia adelante
+    buf = io.BytesIO()
+    writer = BinaryReportWriter(buf)
+    writer.add({"rule_id": "R001", "message": "ñandú", "severity": "High", "path": None})
+    writer.close({"repo_root": "/r", "summary": {"total": 1}})
+    path = tmp_path / "r.bin"
+    path.write_bytes(buf.getvalue())
+
+    report = Report.load(path)
+    assert report.header["summary"] == {"total": 1}
+    assert report.findings[0].message == "ñandú"
+
+
+def test_rejects_truncated_file(tmp_path: Path):
+    path = tmp_path / "r.bin"
+    buf = io.BytesIO()
+    BinaryReportWriter(buf).close({"summary": {"total": 0}})
+    path.write_bytes(buf.getvalue()[:-3])
+    with pytest.raises(ValueError):
+        binary_report.read_header(path)
+    with pytest.raises(ValueError):
+        BinaryReport(path)
@@ -0,0 +1,134 @@
+from __future__ import annotations
+import json
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+from auditor.cache import AuditCache, rule_version
+from auditor.core import RuleContext, run_rules
+from auditor.utils.content import ContentPolicy
+from auditor.rules.makefile_rule import MakefileRule
+from auditor.rules import secrets_rule
+from auditor.rules.secrets_rule import SecretsRule
+
+
+def _repo(tmp_path: Path) -> Path:
+    repo = tmp_path / "repo"
+    (repo / "src").mkdir(parents=True)
+    (repo / "src" / "a.py").write_text("token = 'x'\n", encoding="utf-8")
+    (repo / "src" / "b.py").write_text("print('ok')\n", encoding="utf-8")
+    (repo / "Makefile").write_text("run:\n\t@echo run\n", encoding="utf-8")
+    return repo
+
+
+def _audit(repo: Path, cache_dir: Path, rules):
+    cache = AuditCache(cache_dir)
+    findings = run_rules(RuleContext(str(repo), cache=cache), rules)
+    cache.save()
+    return findings
+
+
+def test_secrets_reuses_unchanged_files(tmp_path: Path):
+    repo = _repo(tmp_path)
+    cache_dir = tmp_path / "cache"
+    first = _audit(repo, cache_dir, [SecretsRule()])
+
+    with patch.object(secrets_rule, "_scan_files", wraps=secrets_rule._scan_files) as m:
+        second = _audit(repo, cache_dir, [SecretsRule()])
+    assert second == first
+    assert not m.called  # nada que re-escanear
+
+    b = repo / "src" / "b.py"
+    b.write_text("password = 'hunter2'\n", encoding="utf-8")
+    with patch.object(secrets_rule, "_scan_files", wraps=secrets_rule._scan_files) as m:
+        third = _audit(repo, cache_dir, [SecretsRule()])
+    scanned = [rel for call in m.call_args_list for _, rel in call.args[0]]
+    assert scanned == [os.path.join("src", "b.py")]
+    assert [f.path for f in third] == [os.path.join("src", "a.py"), os.path.join("src", "b.py")]
+
+
+def test_root_rule_skipped_when_input_unchanged(tmp_path: Path):
+    repo = _repo(tmp_path)
+    cache_dir = tmp_path / "cache"
+    first = _audit(repo, cache_dir, [MakefileRule()])
+    with patch.object(MakefileRule, "_targets_in") as m:
+        second = _audit(repo, cache_dir, [MakefileRule()])
+    assert second == first and not m.called
+
+    (repo / "Makefile").write_text("run:\ntest:\nlint:\nplan:\napply:\n", encoding="utf-8")
+    assert _audit(repo, cache_dir, [MakefileRule()]) == []
+
+
+def test_pattern_change_invalidates(tmp_path: Path, monkeypatch):
+    repo = _repo(tmp_path)
+    cache_dir = tmp_path / "cache"
+    old = rule_version(SecretsRule())
+    _audit(repo, cache_dir, [SecretsRule()])
+
+    monkeypatch.setattr(SecretsRule, "SECRET_PATTERNS", [r"(?i)PRINT\("])
+    assert rule_version(SecretsRule()) != old
+    findings = _audit(repo, cache_dir, [SecretsRule()])
+    assert [f.path for f in findings] == [os.path.join("src", "b.py")]
+    # la versión anterior de R006 se eliminó
+    assert len(list(cache_dir.glob("R006-*.json"))) == 1
+
+
+def test_cache_respects_max_bytes(tmp_path: Path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    for i in range(50):
+        (repo / f"f{i:02d}.py").write_text(f"token = '{i}'\n", encoding="utf-8")
+    cache = AuditCache(tmp_path / "cache", max_bytes=2048)
+    run_rules(RuleContext(str(repo), cache=cache), [SecretsRule()])
+    cache.save()
+    (path,) = (tmp_path / "cache").glob("R006-*.json")
+    assert path.stat().st_size <= 2048
+    assert json.loads(path.read_text(encoding="utf-8"))["entries"]
+
+
+def test_content_policy_is_part_of_the_key(tmp_path: Path):
+    repo = _repo(tmp_path)
+    big = repo / "src" / "big.py"
+    big.write_text("x = 1\n" * 200 + "token = 'medio'\n" + "y = 2\n" * 200, encoding="utf-8")
+    cache_dir = tmp_path / "cache"
+    assert {f.path for f in _audit(repo, cache_dir, [SecretsRule()])} >= {os.path.join("src", "big.py")}
+
+    # Misma caché, archivo ahora "enorme": solo cabeza y cola, el token del medio no se ve
+    cache = AuditCache(cache_dir)
+    ctx = RuleContext(str(repo), cache=cache, content_policy=ContentPolicy(max_size=1000, window=100))
+    findings = run_rules(ctx, [SecretsRule()])
+    cache.save()
+    assert os.path.join("src", "big.py") not in {f.path for f in findings}
+    assert ctx.scan_stats.to_dict()["by_reason"] == {"head-tail": 1}
+
+
+def test_root_rules_do_not_share_entries_across_repos(tmp_path: Path):
+    from auditor.rules.coverage_rule import CoverageRule
+    from auditor.rules.gitignore_rule import GitignoreEnvRule
+    cache_dir = tmp_path / "cache"
+    repos = []
+    for name in ("a", "b"):
+        repo = tmp_path / name
+        repo.mkdir()
+        (repo / ".gitignore").write_text("build/\n", encoding="utf-8")
+        os.utime(repo / ".gitignore", ns=(0, 0))
+        repos.append(repo)
+
+    rules = [GitignoreEnvRule(), CoverageRule()]
+    first = _audit(repos[0], cache_dir, rules)
+    second = _audit(repos[1], cache_dir, rules)
+    assert first and len(second) == len(first)
+    assert all(str(repos[0]) not in f"{f.path} {f.message}" for f in second)
+
+
+def test_content_module_is_part_of_the_version(tmp_path: Path, monkeypatch):
+    from auditor import cache as cache_module
+    policy = ContentPolicy()
+    cache = AuditCache(tmp_path / "cache")
+    before = cache.for_rule(SecretsRule(), policy).path.name
+    real = cache_module._module_source
+    monkeypatch.setattr(
+        cache_module, "_module_source",
+        lambda name: real(name) + (b"#" if name == ContentPolicy.__module__ else b""),
+    )
+    assert AuditCache(tmp_path / "cache").for_rule(SecretsRule(), policy).path.name != before
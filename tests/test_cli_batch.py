@@ -0,0 +1,96 @@
+from __future__ import annotations
+from pathlib import Path
+import importlib
+import os
+import json
+
+import pytest
+
+
+@pytest.fixture
+def cli():
+    return importlib.import_module("auditor.cli")
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_batch_audits_every_repo(good_repo: Path, bad_repo: Path, tmp_path: Path, cli, jobs):
+    (good_repo / "coverage.xml").write_text("<coverage line-rate='0.95'/>", encoding="utf-8")
+    repos_file = tmp_path / "repos.txt"
+    repos_file.write_text(f"# nightly\n{good_repo}\n\n{bad_repo}\n", encoding="utf-8")
+    reports = tmp_path / "reports"
+    out = tmp_path / "all.json"
+
+    exit_code = cli.main([
+        "--repos-from", str(repos_file),
+        "--reports-dir", str(reports),
+        "--output", str(out),
+        "--jobs", jobs,
+        "--fail-on", "high",
+    ])
+
+    data = json.loads(out.read_text(encoding="utf-8"))
+    assert exit_code == 2
+    assert [Path(r["repo_root"]).name for r in data["repos"]] == ["good", "bad"]
+    per_repo = [json.loads(Path(r["report"]).read_text(encoding="utf-8")) for r in data["repos"]]
+    assert per_repo[0]["summary"]["total"] == 0
+    assert data["summary"]["total"] == per_repo[1]["summary"]["total"] > 0
+
+
+def test_batch_reports_broken_repo(good_repo: Path, tmp_path: Path, cli):
+    out = tmp_path / "all.json"
+    exit_code = cli.main([
+        "--repo", str(good_repo),
+        "--repo", str(tmp_path / "missing"),
+        "--source", "git",
+        "--reports-dir", str(tmp_path / "reports"),
+        "--output", str(out),
+    ])
+    data = json.loads(out.read_text(encoding="utf-8"))
+    assert exit_code == 1
+    assert all("error" in r for r in data["repos"])
+
+
+def test_batch_cache_is_keyed_by_repo_path(good_repo: Path, bad_repo: Path, tmp_path: Path, cli):
+    cache = tmp_path / "cache"
+
+    def run(*repos: Path) -> set[str]:
+        args = ["--reports-dir", str(tmp_path / "reports"), "--output", str(tmp_path / "all.json"),
+                "--cache-dir", str(cache)]
+        for repo in repos:
+            args += ["--repo", str(repo)]
+        cli.main(args)
+        return {d.name for d in cache.iterdir()}
+
+    first = run(good_repo, bad_repo)
+    # Otro orden: cada repo vuelve a su directorio
+    assert run(bad_repo, good_repo) == first
+    assert {cli._cache_name(str(good_repo.resolve())), cli._cache_name(str(bad_repo.resolve()))} == first
+
+
+def test_batch_cache_limit_covers_the_whole_batch(tmp_path: Path, cli):
+    root = tmp_path / "cache"
+    for name, size in (("old", 600), ("older", 600), ("current", 600)):
+        (root / name).mkdir(parents=True)
+        (root / name / "R001-x.json").write_bytes(b"x" * size)
+    os.utime(root / "older", (0, 0))
+
+    cli._trim_batch_cache(root, {"current"}, 1300)
+
+    assert sorted(d.name for d in root.iterdir()) == ["current", "old"]
+
+
+def test_batch_reports_missing_repo_as_error(good_repo: Path, tmp_path: Path, cli):
+    (good_repo / "coverage.xml").write_text("<coverage line-rate='0.95'/>", encoding="utf-8")
+    not_dir = tmp_path / "file.txt"
+    not_dir.write_text("x", encoding="utf-8")
+    out = tmp_path / "all.json"
+    exit_code = cli.main([
+        "--repo", str(good_repo),
+        "--repo", str(tmp_path / "missing"),
+        "--repo", str(not_dir),
+        "--reports-dir", str(tmp_path / "reports"),
+        "--output", str(out),
+    ])
+    data = json.loads(out.read_text(encoding="utf-8"))
+    assert exit_code == 1
+    assert ["error" in r for r in data["repos"]] == [False, True, True]
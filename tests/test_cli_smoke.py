@@ -140,3 +140,160 @@ def test_cli_ignore_dirs_skips_secrets_in_tests(tmp_path: Path, capsys):
     assert exit_code == 0
     # Aseguramos que R006 NO aparece
     assert all(f["rule_id"] != "R006" for f in data["findings"])
+
+
+def test_cli_jobs_matches_sequential(bad_repo: Path, capsys, cli_module):
+    cli_module.main(["--repo", str(bad_repo)])
+    sequential = json.loads(capsys.readouterr().out)
+    cli_module.main(["--repo", str(bad_repo), "--jobs", "4"])
+    parallel = json.loads(capsys.readouterr().out)
+    assert parallel == sequential
+
+
+def test_cli_ndjson_streams_findings_then_summary(bad_repo: Path, capsys, cli_module):
+    cli_module.main(["--repo", str(bad_repo)])
+    as_json = json.loads(capsys.readouterr().out)
+
+    exit_code = cli_module.main(["--repo", str(bad_repo), "--format", "ndjson", "--fail-on", "high"])
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+    assert exit_code == 2
+    assert [r["kind"] for r in records] == ["finding"] * (len(records) - 1) + ["summary"]
+    assert records[-1]["summary"] == as_json["summary"]
+    findings = [{k: v for k, v in r.items() if k != "kind"} for r in records[:-1]]
+    assert findings == as_json["findings"]
+
+
+def test_cli_cache_dir_reuses_results(bad_repo: Path, tmp_path: Path, capsys, cli_module):
+    cache_dir = tmp_path / ".auditor-cache"
+    cli_module.main(["--repo", str(bad_repo), "--cache-dir", str(cache_dir)])
+    first = json.loads(capsys.readouterr().out)
+    cli_module.main(["--repo", str(bad_repo), "--cache-dir", str(cache_dir)])
+    second = json.loads(capsys.readouterr().out)
+    assert first == second
+    assert any(cache_dir.glob("R006-*.json"))
+
+
+@pytest.mark.parametrize("jobs", ["1", "4"])
+def test_cli_fail_fast_stops_at_first_high(bad_repo: Path, capsys, cli_module, jobs):
+    from unittest.mock import patch
+    from auditor.rules.secrets_rule import SecretsRule
+
+    with patch.object(SecretsRule, "check", return_value=[]) as scan:
+        exit_code = cli_module.main([
+            "--repo", str(bad_repo), "--fail-on", "high", "--fail-fast", "--jobs", jobs,
+        ])
+    data = json.loads(capsys.readouterr().out)
+
+    assert exit_code == 2
+    assert data["incomplete"] is True
+    assert "High" in {f["severity"] for f in data["findings"]}
+    if jobs == "1":
+        # reglas de raíz primero: el .gitignore sin .env corta antes del escaneo
+        assert [f["rule_id"] for f in data["findings"]] == ["R001"]
+        assert not scan.called
+
+
+def test_cli_fail_fast_without_hit_is_complete(good_repo: Path, capsys, cli_module):
+    _write_coverage(good_repo, 0.95)
+    exit_code = cli_module.main(["--repo", str(good_repo), "--fail-on", "low", "--fail-fast"])
+    data = json.loads(capsys.readouterr().out)
+    assert exit_code == 0
+    assert "incomplete" not in data
+
+
+def test_cli_fail_fast_keeps_order_when_threshold_not_hit(bad_repo: Path, capsys, cli_module):
+    # Sin findings High el umbral no se alcanza: con o sin hilos, mismo reporte completo
+    argv = ["--repo", str(bad_repo), "--rules", "R002,R003",
+            "--fail-on", "high", "--fail-fast"]
+    cli_module.main([*argv, "--jobs", "1"])
+    expected = json.loads(capsys.readouterr().out)
+    assert len({f["rule_id"] for f in expected["findings"]}) > 1
+    for _ in range(3):
+        cli_module.main([*argv, "--jobs", "4"])
+        data = json.loads(capsys.readouterr().out)
+        assert "incomplete" not in data
+        assert data["findings"] == expected["findings"]
+
+
+def test_cli_fail_fast_hit_in_last_rule_is_complete(good_repo: Path, capsys, cli_module):
+    (good_repo / "app.py").write_text("TOKEN = 'abc'\n", encoding="utf-8")
+    exit_code = cli_module.main([
+        "--repo", str(good_repo), "--rules", "R003,R006", "--fail-on", "high", "--fail-fast",
+    ])
+    data = json.loads(capsys.readouterr().out)
+    assert exit_code == 2
+    assert [f["rule_id"] for f in data["findings"]] == ["R006"]
+    assert "incomplete" not in data
+
+
+def test_cli_default_excludes_skip_node_modules(good_repo: Path, capsys, cli_module):
+    _write_coverage(good_repo, 0.95)
+    vendored = good_repo / "node_modules" / "lib"
+    vendored.mkdir(parents=True)
+    (vendored / "conf.js").write_text("const API_KEY = 'abc';\n", encoding="utf-8")
+
+    cli_module.main(["--repo", str(good_repo)])
+    assert json.loads(capsys.readouterr().out)["summary"]["total"] == 0
+
+    cli_module.main(["--repo", str(good_repo), "--no-default-excludes"])
+    data = json.loads(capsys.readouterr().out)
+    assert [f["rule_id"] for f in data["findings"]] == ["R006"]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_cli_json_file_streams_same_document(bad_repo: Path, tmp_path: Path, capsys, cli_module, compact):
+    flags = ["--compact"] if compact else []
+    out = tmp_path / "report.json"
+    cli_module.main(["--repo", str(bad_repo), "--output", str(out), *flags])
+    cli_module.main(["--repo", str(bad_repo), *flags])
+    from_file = json.loads(out.read_text(encoding="utf-8"))
+    from_stdout = json.loads(capsys.readouterr().out)
+
+    assert from_file == from_stdout
+    assert from_file["summary"]["total"] == len(from_file["findings"]) > 0
+    # En archivo el resumen queda antes de los findings; en stdout, al final
+    assert list(from_file)[:3] == ["repo_root", "summary", "findings"]
+    assert list(from_stdout)[:3] == ["repo_root", "findings", "summary"]
+    if compact:
+        assert out.read_text(encoding="utf-8").count("\n") == 1
+
+
+def test_write_json_matches_indented_dump(tmp_path: Path, cli_module):
+    from auditor.core import Finding, Severity
+    findings = [
+        Finding("R006", "Posible secreto", Severity.HIGH, "a.py", {"line": 1, "pattern": "TOKEN"}),
+        Finding("R003", "Falta target", Severity.LOW),
+    ]
+    out = tmp_path / "r.json"
+    with open(out, "w", encoding="utf-8") as fh:
+        summary, worst = cli_module._write_json(fh, "/repo", iter(findings), {"incomplete": True})
+
+    expected = json.dumps({
+        "repo_root": "/repo",
+        "summary": summary,
+        "findings": [cli_module._finding_to_dict(f) for f in findings],
+        "incomplete": True,
+    }, indent=2, ensure_ascii=False) + "\n"
+    written = out.read_text(encoding="utf-8")
+    assert "\n".join(line.rstrip() for line in written.split("\n")) == expected
+    assert worst == 3
+
+
+def test_write_json_summary_slot_padding(tmp_path: Path, cli_module, monkeypatch):
+    from auditor.core import Finding, Severity
+    findings = [Finding("R003", "Falta target", Severity.LOW)] * 12
+    out = tmp_path / "r.json"
+    with open(out, "w", encoding="utf-8") as fh:
+        cli_module._write_json(fh, "/repo", iter(findings), compact=True)
+    written = out.read_text(encoding="utf-8")
+    assert list(json.loads(written))[:3] == ["repo_root", "summary", "findings"]
+    assert " " * 24 not in written
+
+    # Conteos que no entran en el hueco: el resumen va después de los findings
+    monkeypatch.setattr(cli_module, "_SUMMARY_RESERVE", {"total": 1, "by_severity": {}})
+    with open(out, "w", encoding="utf-8") as fh:
+        summary, _ = cli_module._write_json(fh, "/repo", iter(findings), compact=True)
+    data = json.loads(out.read_text(encoding="utf-8"))
+    assert list(data) == ["repo_root", "findings", "summary"]
+    assert data["summary"] == summary
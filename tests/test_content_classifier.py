@@ -0,0 +1,74 @@
+from __future__ import annotations
+from pathlib import Path
+import importlib
+import json
+
+import pytest
+
+from auditor.core import RuleContext
+from auditor.rules.config_rule import ConfigViaEnvRule
+from auditor.rules.secrets_rule import SecretsRule
+from auditor.utils.content import ContentPolicy, sniff
+
+
+@pytest.mark.parametrize("head, expected", [
+    (b"\x89PNG\r\n\x1a\n....", "binary:png"),
+    (b"PK\x03\x04rest", "binary:zip"),
+    (b"token = 'x'\x00\x01", "binary"),
+    (b"token = 'x'\n", None),
+    (b"", None),
+])
+def test_sniff(head: bytes, expected):
+    assert sniff(head) == expected
+
+
+def test_policy_regions():
+    policy = ContentPolicy(max_size=100, window=10)
+    assert policy.regions(100) == [(0, 100)]
+    assert policy.regions(1000) == [(0, 10), (990, 1000)]
+
+
+def test_secrets_skips_binaries_and_records_reason(tmp_path: Path):
+    (tmp_path / "logo.png").write_bytes(b"\x89PNG\r\n\x1a\ntoken = 'x'\n")
+    (tmp_path / "dump.bin").write_bytes(b"password = 'x'\n\x00\x00")
+    (tmp_path / "app.py").write_text("token = 'x'\n", encoding="utf-8")
+
+    ctx = RuleContext(str(tmp_path))
+    findings = SecretsRule().check(ctx)
+
+    assert [f.path for f in findings] == ["app.py"]
+    stats = ctx.scan_stats.to_dict()
+    assert stats["by_reason"] == {"binary": 2}
+    assert {(s["path"], s["reason"]) for s in stats["files"]} == {
+        ("dump.bin", "binary"), ("logo.png", "binary:png"),
+    }
+
+
+def test_secrets_scans_only_head_and_tail_of_huge_files(tmp_path: Path):
+    filler = "x = 1\n" * 1000
+    body = "token = 'inicio'\n" + filler + "password = 'medio'\n" + filler + "secret = 'fin'\n"
+    (tmp_path / "big.py").write_text(body, encoding="utf-8")
+
+    ctx = RuleContext(str(tmp_path), content_policy=ContentPolicy(max_size=1024, window=512))
+    findings = SecretsRule().check(ctx)
+
+    assert [f.meta["line"] for f in findings] == [1, 2003]
+    assert ctx.scan_stats.to_dict()["by_reason"] == {"head-tail": 1}
+
+
+def test_config_rule_ignores_binary_python_files(tmp_path: Path):
+    (tmp_path / "config.json").write_text("{}", encoding="utf-8")
+    (tmp_path / "blob.py").write_bytes(b"\x00os.environ\n")
+    ctx = RuleContext(str(tmp_path))
+    assert len(ConfigViaEnvRule().check(ctx)) == 1
+    assert ctx.scan_stats.to_dict()["by_reason"] == {"binary": 1}
+
+
+def test_cli_reports_skipped_files(good_repo: Path, capsys):
+    (good_repo / "coverage.xml").write_text("<coverage line-rate='0.95'/>", encoding="utf-8")
+    (good_repo / "pc3s1.png").write_bytes(b"\x89PNG\r\n\x1a\n\x00\x00")
+    cli = importlib.import_module("auditor.cli")
+    assert cli.main(["--repo", str(good_repo)]) == 0
+    data = json.loads(capsys.readouterr().out)
+    assert data["summary"]["total"] == 0
+    assert data["skipped"]["by_reason"] == {"binary": 1}
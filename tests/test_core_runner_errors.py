@@ -1,9 +1,10 @@
 from __future__ import annotations
 from dataclasses import dataclass
 import importlib
+import time
 import pytest
 
-from auditor.core import Rule, RuleContext, run_rules, Finding, Severity
+from auditor.core import Rule, RuleContext, cheap_first, iter_rules, run_rules, Finding, Severity
 
 
 @dataclass
@@ -21,3 +22,81 @@ def test_run_rules_catches_exceptions(tmp_path):
     assert findings and findings[0].rule_id == "T999"
     assert findings[0].severity is Severity.MEDIUM
     assert findings[0].meta.get("crash") is True
+
+
+@dataclass
+class SleepyRule(Rule):
+    id: str = "T100"
+    description: str = "duerme y reporta"
+    delay: float = 0.0
+
+    def check(self, ctx: RuleContext) -> list[Finding]:
+        time.sleep(self.delay)
+        return [Finding(rule_id=self.id, message="ok", severity=Severity.LOW)]
+
+
+def test_run_rules_parallel_keeps_rule_order(tmp_path):
+    ctx = RuleContext(str(tmp_path))
+    rules = [
+        SleepyRule(id="T1", delay=0.05),
+        BoomRule(),
+        SleepyRule(id="T2", delay=0.0),
+    ]
+    findings = run_rules(ctx, rules, jobs=3)
+    assert [f.rule_id for f in findings] == ["T1", "T999", "T2"]
+    assert findings[1].meta.get("crash") is True
+    assert findings == run_rules(ctx, rules, jobs=1)
+
+
+def test_iter_rules_yields_before_later_rules_run(tmp_path):
+    ctx = RuleContext(str(tmp_path))
+    calls = []
+
+    @dataclass
+    class Tracking(Rule):
+        id: str = "T2"
+        description: str = "registra la llamada"
+
+        def check(self, ctx: RuleContext) -> list[Finding]:
+            calls.append(self.id)
+            return []
+
+    it = iter_rules(ctx, [SleepyRule(id="T1"), Tracking()])
+    first = next(it)
+    assert first.rule_id == "T1" and calls == []
+    assert list(it) == [] and calls == ["T2"]
+
+
+@dataclass
+class CancellableRule(Rule):
+    id: str = "T300"
+    description: str = "espera hasta que la cancelen"
+
+    def check(self, ctx: RuleContext) -> list[Finding]:
+        deadline = time.monotonic() + 5
+        while not ctx.cancelled and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return [Finding(rule_id=self.id, message="tarde", severity=Severity.LOW)]
+
+
+def test_closing_iter_rules_cancels_in_flight_rules(tmp_path):
+    ctx = RuleContext(str(tmp_path))
+    it = iter_rules(ctx, [CancellableRule(), SleepyRule(id="T1")], jobs=2, ordered=False)
+    start = time.monotonic()
+    assert next(it).rule_id == "T1"
+    it.close()
+    assert ctx.cancelled
+    assert time.monotonic() - start < 2
+
+
+def test_cheap_first_puts_root_rules_first():
+    class Root:
+        id = "root"
+        inputs = ("Makefile",)
+
+    class Content:
+        id = "content"
+
+    assert [r.id for r in cheap_first([Content(), Root(), Content()])] == [
+        "root", "content", "content",
+    ]
@@ -0,0 +1,65 @@
+from __future__ import annotations
+from pathlib import Path
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from auditor.core import RuleContext
+from auditor.rules.coverage_rule import CoverageRule
+from auditor.utils.coverage import iter_line_rates, read_line_rate
+from tools import read_coverage
+
+
+def _cobertura(path: Path, packages: dict[str, float], tail: str = "") -> None:
+    body = []
+    for name, rate in packages.items():
+        lines = "".join(f'<line number="{i}" hits="1"/>' for i in range(1, 200))
+        body.append(
+            f'<package name="{name}" line-rate="{rate}"><classes>'
+            f'<class name="{name}.mod" filename="{name}/mod.py" line-rate="{rate}">'
+            f'<lines>{lines}</lines></class></classes></package>'
+        )
+    path.write_text(
+        '<?xml version="1.0"?><coverage line-rate="0.93" version="7.0">'
+        f'<packages>{"".join(body)}</packages></coverage>{tail}',
+        encoding="utf-8",
+    )
+
+
+def test_read_line_rate_stops_after_root(tmp_path: Path):
+    cov = tmp_path / "coverage.xml"
+    # Basura al final: solo se nota si se parsea el archivo completo
+    _cobertura(cov, {f"pkg{i}": 0.9 for i in range(50)}, tail="<<<no-xml")
+    assert read_line_rate(cov) == pytest.approx(0.93)
+    with pytest.raises(ET.ParseError):
+        list(iter_line_rates(cov))
+
+
+def test_iter_line_rates_packages_and_classes(tmp_path: Path):
+    cov = tmp_path / "coverage.xml"
+    _cobertura(cov, {"api": 0.95, "legacy": 0.4})
+    assert list(iter_line_rates(cov)) == [
+        ("coverage", "", 0.93), ("package", "api", 0.95), ("package", "legacy", 0.4),
+    ]
+    classes = [name for tag, name, _ in iter_line_rates(cov, tags=("class",)) if tag == "class"]
+    assert classes == ["api.mod", "legacy.mod"]
+
+
+def test_coverage_rule_package_threshold(tmp_path: Path, monkeypatch):
+    _cobertura(tmp_path / "coverage.xml", {"api": 0.95, "legacy": 0.4})
+    ctx = RuleContext(str(tmp_path))
+    assert CoverageRule().check(ctx) == []
+
+    monkeypatch.setattr(CoverageRule, "PACKAGE_MIN_RATE", 0.8)
+    findings = CoverageRule().check(ctx)
+    assert [f.meta["package"] for f in findings] == ["legacy"]
+    assert findings[0].meta["required"] == 0.8
+
+
+def test_read_coverage_tool(tmp_path: Path, capsys):
+    cov = tmp_path / "coverage.xml"
+    _cobertura(cov, {"api": 0.95, "legacy": 0.4})
+    assert read_coverage.main(["90", "--file", str(cov)]) == 0
+    assert read_coverage.main(["95", "--file", str(cov)]) == 1
+    assert read_coverage.main(["90", "--file", str(cov), "--package-min", "80"]) == 1
+    assert "legacy: 40.00%" in capsys.readouterr().out
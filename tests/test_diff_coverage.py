@@ -0,0 +1,104 @@
+from __future__ import annotations
+from pathlib import Path
+import importlib
+import json
+
+from auditor.core import RuleContext
+from auditor.rules.diff_coverage_rule import DiffCoverageRule
+from auditor.utils.coverage import line_hits
+from auditor.utils.git import changed_lines
+
+
+def _cobertura(path: Path, source: str, classes: dict[str, dict[int, int]]) -> None:
+    body = []
+    for filename, lines in classes.items():
+        xml_lines = "".join(f'<line number="{n}" hits="{h}"/>' for n, h in lines.items())
+        # Las líneas de <methods> repiten las de la clase: no deben duplicarse
+        method = '<methods><method name="f"><lines><line number="1" hits="0"/></lines></method></methods>'
+        body.append(
+            f'<class name="{filename}" filename="{filename}" line-rate="0.5">'
+            f'{method}<lines>{xml_lines}</lines></class>'
+        )
+    path.write_text(
+        f'<?xml version="1.0"?><coverage line-rate="0.5"><sources><source>{source}</source></sources>'
+        f'<packages><package name="." line-rate="0.5"><classes>{"".join(body)}</classes>'
+        '</package></packages></coverage>',
+        encoding="utf-8",
+    )
+
+
+def test_changed_lines_from_diff(git_repo):
+    root, git = git_repo
+    (root / "app.py").write_text("a = 1\nb = 2\nc = 3\n", encoding="utf-8")
+    (root / "gone.py").write_text("x = 1\n", encoding="utf-8")
+    git("add", ".")
+    git("commit", "-qm", "base")
+    git("branch", "base")
+
+    (root / "app.py").write_text("a = 1\nb = 20\nc = 3\n++ d\n", encoding="utf-8")
+    (root / "new.py").write_text("n = 1\nm = 2\n", encoding="utf-8")
+    (root / "gone.py").unlink()
+    git("add", "new.py")
+
+    assert changed_lines(root, "base") == {"app.py": {2, 4}, "new.py": {1, 2}}
+
+
+def test_changed_lines_with_spaced_and_quoted_paths(git_repo):
+    root, git = git_repo
+    (root / "keep.py").write_text("k = 1\n", encoding="utf-8")
+    git("add", ".")
+    git("commit", "-qm", "base")
+    git("branch", "base")
+
+    (root / "my file.py").write_text("a = 1\nb = 2\n", encoding="utf-8")
+    (root / 'say "hi".py').write_text("c = 3\n", encoding="utf-8")
+    (root / "ñandú.py").write_text("d = 4\n", encoding="utf-8")
+    git("add", ".")
+
+    assert changed_lines(root, "base") == {
+        "my file.py": {1, 2},
+        'say "hi".py': {1},
+        "ñandú.py": {1},
+    }
+
+
+def test_line_hits_only_indexes_requested_files(tmp_path: Path):
+    cov = tmp_path / "coverage.xml"
+    _cobertura(cov, str(tmp_path / "pkg"), {
+        "mod.py": {1: 1, 2: 0},
+        "other.py": {1: 0},
+    })
+    assert line_hits(cov, {"pkg/mod.py"}, tmp_path) == {"pkg/mod.py": {1: 1, 2: 0}}
+
+
+def test_line_hits_maps_foreign_sources_by_suffix(tmp_path: Path):
+    cov = tmp_path / "coverage.xml"
+    # Reporte generado en CI con otra ruta absoluta
+    _cobertura(cov, "/home/runner/work/repo/repo/pkg", {"mod.py": {3: 0}})
+    assert line_hits(cov, {"pkg/mod.py", "mod.py"}, tmp_path) == {"pkg/mod.py": {3: 0}}
+
+
+def test_diff_coverage_reports_uncovered_changed_lines(git_repo, capsys):
+    root, git = git_repo
+    (root / "app.py").write_text("def f():\n    return 1\n", encoding="utf-8")
+    git("add", ".")
+    git("commit", "-qm", "base")
+    git("branch", "base")
+
+    (root / "app.py").write_text(
+        "def f():\n    return 1\n\ndef g():\n    return 2\n", encoding="utf-8"
+    )
+    git("commit", "-qam", "g")
+    # g() (líneas 4-5) se definió pero el cuerpo no se ejecuta; la 3 no se mide
+    _cobertura(root / "coverage.xml", str(root), {"app.py": {1: 1, 2: 1, 4: 1, 5: 0}})
+
+    assert DiffCoverageRule().check(RuleContext(str(root))) == []
+    findings = DiffCoverageRule().check(RuleContext(str(root), since="base"))
+    assert [(f.path, f.meta["line"]) for f in findings] == [("app.py", 5)]
+
+    cli = importlib.import_module("auditor.cli")
+    cli.main(["--repo", str(root), "--since", "base", "--rules", "R007"])
+    data = json.loads(capsys.readouterr().out)
+    assert [(f["rule_id"], f["path"], f["meta"]["line"]) for f in data["findings"]] == [
+        ("R007", "app.py", 5),
+    ]
@@ -0,0 +1,73 @@
+from __future__ import annotations
+from pathlib import Path
+import os
+from unittest.mock import patch
+
+from auditor.core import RuleContext
+from auditor.utils.fs import FileIndex, walk_files
+
+
+def _mk_tree(root: Path) -> None:
+    (root / "src").mkdir()
+    (root / "tests").mkdir()
+    (root / "src" / "app.py").write_text("print('ok')\n", encoding="utf-8")
+    (root / "src" / "data.JSON").write_text("{}", encoding="utf-8")
+    (root / "tests" / "test_app.py").write_text("x = 1\n", encoding="utf-8")
+    (root / "README.md").write_text("# demo\n", encoding="utf-8")
+
+
+def test_index_ext_and_glob_lookups(tmp_path: Path):
+    _mk_tree(tmp_path)
+    index = FileIndex.scan(tmp_path, ignore_dirs=["tests"])
+
+    # el recorrido poda los directorios ignorados sin entrar en ellos
+    assert [e.rel for e in index.by_ext(".py", include_ignored=True)] == ["src/app.py"]
+    assert [e.rel for e in index.by_ext(".json")] == ["src/data.JSON"]
+    assert [e.rel for e in index.glob("*.md")] == ["README.md"]
+    entry = index.get("src/app.py")
+    assert entry is not None and entry.size == len("print('ok')\n")
+
+
+def test_index_from_paths_flags_ignored(tmp_path: Path):
+    _mk_tree(tmp_path)
+    index = FileIndex.from_paths(
+        tmp_path, ["src/app.py", "tests/test_app.py", "gone.py"], ignore_dirs=["tests"]
+    )
+    assert [e.rel for e in index.by_ext(".py")] == ["src/app.py"]
+    assert index.get("tests/test_app.py").ignored is True
+    assert index.get("gone.py") is None
+
+
+def test_context_builds_index_once(tmp_path: Path):
+    _mk_tree(tmp_path)
+    ctx = RuleContext(str(tmp_path))
+    with patch.object(FileIndex, "scan", wraps=FileIndex.scan) as m:
+        first = ctx.files
+        second = ctx.files
+    assert first is second
+    assert m.call_count == 1
+
+
+def test_walk_prunes_default_excludes_and_links(tmp_path: Path):
+    _mk_tree(tmp_path)
+    (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+    (tmp_path / "node_modules" / "pkg" / "index.js").write_text("x", encoding="utf-8")
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "HEAD").write_text("ref", encoding="utf-8")
+    # ciclo de symlinks, symlink hacia fuera del repo y alias de un directorio
+    (tmp_path / "src" / "loop").symlink_to(tmp_path, target_is_directory=True)
+    (tmp_path / "a_link").symlink_to(tmp_path / "src", target_is_directory=True)
+    outside = tmp_path.parent / (tmp_path.name + "-outside")
+    outside.mkdir()
+    (outside / "leak.py").write_text("x", encoding="utf-8")
+    (tmp_path / "src" / "out").symlink_to(outside, target_is_directory=True)
+    # hardlink: mismo contenido bajo dos nombres
+    os.link(tmp_path / "src" / "app.py", tmp_path / "src" / "app_link.py")
+
+    rels = sorted(rel for rel, _ in walk_files(tmp_path))
+    # Se reporta la ruta real aunque el alias (a_link) ordene antes
+    assert rels == ["README.md", "src/app.py", "src/data.JSON", "tests/test_app.py"]
+
+    with_modules = sorted(rel for rel, _ in walk_files(tmp_path, exclude=()))
+    assert "node_modules/pkg/index.js" in with_modules
+    assert ".git/HEAD" in with_modules
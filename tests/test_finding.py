@@ -0,0 +1,37 @@
+from __future__ import annotations
+import json
+
+from auditor.cache import finding_from_record, finding_to_record
+from auditor.core import Finding, Severity
+
+
+def _copy(s: str) -> str:
+    # Cadena igual pero de otro objeto (como la que sale de json.loads)
+    return json.loads(json.dumps(s))
+
+
+def test_finding_is_slotted():
+    f = Finding(rule_id="R006", message="m", severity=Severity.HIGH)
+    assert not hasattr(f, "__dict__")
+
+
+def test_finding_interns_repeated_strings():
+    a = Finding(rule_id=_copy("R006"), message=_copy("Posible secreto"), severity=Severity.HIGH,
+                path=_copy("src/app.py"), meta={"line": 1, "pattern": _copy("TOKEN")})
+    b = Finding(rule_id=_copy("R006"), message=_copy("Posible secreto"), severity=Severity.HIGH,
+                path=_copy("src/app.py"), meta={"line": 2, "pattern": _copy("TOKEN")})
+    assert a.rule_id is b.rule_id
+    assert a.message is b.message
+    assert a.path is b.path
+    assert a.meta["pattern"] is b.meta["pattern"]
+
+
+def test_finding_record_roundtrip_unchanged():
+    f = Finding(rule_id="R006", message="m", severity=Severity.HIGH, path="a.py",
+                meta={"line": 3, "snippet": "token = 'x'", "pattern": "TOKEN"})
+    record = finding_to_record(f)
+    assert record == {
+        "rule_id": "R006", "message": "m", "severity": "High", "path": "a.py",
+        "meta": {"line": 3, "snippet": "token = 'x'", "pattern": "TOKEN"},
+    }
+    assert finding_from_record(record) == f
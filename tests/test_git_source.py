@@ -0,0 +1,47 @@
+from __future__ import annotations
+import json
+from pathlib import Path
+import importlib
+
+from auditor.core import RuleContext
+
+
+def _populate(root: Path, git) -> None:
+    (root / ".gitignore").write_text(".env\nbuild/\n", encoding="utf-8")
+    (root / "app.py").write_text("print('ok')\n", encoding="utf-8")
+    (root / "build").mkdir()
+    (root / "build" / "gen.py").write_text("token = 'x'\n", encoding="utf-8")
+    (root / "new.py").write_text("x = 1\n", encoding="utf-8")
+    git("add", ".gitignore", "app.py")
+    git("commit", "-q", "-m", "init")
+
+
+def test_git_source_lists_tracked_files(git_repo):
+    root, git = git_repo
+    _populate(root, git)
+
+    ctx = RuleContext(str(root), source="git")
+    assert [e.rel for e in ctx.files] == [".gitignore", "app.py"]
+
+    ctx = RuleContext(str(root), source="git", include_untracked=True)
+    assert [e.rel for e in ctx.files] == [".gitignore", "app.py", "new.py"]
+
+
+def test_cli_git_source_honours_gitignore(git_repo, capsys):
+    root, git = git_repo
+    _populate(root, git)
+    cli = importlib.import_module("auditor.cli")
+
+    cli.main(["--repo", str(root)])
+    fs_ids = {f["rule_id"] for f in json.loads(capsys.readouterr().out)["findings"]}
+    cli.main(["--repo", str(root), "--source", "git"])
+    git_ids = {f["rule_id"] for f in json.loads(capsys.readouterr().out)["findings"]}
+
+    assert "R006" in fs_ids          # build/gen.py se escanea recorriendo el árbol
+    assert "R006" not in git_ids     # pero está ignorado por git
+
+
+def test_cli_git_source_requires_repo(tmp_path: Path, capsys):
+    cli = importlib.import_module("auditor.cli")
+    assert cli.main(["--repo", str(tmp_path), "--source", "git"]) == 1
+    assert "git" in capsys.readouterr().err
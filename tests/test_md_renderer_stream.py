@@ -0,0 +1,102 @@
+from __future__ import annotations
+from pathlib import Path
+import io
+import json
+import random
+
+import pytest
+
+from auditor import report as report_module
+from auditor.reporting import md_renderer
+
+
+def _report(n: int, summary_last: bool = False) -> dict:
+    rng = random.Random(n)
+    findings = [
+        {
+            "rule_id": f"R00{rng.randint(1, 6)}",
+            "message": f"mensaje {i} ñ",
+            "severity": rng.choice(["High", "Medium", "Low", "Info"]),
+            "path": rng.choice([f"src/m{rng.randint(0, 9)}.py", None]),
+            "meta": {"line": rng.choice([None, rng.randint(1, 50)])},
+        }
+        for i in range(n)
+    ]
+    summary = {"total": n}
+    if summary_last:
+        return {"repo_root": "/r", "findings": findings, "summary": summary}
+    return {"repo_root": "/r", "summary": summary, "findings": findings, "skipped": {"total": 0}}
+
+
+def _render_stream(path: Path, budget: int) -> str:
+    out = io.StringIO()
+    md_renderer.render_markdown_stream(str(path), out, memory_budget=budget)
+    return out.getvalue()
+
+
+@pytest.mark.parametrize("n, summary_last", [(0, False), (1, True), (300, False), (300, True)])
+def test_stream_matches_generate_markdown(tmp_path: Path, monkeypatch, n: int, summary_last: bool):
+    report = _report(n, summary_last)
+    path = tmp_path / "report.json"
+    path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    expected = md_renderer.generate_markdown(report)
+
+    # Bloques de lectura diminutos y volcado a disco cada pocas filas
+    monkeypatch.setattr(report_module, "CHUNK_SIZE", 7)
+    assert _render_stream(path, budget=1000) == expected
+    assert _render_stream(path, budget=10**9) == expected
+
+
+def test_iter_report_findings_rejects_truncated_json(tmp_path: Path):
+    path = tmp_path / "report.json"
+    path.write_text('{"findings": [{"rule_id": "R001"}, {"rule_id"', encoding="utf-8")
+    with open(path, encoding="utf-8") as fh, pytest.raises(json.JSONDecodeError):
+        list(md_renderer.iter_report_findings(fh))
+
+
+def test_main_stream_flag(tmp_path: Path):
+    path = tmp_path / "report.json"
+    path.write_text(json.dumps(_report(20)), encoding="utf-8")
+    out = tmp_path / "report.md"
+    assert md_renderer.main(["--input", str(path), "--output", str(out), "--stream"]) == 0
+    streamed = out.read_text(encoding="utf-8")
+    assert md_renderer.main(["--input", str(path), "--output", str(out)]) == 0
+    assert out.read_text(encoding="utf-8") == streamed
+
+
+def test_pages_split_rows_and_link_from_index(tmp_path: Path):
+    report = _report(300)
+    path = tmp_path / "report.json"
+    path.write_text(json.dumps(report), encoding="utf-8")
+    index = tmp_path / "out" / "report.md"
+    index.parent.mkdir()
+
+    pages = md_renderer.render_markdown_pages(str(path), str(index), page_size=40, memory_budget=2000)
+    full = md_renderer.generate_markdown(report)
+    expected_rows = [line for line in full.split("\n") if line.startswith("| R0")]
+
+    assert [Path(p).name for p in pages][:2] == ["report-001.md", "report-002.md"]
+    rows = []
+    for p in pages:
+        text = Path(p).read_text(encoding="utf-8")
+        page_rows = [line for line in text.split("\n") if line.startswith("| R0")]
+        assert 0 < len(page_rows) <= 40
+        assert "[Índice](report.md)" in text
+        rows.extend(page_rows)
+    # Mismas filas y mismo orden que el reporte completo
+    assert rows == expected_rows
+
+    index_text = index.read_text(encoding="utf-8")
+    assert index_text.split("## Páginas")[0] == full.split("## High Severidad")[0]
+    assert index_text.count("](report-") == len(pages)
+    assert "[Siguiente](report-002.md)" in Path(pages[0]).read_text(encoding="utf-8")
+    assert "Siguiente" not in Path(pages[-1]).read_text(encoding="utf-8")
+
+
+def test_pages_without_findings(tmp_path: Path):
+    path = tmp_path / "report.json"
+    path.write_text(json.dumps(_report(0)), encoding="utf-8")
+    index = tmp_path / "report.md"
+    assert md_renderer.main(["--input", str(path), "--output", str(index), "--page-size", "10"]) == 0
+    assert index.read_text(encoding="utf-8") == md_renderer.generate_markdown(_report(0))
+    assert not list(tmp_path.glob("report-*.md"))
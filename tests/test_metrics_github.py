@@ -0,0 +1,165 @@
+from __future__ import annotations
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+import json
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("requests")
+
+from auditor.metrics import metrics  # noqa: E402
+
+DELAY = 0.2
+REPO = "acme/app"
+
+
+class _StubGitHub(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive: permite ver si se reutilizan conexiones
+    routes = {
+        f"/repos/{REPO}/pulls/7": {
+            "number": 7,
+            "created_at": "2026-01-01T00:00:00Z",
+            "merged_at": "2026-01-02T00:00:00Z",
+            "head": {"sha": "abc"},
+        },
+        f"/repos/{REPO}/pulls/7/reviews": [
+            {"state": "APPROVED", "submitted_at": "2026-01-01T06:00:00Z"},
+        ],
+        f"/repos/{REPO}/actions/workflows/compliance.yml/runs": {
+            "workflow_runs": [
+                {"id": 2, "name": "c", "conclusion": "success", "head_sha": "abc",
+                 "created_at": "2026-01-01T03:00:00Z", "updated_at": "2026-01-01T03:10:00Z"},
+                {"id": 1, "name": "c", "conclusion": "failure", "head_sha": "abc",
+                 "created_at": "2026-01-01T01:00:00Z", "updated_at": "2026-01-01T01:10:00Z"},
+                {"id": 3, "name": "c", "conclusion": "failure", "head_sha": "zzz",
+                 "created_at": "2026-01-01T00:30:00Z", "updated_at": "2026-01-01T00:40:00Z"},
+            ]
+        },
+    }
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.connections.add(self.client_address)
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        time.sleep(DELAY)
+        with server.lock:
+            server.in_flight -= 1
+        assert self.headers["Authorization"] == "Bearer t0k"
+        body = json.dumps(self.routes.get(self.path.split("?")[0], {})).encode()
+        self.send_response(200 if self.path.split("?")[0] in self.routes else 404)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _PagedRuns(BaseHTTPRequestHandler):
+    """Runs de un workflow con filtro head_sha y paginación por header Link, como la API."""
+    protocol_version = "HTTP/1.1"
+    runs = [
+        {"id": i, "name": "c", "conclusion": "success" if i % 2 else "failure",
+         "head_sha": "abc" if i % 3 else "other",
+         "created_at": f"2026-01-01T00:{i % 60:02d}:00Z",
+         "updated_at": f"2026-01-01T01:{i % 60:02d}:00Z"}
+        for i in range(300)
+    ]
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        self.server.requests.append(query)
+        matching = [r for r in self.runs if r["head_sha"] == query.get("head_sha", r["head_sha"])]
+        per_page, page = int(query.get("per_page", 30)), int(query.get("page", 1))
+        body = json.dumps({
+            "total_count": len(matching),
+            "workflow_runs": matching[(page - 1) * per_page:page * per_page],
+        }).encode()
+        self.send_response(200)
+        if page * per_page < len(matching):
+            base = f"http://{self.headers['Host']}{url.path}"
+            next_query = urlencode({**query, "page": page + 1})
+            self.send_header("Link", f'<{base}?{next_query}>; rel="next"')
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve(handler, monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.lock = threading.Lock()
+    server.connections = set()
+    server.requests = []
+    server.in_flight = server.max_in_flight = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("GITHUB_API_URL", f"http://127.0.0.1:{server.server_address[1]}/")
+    monkeypatch.setenv("GITHUB_TOKEN", "t0k")
+    monkeypatch.setattr(metrics, "_SESSION", None)
+    return server
+
+
+@pytest.fixture
+def github(monkeypatch):
+    server = _serve(_StubGitHub, monkeypatch)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def paged_runs(monkeypatch):
+    server = _serve(_PagedRuns, monkeypatch)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_metrics_against_stub_server(github):
+    m = metrics.compute_metrics_for_pr(REPO, 7, "compliance.yml", {"findings": []})
+
+    assert m.cycle_time_hours == 24.0
+    assert m.approval_time_hours == 6.0
+    assert m.remediation_time_hours == 2.0
+    # Reviews en paralelo con PR -> runs
+    assert github.max_in_flight == 2
+
+
+def test_connections_are_reused(github):
+    for _ in range(3):
+        metrics.compute_metrics_for_pr(REPO, 7, "compliance.yml", {"findings": []})
+    # 9 pedidos por a lo sumo tantas conexiones como llamadas concurrentes
+    assert len(github.connections) <= 2
+
+
+def test_workflow_runs_follow_pagination(paged_runs):
+    runs = metrics.get_workflow_runs_for_pr(REPO, "compliance.yml", "abc", per_page=50)
+
+    assert len(runs) == 200  # más allá de la primera página
+    assert {r.head_sha for r in runs} == {"abc"}
+    assert runs == sorted(runs, key=lambda r: r.created_at)
+    assert [q.get("page", "1") for q in paged_runs.requests] == ["1", "2", "3", "4"]
+    assert all(q["head_sha"] == "abc" for q in paged_runs.requests)
+
+
+def test_workflow_runs_stop_early(paged_runs):
+    runs = metrics.iter_workflow_runs(REPO, "compliance.yml", "abc", per_page=50)
+    first = [next(runs) for _ in range(50)]
+    assert len(paged_runs.requests) == 1
+    next(runs)
+    assert len(paged_runs.requests) == 2
+    runs.close()
+
+    latest = metrics.get_workflow_runs_for_pr(REPO, "compliance.yml", "abc", per_page=50, limit=10)
+    assert [r.id for r in latest] == sorted(r.id for r in first[:10])
+    assert len(paged_runs.requests) == 3
@@ -0,0 +1,86 @@
+from __future__ import annotations
+from pathlib import Path
+import importlib
+import json
+import shutil
+
+from auditor.core import RuleContext, run_rules
+from auditor.monorepo import Subproject, discover, iter_monorepo
+from auditor.rules.gitignore_rule import GitignoreEnvRule
+from auditor.rules.makefile_rule import MakefileRule
+
+
+def _monorepo(good_repo: Path) -> Path:
+    (good_repo / "coverage.xml").write_text("<coverage line-rate='0.95'/>", encoding="utf-8")
+    api = good_repo / "services" / "api"
+    api.mkdir(parents=True)
+    (api / "pyproject.toml").write_text("[project]\n", encoding="utf-8")
+    (api / "Makefile").write_text("lint:\n", encoding="utf-8")
+    web = good_repo / "services" / "web"
+    web.mkdir(parents=True)
+    (web / "package.json").write_text("{}", encoding="utf-8")
+    for name in (".gitignore", "LICENSE", "coverage.xml"):
+        shutil.copy(good_repo / name, web / name)
+    shutil.copy(good_repo / "Makefile", web / "Makefile")
+    vendored = good_repo / "node_modules" / "lib"
+    vendored.mkdir(parents=True)
+    (vendored / "package.json").write_text("{}", encoding="utf-8")
+    return good_repo
+
+
+def test_discover_subprojects_by_markers(good_repo: Path):
+    root = _monorepo(good_repo)
+    assert discover(RuleContext(str(root))) == [
+        Subproject("services/api", ("Makefile", "pyproject.toml")),
+        Subproject("services/web", ("Makefile", "package.json")),
+    ]
+
+
+def test_root_rules_run_per_subproject(good_repo: Path):
+    root = _monorepo(good_repo)
+    ctx = RuleContext(str(root))
+    rules = [GitignoreEnvRule(), MakefileRule()]
+    findings = list(iter_monorepo(ctx, rules, discover(ctx), jobs=4))
+
+    assert run_rules(RuleContext(str(root)), rules) == []
+    assert {(f.rule_id, f.meta["subproject"]) for f in findings} == {
+        ("R001", "services/api"), ("R003", "services/api"),
+    }
+
+
+def test_cli_monorepo_groups_report(good_repo: Path, tmp_path: Path, capsys):
+    root = _monorepo(good_repo)
+    cli = importlib.import_module("auditor.cli")
+    argv = ["--repo", str(root), "--monorepo", "--jobs", "4", "--cache-dir", str(tmp_path / "c")]
+    for _ in range(2):  # la segunda corrida sale de la caché, sin mezclar subproyectos
+        cli.main(argv)
+        data = json.loads(capsys.readouterr().out)
+        groups = {g["path"]: g["summary"]["total"] for g in data["subprojects"]}
+        assert groups == {".": 0, "services/api": 4, "services/web": 0}
+        assert {f["meta"]["subproject"] for f in data["findings"]} == {"services/api"}
+
+
+def test_monorepo_since_runs_only_changed_subprojects(git_repo, good_repo: Path):
+    root, git = git_repo
+    shutil.copytree(_monorepo(good_repo), root, dirs_exist_ok=True)
+    git("add", ".")
+    git("commit", "-qm", "base")
+    git("branch", "base")
+    (root / "services" / "web" / "Makefile").write_text("lint:\n", encoding="utf-8")
+
+    ctx = RuleContext(str(root), since="base")
+    findings = list(iter_monorepo(ctx, [GitignoreEnvRule(), MakefileRule()], discover(ctx)))
+    assert [(f.rule_id, f.meta["subproject"]) for f in findings] == [("R003", "services/web")]
+
+
+def test_cli_monorepo_counts_content_findings_where_the_file_lives(good_repo: Path, capsys):
+    root = _monorepo(good_repo)
+    (root / "services" / "api" / "app.py").write_text("TOKEN = 'abc'\n", encoding="utf-8")
+    cli = importlib.import_module("auditor.cli")
+    cli.main(["--repo", str(root), "--monorepo", "--rules", "R006,R003"])
+    data = json.loads(capsys.readouterr().out)
+
+    groups = {g["path"]: g["summary"]["total"] for g in data["subprojects"]}
+    assert groups == {".": 0, "services/api": 2, "services/web": 0}
+    (secret,) = [f for f in data["findings"] if f["rule_id"] == "R006"]
+    assert secret["meta"]["subproject"] == "services/api"
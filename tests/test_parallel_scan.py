@@ -0,0 +1,43 @@
+from __future__ import annotations
+from pathlib import Path
+
+from auditor.core import RuleContext
+from auditor.rules.secrets_rule import SecretsRule
+from auditor.utils.fs import FileEntry
+from auditor.utils.parallel import shard_by_size
+
+
+def _entry(rel: str, size: int) -> FileEntry:
+    return FileEntry(path=Path(rel), rel=rel, size=size, mtime_ns=0, ext=".py", ignored=False)
+
+
+def test_shard_by_size_is_balanced_and_contiguous():
+    entries = [_entry(f"f{i:02d}.py", 100) for i in range(20)]
+    shards = shard_by_size(entries, 4)
+    assert len(shards) == 4
+    assert [len(s) for s in shards] == [5, 5, 5, 5]
+    # concatenar los shards reproduce el orden original
+    assert [e for s in shards for e in s] == entries
+
+
+def test_shard_by_size_handles_big_file():
+    entries = [_entry("big.py", 10_000)] + [_entry(f"s{i}.py", 10) for i in range(9)]
+    shards = shard_by_size(entries, 3)
+    assert shards[0] == [entries[0]]
+    assert sum(len(s) for s in shards) == len(entries)
+
+
+def test_secrets_parallel_matches_serial(tmp_path: Path, monkeypatch):
+    for i in range(12):
+        body = "print('ok')\n" * i + f"token = 'sk_live_{i}'\n"
+        (tmp_path / f"m{i:02d}.py").write_text(body, encoding="utf-8")
+    monkeypatch.setattr(SecretsRule, "PARALLEL_MIN_FILES", 2)
+
+    serial = SecretsRule().check(RuleContext(str(tmp_path)))
+    parallel = SecretsRule().check(RuleContext(str(tmp_path), jobs=3))
+
+    assert len(serial) == 12
+    assert parallel == serial
+    assert [(f.path, f.meta["line"]) for f in parallel] == sorted(
+        (f.path, f.meta["line"]) for f in parallel
+    )
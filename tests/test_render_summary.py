@@ -0,0 +1,23 @@
+from __future__ import annotations
+from pathlib import Path
+import json
+
+from tools import render_summary
+
+
+def test_top_findings_keep_severity_then_report_order(tmp_path: Path):
+    findings = [
+        {"rule_id": f"R{i:03d}", "severity": sev, "message": f"m{i}", "path": f"f{i}.py"}
+        for i, sev in enumerate(["Low", "High", "Medium", "High", "Low", "High"])
+    ]
+    report = {"summary": {"total": 6, "by_severity": {"High": 3, "Medium": 1, "Low": 2}},
+              "findings": findings}
+    src = tmp_path / "report.json"
+    src.write_text(json.dumps(report), encoding="utf-8")
+    out = tmp_path / "summary.md"
+
+    assert render_summary.main(["--input", str(src), "--output", str(out), "--top", "4"]) == 0
+    listed = [line for line in out.read_text(encoding="utf-8").splitlines() if line.startswith("- **[")]
+    assert [line.split("**")[1] for line in listed] == [
+        "[High] R001", "[High] R003", "[High] R005", "[Medium] R002",
+    ]
@@ -0,0 +1,116 @@
+from __future__ import annotations
+from pathlib import Path
+import json
+import os
+
+from auditor import cli
+from auditor.core import Severity
+from auditor.report import Report, load_report
+
+
+def _data() -> dict:
+    findings = [
+        {"rule_id": "R002", "message": "a", "severity": "Low", "path": "src/a.py", "meta": {"line": 3}},
+        {"rule_id": "R001", "message": "b", "severity": "High", "path": ".gitignore"},
+        {"rule_id": "X", "message": "c", "severity": "Info", "path": None},
+        {"rule_id": "R002", "message": "d", "severity": "high", "path": "src/a.py"},
+        {"rule_id": "R005", "message": "e", "severity": "Medium", "path": None},
+    ]
+    return {"repo_root": "/r", "findings": findings}
+
+
+def test_views_are_grouped_and_memoized():
+    report = Report.from_dict(_data())
+
+    assert [f.message for f in report.findings] == ["a", "b", "d", "e"]
+    assert report.unrated == 1
+    assert [f.message for f in report.by_severity[Severity.HIGH]] == ["b", "d"]
+    assert list(report.by_rule) == ["R002", "R001", "R005"]
+    assert [f.message for f in report.by_path["src/a.py"]] == ["a", "d"]
+    assert report.by_severity is report.by_severity
+    assert report.by_rule["R002"][0] is report.findings[0]
+    assert [f.message for f in report.top(3)] == ["b", "d", "e"]
+
+
+def test_summary_from_header_or_counted():
+    counted = Report.from_dict(_data())
+    assert counted.summary == {"total": 5, "by_severity": {"High": 2, "Medium": 1, "Low": 1}}
+
+    header = {**_data(), "summary": {"total": 9, "by_severity": {"High": 7}}}
+    report = Report.from_dict(header)
+    assert report.summary == {"total": 9, "by_severity": {"High": 7, "Medium": 0, "Low": 0}}
+    # El resumen del encabezado no obliga a parsear los findings
+    assert "_parsed" not in report.__dict__
+
+
+def test_binary_report_parses_findings_on_first_access(bad_repo: Path, tmp_path: Path):
+    out = tmp_path / "r.bin"
+    assert cli.main(["--repo", str(bad_repo), "--output", str(out), "--format", "binary"]) == 0
+
+    report = Report.load(out)
+    assert report.summary["total"] == len(report.records) > 0
+    assert "_parsed" not in report.__dict__
+    assert {f.rule_id for f in report.findings} >= {"R001", "R003"}
+
+
+def test_load_report_reuses_unchanged_file(tmp_path: Path):
+    path = tmp_path / "report.json"
+    path.write_text(json.dumps(_data()), encoding="utf-8")
+    first = load_report(path)
+    assert load_report(str(path)) is first
+
+    path.write_text(json.dumps({"findings": []}), encoding="utf-8")
+    os.utime(path, ns=(0, 0))
+    second = load_report(path)
+    assert second is not first
+    assert second.findings == []
+
+
+def test_json_load_reads_only_the_head(tmp_path: Path):
+    path = tmp_path / "report.json"
+    data = _data()
+    summary = {"total": 5, "by_severity": {"High": 2, "Medium": 1, "Low": 1}}
+    doc = {"summary": summary, "findings": data["findings"], "repo_root": "/r"}
+    path.write_text(json.dumps(doc), encoding="utf-8")
+    report = Report.load(path)
+    assert report.head == {"summary": summary}
+    assert report.summary["total"] == 5
+    assert not isinstance(report.records, list)
+    assert "_parsed" not in report.__dict__
+    # El resto del encabezado (después de los findings) se lee al pedirlo
+    assert report.repo_root == "/r"
+    assert [f.message for f in report.findings] == ["a", "b", "d", "e"]
+
+
+def test_json_load_falls_back_when_summary_follows_findings(tmp_path: Path):
+    path = tmp_path / "report.json"
+    path.write_text(json.dumps({**_data(), "summary": {"total": 5}}), encoding="utf-8")
+    report = Report.load(path)
+    assert isinstance(report.records, list)
+    assert report.summary["total"] == 5
+    assert report.header["repo_root"] == "/r"
+
+
+def test_top_does_not_group_findings(tmp_path: Path):
+    path = tmp_path / "report.json"
+    path.write_text(json.dumps({"summary": {"total": 5}, **_data()}), encoding="utf-8")
+    report = Report.load(path)
+    assert [f.message for f in report.top(2)] == ["b", "d"]
+    assert "by_severity" not in report.__dict__
+    assert "_parsed" not in report.__dict__
+
+
+def test_load_report_closes_evicted_binary_reports(bad_repo: Path, tmp_path: Path, monkeypatch):
+    from auditor import report as report_module
+    monkeypatch.setattr(report_module, "_LOADED", {})
+    monkeypatch.setattr(report_module, "_MAX_LOADED", 1)
+    out = tmp_path / "r.bin"
+    assert cli.main(["--repo", str(bad_repo), "--output", str(out), "--format", "binary"]) == 0
+
+    first = load_report(out)
+    assert first.records[0]
+    assert first.records._buf is not None
+    other = tmp_path / "other.json"
+    other.write_text(json.dumps({"findings": []}), encoding="utf-8")
+    load_report(other)
+    assert first.records._buf is None
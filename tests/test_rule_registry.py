@@ -0,0 +1,88 @@
+from __future__ import annotations
+from pathlib import Path
+import importlib
+import json
+import subprocess
+import sys
+
+import pytest
+
+from auditor.rules import RULES, load_rule, select_rules
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _loaded_after(code: str) -> set[str]:
+    # Intérprete nuevo: sys.modules del proceso de tests ya tiene todo importado
+    out = subprocess.run(
+        [sys.executable, "-c", f"{code}\nimport sys, json; print(json.dumps(sorted(sys.modules)))"],
+        cwd=REPO_ROOT, check=True, capture_output=True, text=True,
+    ).stdout
+    return set(json.loads(out))
+
+
+def test_registry_ids_match_rule_classes():
+    for rule_id in RULES:
+        assert load_rule(rule_id).id == rule_id
+
+
+def test_select_rules_only_and_skip():
+    assert [r.id for r in select_rules(["R006", "R001"])] == ["R001", "R006"]
+    assert [r.id for r in select_rules(skip=["R006", "license.present"])] == [
+        "R001", "R002", "R003", "R005", "R007",
+    ]
+    with pytest.raises(KeyError):
+        select_rules(["R999"])
+
+
+def test_package_attribute_access_still_works():
+    from auditor.rules import GitignoreEnvRule, SecretsRule
+    assert GitignoreEnvRule.id == "R001"
+    assert SecretsRule.id == "R006"
+    with pytest.raises(ImportError):
+        exec("from auditor.rules import NoSuchRule")
+
+
+def test_cli_import_does_not_load_rule_modules():
+    loaded = _loaded_after("import auditor.cli")
+    assert not {f"auditor.rules.{m}" for m, _ in RULES.values()} & loaded
+    assert "concurrent.futures" not in loaded
+    assert "subprocess" not in loaded
+
+
+def test_secrets_rule_run_defers_cache_and_parallel(good_repo: Path):
+    import os
+    loaded = _loaded_after(
+        "import auditor.cli\n"
+        f"auditor.cli.main(['--repo', {str(good_repo)!r}, '--rules', 'R006', '--output', {os.devnull!r}])"
+    )
+    assert "auditor.rules.secrets_rule" in loaded
+    assert "auditor.cache" not in loaded
+    assert "auditor.utils.parallel" not in loaded
+    assert "concurrent.futures" not in loaded
+
+
+def test_metrics_import_defers_optional_dependencies():
+    loaded = _loaded_after("import auditor.metrics.metrics")
+    assert "requests" not in loaded
+    assert "dotenv" not in loaded
+
+
+def test_cli_rules_and_skip_rules(bad_repo: Path, capsys):
+    cli = importlib.import_module("auditor.cli")
+    cli.main(["--repo", str(bad_repo), "--rules", "R001,R003"])
+    data = json.loads(capsys.readouterr().out)
+    assert {f["rule_id"] for f in data["findings"]} <= {"R001", "R003"}
+    assert data["findings"]
+
+    cli.main(["--repo", str(bad_repo), "--skip-rules", "R006"])
+    data = json.loads(capsys.readouterr().out)
+    assert "R006" not in {f["rule_id"] for f in data["findings"]}
+
+
+def test_cli_rejects_unknown_rule(capsys):
+    cli = importlib.import_module("auditor.cli")
+    with pytest.raises(SystemExit) as exc:
+        cli.main(["--rules", "R001,R999"])
+    assert exc.value.code == 2
+    assert "R999" in capsys.readouterr().err
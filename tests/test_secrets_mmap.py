@@ -0,0 +1,68 @@
+from __future__ import annotations
+from pathlib import Path
+
+import pytest
+
+from auditor.core import RuleContext
+from auditor.rules.secrets_rule import SecretsRule, _matcher
+
+
+def test_secrets_line_numbers_and_snippets(tmp_path: Path):
+    (tmp_path / "app.py").write_bytes(
+        b"import os\r\n"
+        b"x = 1\r\n"
+        b"API_KEY = 'abc'\r\n"
+        b"key = os.getenv('K')\r\n"
+        b"\xff\xfe basura\n"
+        b"  password = 'hunter2'"
+    )
+    findings = SecretsRule().check(RuleContext(str(tmp_path)))
+    assert [(f.meta["line"], f.meta["snippet"]) for f in findings] == [
+        (3, "API_KEY = 'abc'"),
+        (6, "password = 'hunter2'"),
+    ]
+
+
+def test_secrets_match_does_not_span_lines(tmp_path: Path):
+    # "TOKEN\n=" coincide en bytes (\s incluye \n) pero no dentro de una línea
+    (tmp_path / "app.py").write_text("TOKEN\n= 'x'\nok = 1\n", encoding="utf-8")
+    assert SecretsRule().check(RuleContext(str(tmp_path))) == []
+
+
+def _baseline(path: Path, rule: SecretsRule) -> list[tuple[int, str]]:
+    # Semántica de referencia: texto decodificado, línea por línea
+    matcher = _matcher(tuple(rule.SECRET_PATTERNS))
+    out = []
+    text = path.read_text(encoding="utf-8", errors="ignore")
+    for n, line in enumerate(text.splitlines(), 1):
+        pattern = matcher.search(line)
+        if pattern and "os.getenv" not in line and "os.environ" not in line:
+            out.append((n, pattern))
+    return out
+
+
+@pytest.mark.parametrize("content", [
+    "x = 1\nTOKEN = 'abc'\n",               # espacio no separable (código pegado)
+    "a = 1\rb = 2\rAPI_KEY = 'x'\r",              # fin de línea \r solo (Mac clásico)
+    "a = 1\r\nTOKEN = 'x'\r\nc = 3\r\n",
+    "a TOKEN = 'x'\nñ = 1\fPASSWORD = 'y'\n",
+    "TOKEN\r= 'x'\n",
+])
+def test_secrets_match_line_by_line_semantics(tmp_path: Path, content: str):
+    path = tmp_path / "app.py"
+    path.write_bytes(content.encode("utf-8"))
+    rule = SecretsRule()
+    found = [(f.meta["line"], f.meta["pattern"]) for f in rule.check(RuleContext(str(tmp_path)))]
+    assert found == _baseline(path, rule)
+
+
+def test_secrets_anchored_pattern_with_crlf(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(SecretsRule, "SECRET_PATTERNS", [r"TOKEN = 'x'$"])
+    (tmp_path / "app.py").write_bytes(b"TOKEN = 'x'\r\nok = 1\r\n")
+    assert [f.meta["line"] for f in SecretsRule().check(RuleContext(str(tmp_path)))] == [1]
+
+
+def test_secrets_non_ascii_pattern(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(SecretsRule, "SECRET_PATTERNS", [r"(?i)CONTRASEÑA\s*="])
+    (tmp_path / "app.py").write_text("x = 1\ncontraseña = 'x'\n", encoding="utf-8")
+    assert [f.meta["line"] for f in SecretsRule().check(RuleContext(str(tmp_path)))] == [2]
@@ -0,0 +1,107 @@
+from __future__ import annotations
+import importlib
+import json
+from pathlib import Path
+import textwrap
+
+from auditor.core import RuleContext, run_rules
+from auditor.rules.config_rule import ConfigViaEnvRule
+from auditor.rules.makefile_rule import MakefileRule
+from auditor.rules.secrets_rule import SecretsRule
+
+
+def _base(root: Path, git) -> None:
+    (root / ".gitignore").write_text(".env\n", encoding="utf-8")
+    (root / "LICENSE").write_text("MIT\n", encoding="utf-8")
+    (root / "Makefile").write_text("lint:\n", encoding="utf-8")
+    (root / "old.py").write_text("token = 'viejo'\n", encoding="utf-8")
+    (root / "clean.py").write_text("print('ok')\n", encoding="utf-8")
+    git("add", ".")
+    git("commit", "-q", "-m", "base")
+    git("branch", "base")
+
+
+def test_since_scans_only_changed_files(git_repo):
+    root, git = git_repo
+    _base(root, git)
+    (root / "clean.py").write_text("password = 'nuevo'\n", encoding="utf-8")
+    git("commit", "-qam", "cambio")
+
+    ctx = RuleContext(str(root), since="base")
+    assert ctx.changed == {"clean.py"}
+    findings = run_rules(ctx, [SecretsRule(), MakefileRule()])
+    # old.py no se re-escanea y el Makefile no cambió: R003 no corre
+    assert [(f.rule_id, f.path) for f in findings] == [("R006", "clean.py")]
+
+
+def test_since_scans_untracked_new_files(git_repo):
+    root, git = git_repo
+    _base(root, git)
+    (root / "new.py").write_text("TOKEN = 'abc'\n", encoding="utf-8")  # nunca se hizo git add
+    (root / ".env").write_text("TOKEN = 'ignorado'\n", encoding="utf-8")
+
+    ctx = RuleContext(str(root), since="base")
+    assert ctx.changed == {"new.py"}
+    findings = run_rules(ctx, [SecretsRule()])
+    assert [(f.rule_id, f.path) for f in findings] == [("R006", "new.py")]
+
+
+def test_since_runs_root_rule_when_input_changed(git_repo):
+    root, git = git_repo
+    _base(root, git)
+    (root / "Makefile").write_text(textwrap.dedent("""\
+    run:
+    lint:
+    """), encoding="utf-8")   # sin commitear: también cuenta
+
+    findings = run_rules(RuleContext(str(root), since="base"), [MakefileRule()])
+    assert findings and findings[0].meta["missing"] == ["apply", "plan", "test"]
+
+
+def test_cli_since_bad_revision(git_repo, capsys):
+    root, git = git_repo
+    _base(root, git)
+    cli = importlib.import_module("auditor.cli")
+    assert cli.main(["--repo", str(root), "--since", "no-such-rev"]) == 1
+    assert "no-such-rev" in capsys.readouterr().err
+
+
+def test_cli_since_empty_diff(git_repo, capsys):
+    root, git = git_repo
+    _base(root, git)
+    cli = importlib.import_module("auditor.cli")
+    assert cli.main(["--repo", str(root), "--since", "base"]) == 0
+    assert json.loads(capsys.readouterr().out)["summary"]["total"] == 0
+
+
+def test_since_config_rule_sees_unchanged_env_usage(git_repo):
+    root, git = git_repo
+    _base(root, git)
+    (root / "app.py").write_text("import os\nDB = os.environ['DB']\n", encoding="utf-8")
+    (root / "config.json").write_text("{}\n", encoding="utf-8")
+    git("add", ".")
+    git("commit", "-qm", "app")
+    git("branch", "-f", "base")
+    (root / "other.py").write_text("print('otro')\n", encoding="utf-8")
+    git("add", ".")
+    git("commit", "-qm", "otro")
+
+    assert run_rules(RuleContext(str(root)), [ConfigViaEnvRule()]) == []
+    # Solo cambió other.py, pero app.py (sin cambios) ya usa os.environ
+    assert run_rules(RuleContext(str(root), since="base"), [ConfigViaEnvRule()]) == []
+
+    (root / "app.py").write_text("DB = 'fijo'\n", encoding="utf-8")
+    findings = run_rules(RuleContext(str(root), since="base"), [ConfigViaEnvRule()])
+    assert [f.rule_id for f in findings] == ["R002"]
+
+
+def test_since_config_rule_skipped_without_relevant_changes(git_repo):
+    root, git = git_repo
+    _base(root, git)
+    (root / "config.json").write_text("{}\n", encoding="utf-8")
+    git("add", ".")
+    git("commit", "-qm", "config")
+    git("branch", "-f", "base")
+    (root / "README.md").write_text("hola\n", encoding="utf-8")
+
+    assert run_rules(RuleContext(str(root), since="base"), [ConfigViaEnvRule()]) == []
@@ -1,7 +1,7 @@
 from __future__ import annotations
 from pathlib import Path
 
-from auditor.utils.fs import read_lines, ensure_paths_exist
+from auditor.utils.fs import LineIndex, mapped, read_lines, ensure_paths_exist
 
 
 def test_read_lines_missing(tmp_path: Path) -> None:
@@ -27,3 +27,21 @@ def test_ensure_paths_exist(tmp_path: Path) -> None:
         "b.txt": False,
         "dir/x": False,
     }
+
+
+def test_line_index_resolves_offsets_lazily() -> None:
+    buf = b"uno\ndos\n\ncuatro"
+    lines = LineIndex(buf)
+    assert lines.line_of(0) == 1
+    assert lines.line_of(3) == 1          # el propio salto de línea
+    assert lines.line_of(4) == 2
+    assert lines.line_of(len(buf) - 1) == 4
+    assert lines.bounds(5) == (4, 7)
+    assert lines.bounds(len(buf) - 1) == (9, len(buf))
+
+
+def test_mapped_empty_file(tmp_path: Path) -> None:
+    empty = tmp_path / "vacio.py"
+    empty.write_bytes(b"")
+    with mapped(empty) as buf:
+        assert len(buf) == 0
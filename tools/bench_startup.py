@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Medición de arranque en frío: cada corrida es un intérprete nuevo.
+# El costo de Python vacío (`-c pass`) se resta para ver solo el del auditor.
+DEFAULT_MODULES = ["auditor.cli", "auditor.metrics.metrics"]
+
+
+def _time_run(cmd: List[str]) -> float:
+    start = time.perf_counter()
+    subprocess.run(cmd, cwd=REPO_ROOT, check=True, capture_output=True)
+    return (time.perf_counter() - start) * 1000.0
+
+
+def _median_ms(cmd: List[str], runs: int) -> float:
+    _time_run(cmd)  # calentar la caché de bytecode y del sistema de archivos
+    return statistics.median(_time_run(cmd) for _ in range(runs))
+
+
+def _import_breakdown(module: str, top: int) -> List[Tuple[int, str]]:
+    """Módulos con mayor tiempo acumulado según `python -X importtime`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, check=True, capture_output=True, text=True,
+    )
+    rows: List[Tuple[int, str]] = []
+    for line in proc.stderr.splitlines():
+        # "import time:   self [us] | cumulative | imported package"
+        parts = line.removeprefix("import time:").split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        rows.append((int(parts[1]), parts[2].rstrip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Mide el tiempo de arranque en frío del auditor (import y corrida mínima)."
+    )
+    parser.add_argument("--runs", type=int, default=10, help="Corridas por medición (default: 10)")
+    parser.add_argument(
+        "--module",
+        action="append",
+        default=None,
+        help=f"Módulo a importar (repetible, default: {', '.join(DEFAULT_MODULES)})",
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=None,
+        help="Falla (exit 1) si la corrida mínima del CLI supera este tiempo neto en ms",
+    )
+    parser.add_argument(
+        "--importtime",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Mostrar los N imports más caros de cada módulo",
+    )
+    args = parser.parse_args(argv)
+
+    baseline = _median_ms([sys.executable, "-c", "pass"], args.runs)
+    print(f"python -c pass: {baseline:.1f} ms (se resta de lo siguiente)")
+
+    for module in args.module or DEFAULT_MODULES:
+        ms = _median_ms([sys.executable, "-c", f"import {module}"], args.runs)
+        print(f"import {module}: {ms - baseline:.1f} ms")
+        for cumulative, name in _import_breakdown(module, args.importtime):
+            print(f"    {cumulative / 1000:8.1f} ms  {name}")
+
+    # Corridas típicas de pre-commit sobre este repo: una regla de raíz (la
+    # corrida mínima, a la que aplica el presupuesto) y la de secretos, que
+    # además del arranque incluye el escaneo
+    timings = {}
+    for rule in ("R001", "R006"):
+        cli = [
+            sys.executable, "-m", "auditor", "--repo", str(REPO_ROOT),
+            "--rules", rule, "--output", os.devnull,
+        ]
+        timings[rule] = _median_ms(cli, args.runs) - baseline
+        print(f"auditor --rules {rule}: {timings[rule]:.1f} ms")
+    cli_ms = timings["R001"]
+
+    if args.budget_ms is not None and cli_ms > args.budget_ms:
+        print(f"Arranque por encima del presupuesto ({args.budget_ms:.1f} ms)", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
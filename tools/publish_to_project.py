@@ -4,13 +4,17 @@ import argparse
 import json
 import logging
 import os
+import sys
 import time
+from collections.abc import Iterable
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional, Protocol, Tuple, List
-from dotenv import load_dotenv
+from typing import Any, Dict, Optional, Protocol, Tuple
 
-load_dotenv()
+# Se ejecuta como `python tools/publish_to_project.py` desde la raíz del repo
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from auditor.report import load_report as _load_any_report
 
 # modelos
 
@@ -74,18 +78,18 @@ def with_retry(func, *args, retries: int = 3, base_delay: float = 1.0, **kwargs)
 
 # lógica principal de publicación
 
-def load_report(path: Path) -> Tuple[Summary, List[Dict[str, Any]]]:
-    data = json.loads(path.read_text(encoding="utf-8"))
-    summary_data = data.get("summary", {})
-    findings = data.get("findings", [])
+def load_report(path: Path) -> Tuple[Summary, Iterable[Dict[str, Any]]]:
+    # JSON o binario; los registros de findings no se parsean para el resumen
+    report = _load_any_report(path)
+    by_sev = report.summary["by_severity"]
 
     summary = Summary(
-        total=summary_data.get("total", len(findings)),
-        high=summary_data.get("by_severity", {}).get("High", 0),
-        medium=summary_data.get("by_severity", {}).get("Medium", 0),
-        low=summary_data.get("by_severity", {}).get("Low", 0),
+        total=report.summary["total"],
+        high=by_sev["High"],
+        medium=by_sev["Medium"],
+        low=by_sev["Low"],
     )
-    return summary, findings
+    return summary, report.records
 
 
 def load_trend(path: Optional[Path]) -> Optional[str]:
@@ -402,12 +406,20 @@ def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     return p.parse_args(argv)
 
 
+def _load_env() -> None:
+    # Antes de _parse_args: los defaults de los flags salen del entorno
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
 def main(argv: list[str] | None = None) -> int:
     logging.basicConfig(
         level=logging.INFO,
         format="[%(asctime)s] %(levelname)s %(message)s",
     )
 
+    _load_env()
     args = _parse_args(argv)
 
     token = os.getenv("GITHUB_TOKEN")
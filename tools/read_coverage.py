@@ -1,12 +1,43 @@
+from __future__ import annotations
+
+import argparse
+import sys
 from pathlib import Path
-import sys, xml.etree.ElementTree as ET
+
+# Se ejecuta como `python tools/read_coverage.py 90` desde la raíz del repo
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from auditor.utils.coverage import iter_line_rates, read_line_rate
+
 
 def read_coverage_pct(xml_path: str | Path) -> float:
-    root = ET.parse(xml_path).getroot()
-    return float(root.attrib.get("line-rate", "0")) * 100.0
+    return read_line_rate(xml_path) * 100.0
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Gate de cobertura a partir de coverage.xml")
+    p.add_argument("min_pct", nargs="?", type=float, default=90.0,
+                   help="Cobertura global mínima en %% (default: 90)")
+    p.add_argument("--file", default="coverage.xml", help="Reporte Cobertura (default: coverage.xml)")
+    p.add_argument("--package-min", type=float, default=None, metavar="PCT",
+                   help="Cobertura mínima en %% para cada <package>")
+    args = p.parse_args(argv)
+
+    if args.package_min is None:
+        pct = read_coverage_pct(args.file)
+        failed = []
+    else:
+        # Una sola pasada: raíz primero, luego cada paquete al cerrarse
+        rates = iter_line_rates(args.file, tags=("package",))
+        pct = next(rates)[2] * 100.0
+        failed = [(name, rate * 100.0) for _, name, rate in rates
+                  if rate * 100.0 < args.package_min]
+
+    print(f"Coverage: {pct:.2f}% (min {args.min_pct:.2f}%)")
+    for name, package_pct in failed:
+        print(f"  {name}: {package_pct:.2f}% (min {args.package_min:.2f}%)")
+    return 1 if pct < args.min_pct or failed else 0
+
 
 if __name__ == "__main__":
-    min_pct = float(sys.argv[1]) if len(sys.argv) > 1 else 90.0
-    pct = read_coverage_pct("coverage.xml")
-    print(f"Coverage: {pct:.2f}% (min {min_pct:.2f}%)")
-    sys.exit(1 if pct < min_pct else 0)
+    sys.exit(main())
@@ -1,22 +1,28 @@
 from __future__ import annotations
 
 import argparse
-import json
+import sys
 from pathlib import Path
 from typing import Any, Dict, List
 
+# Se ejecuta como `python tools/render_summary.py` desde la raíz del repo
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from auditor.report import Report, load_report
+
 
 SeverityCounts = Dict[str, int]
 JSONDict = Dict[str, Any]
 
 
-def _load_json(path: Path) -> JSONDict:
+def _load(path: Path) -> Report:
     if not path.exists():
         raise SystemExit(f"Archivo de entrada no encontrado: {path}")
-    data = json.loads(path.read_text(encoding="utf-8"))
-    if not isinstance(data, dict):
-        raise SystemExit("El archivo de entrada debe contener un objeto JSON (dict)")
-    return data
+    # JSON (reporte o métricas) o reporte binario del auditor
+    try:
+        return load_report(path)
+    except ValueError:
+        raise SystemExit("El archivo de entrada debe contener un objeto JSON (dict)") from None
 
 
 def _extract_summary(data: JSONDict) -> tuple[int, SeverityCounts]:
@@ -90,9 +96,8 @@ def _render_from_metrics(metrics: JSONDict) -> str:
     return "\n".join(lines)
 
 
-def _render_from_auditor_report(report: JSONDict) -> str:
-    total, by_sev = _extract_summary(report)
-    findings: List[JSONDict] = report.get("findings") or []
+def _render_from_auditor_report(report: Report, top_n: int = 10) -> str:
+    total, by_sev = report.summary["total"], report.summary["by_severity"]
 
     lines: List[str] = []
     lines.append("# Compliance summary (reporte actual)\n")
@@ -108,25 +113,17 @@ def _render_from_auditor_report(report: JSONDict) -> str:
     lines.extend(_render_table_by_severity(by_sev))
 
     lines.append("## Top findings\n")
-    if not findings:
+    # Heap acotado sobre los registros: High, luego Medium y Low, cada una en
+    # el orden del reporte, sin guardar ni agrupar el resto de los findings
+    top = report.top(top_n)
+    if not top and top_n > 0:
         lines.append("_No hay findings en este reporte._")
         return "\n".join(lines)
 
-    severity_order = {"High": 3, "Medium": 2, "Low": 1}
-    sorted_findings = sorted(
-        findings,
-        key=lambda f: severity_order.get(str(f.get("severity")), 0),
-        reverse=True,
-    )
-
-    top_n = min(10, len(sorted_findings))
-    for f in sorted_findings[:top_n]:
-        rule_id = f.get("rule_id", "unknown")
-        sev = f.get("severity", "unknown")
-        msg = str(f.get("message", "")).strip()
-        path = f.get("path") or ""
-        extra = f" (`{path}`)" if path else ""
-        lines.append(f"- **[{sev}] {rule_id}**: {msg}{extra}")
+    for f in top:
+        msg = f.message.strip()
+        extra = f" (`{f.path}`)" if f.path else ""
+        lines.append(f"- **[{f.severity.value}] {f.rule_id}**: {msg}{extra}")
 
     lines.append("")
     lines.append(
@@ -157,25 +154,32 @@ def main(argv: List[str] | None = None) -> int:
     parser.add_argument(
         "--input",
         default="auditor/metrics/metrics.json",
-        help="Ruta al archivo JSON de entrada (metrics.json o report.json)",
+        help="Ruta al archivo de entrada (metrics.json, report.json o reporte binario)",
     )
     parser.add_argument(
         "--output",
         default="summary.md",
         help="Ruta de salida para el resumen en Markdown",
     )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="Cantidad de findings a listar en el resumen de un report.json (default: 10)",
+    )
     args = parser.parse_args(argv)
 
     in_path = Path(args.input)
     out_path = Path(args.output)
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    data = _load_json(in_path)
+    report = _load(in_path)
 
-    if _is_metrics_payload(data):
-        md = _render_from_metrics(data)
+    # metrics.json no trae findings: su `head` ya es el documento completo
+    if _is_metrics_payload(report.head):
+        md = _render_from_metrics(report.header)
     else:
-        md = _render_from_auditor_report(data)
+        md = _render_from_auditor_report(report, top_n=args.top)
 
     out_path.write_text(md, encoding="utf-8")
     return 0